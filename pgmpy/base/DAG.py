@@ -4,6 +4,7 @@ import itertools
 from warnings import warn
 
 import networkx as nx
+import numpy as np
 
 from pgmpy.base import UndirectedGraph
 from pgmpy.independencies import Independencies
@@ -691,9 +692,60 @@ class DAG(nx.DiGraph):
 
         Examples
         --------
+        >>> from pgmpy.base import DAG
+        >>> dag = DAG([('A', 'B'), ('B', 'C'), ('D', 'C'), ('C', 'E')])
+        >>> pdag = dag.to_pdag()
+        >>> pdag.directed_edges
+        {('B', 'C'), ('C', 'E'), ('D', 'C')}
+        >>> pdag.undirected_edges
+        {('A', 'B')}
+        """
+
+        def adjacent(X, Y):
+            return self.has_edge(X, Y) or self.has_edge(Y, X)
+
+        # The edges of the v-structures are directed in all the equivalent DAGs.
+        directed = set()
+        for Z in self.nodes():
+            for X, Y in itertools.combinations(self.predecessors(Z), 2):
+                if not adjacent(X, Y):
+                    directed.update([(X, Z), (Y, Z)])
+        undirected = set(self.edges()) - directed
+
+        # Orient the other edges with Meek's rules R1-R3 until nothing changes. Only
+        # the orientation of the edge in the DAG needs to be checked.
+        progress = True
+        while progress:
+            progress = False
+            for X, Y in sorted(undirected, key=str):
+                neighbors_X = [W for W in self.neighbors(X) if (X, W) in undirected]
+                neighbors_X += [W for W in self.predecessors(X) if (W, X) in undirected]
+                if (
+                    # R1: W -> X - Y, and W, Y not adjacent
+                    any(
+                        (W, X) in directed and not adjacent(W, Y)
+                        for W in self.predecessors(X)
+                    )
+                    # R2: X -> W -> Y
+                    or any(
+                        (X, W) in directed and (W, Y) in directed
+                        for W in self.successors(X)
+                    )
+                    # R3: X - W1 -> Y, X - W2 -> Y, and W1, W2 not adjacent
+                    or any(
+                        not adjacent(W1, W2)
+                        for W1, W2 in itertools.combinations(
+                            [W for W in neighbors_X if (W, Y) in directed], 2
+                        )
+                    )
+                ):
+                    undirected.remove((X, Y))
+                    directed.add((X, Y))
+                    progress = True
 
-        """
-        pass
+        pdag = PDAG(directed_ebunch=list(directed), undirected_ebunch=list(undirected))
+        pdag.add_nodes_from(self.nodes())
+        return pdag
 
     def do(self, node):
         """
@@ -822,44 +874,37 @@ class PDAG(nx.DiGraph):
         dag.add_nodes_from(self.nodes())
         dag.add_edges_from(self.directed_edges)
 
+        # The remaining PDAG as a boolean adjacency matrix (with both directions of the
+        # undirected edges). The nodes are in the order of the nodes of the copy, in
+        # which the sinks are looked for.
         pdag = self.copy()
-        while pdag.number_of_nodes() > 0:
-            # find node with (1) no directed outgoing edges and
-            #                (2) the set of undirecte neighbors is either empty or
-            #                    undirected neighbors + parents of X are a clique
-            found = False
-            for X in pdag.nodes():
-                directed_outgoing_edges = set(pdag.successors(X)) - set(
-                    pdag.predecessors(X)
-                )
-                undirected_neighbors = set(pdag.successors(X)) & set(
-                    pdag.predecessors(X)
-                )
-                neighbors_are_clique = all(
-                    (
-                        pdag.has_edge(Y, Z)
-                        for Z in pdag.predecessors(X)
-                        for Y in undirected_neighbors
-                        if not Y == Z
-                    )
-                )
+        nodes = list(pdag.nodes())
+        adjacency = nx.to_numpy_array(pdag, nodelist=nodes, weight=None, dtype=bool)
+        remaining = np.ones(len(nodes), dtype=bool)
+
+        def is_sink(X):
+            # (1) no directed outgoing edges and
+            # (2) the set of undirecte neighbors is either empty or
+            #     undirected neighbors + parents of X are a clique
+            if (adjacency[X] & ~adjacency[:, X]).any():
+                return False
+            undirected_neighbors = np.flatnonzero(adjacency[X] & adjacency[:, X])
+            predecessors = np.flatnonzero(adjacency[:, X])
+            return np.all(
+                adjacency[np.ix_(undirected_neighbors, predecessors)]
+                | np.equal.outer(undirected_neighbors, predecessors)
+            )
 
-                if not directed_outgoing_edges and (
-                    not undirected_neighbors or neighbors_are_clique
-                ):
-                    found = True
-                    # add all edges of X as outgoing edges to dag
-                    for Y in pdag.predecessors(X):
-                        dag.add_edge(Y, X)
-                    pdag.remove_node(X)
-                    break
-
-            if not found:
+        sinks = np.array([is_sink(X) for X in range(len(nodes))], dtype=bool)
+        while remaining.any():
+            found = np.flatnonzero(sinks & remaining)
+            if len(found) == 0:
                 warn(
                     "PDAG has no faithful extension (= no oriented DAG with the "
                     + "same v-structures as PDAG). Remaining undirected PDAG edges "
                     + "oriented arbitrarily."
                 )
+                pdag.remove_nodes_from([nodes[X] for X in np.flatnonzero(~remaining)])
                 for X, Y in pdag.edges():
                     if not dag.has_edge(Y, X):
                         try:
@@ -867,4 +912,15 @@ class PDAG(nx.DiGraph):
                         except ValueError:
                             pass
                 break
+
+            # add all edges of X as outgoing edges to dag
+            X = found[0]
+            for Y in np.flatnonzero(adjacency[:, X]):
+                dag.add_edge(nodes[Y], nodes[X])
+            neighbors = np.flatnonzero(adjacency[X] | adjacency[:, X])
+            adjacency[X, :] = adjacency[:, X] = False
+            remaining[X] = False
+            # Only the neighbors of X can become sinks after removing it.
+            for Y in neighbors:
+                sinks[Y] = is_sink(Y)
         return dag
@@ -24,11 +24,14 @@ class BayesianEstimator(ParameterEstimator):
         super(BayesianEstimator, self).__init__(model, data, **kwargs)
 
     def get_parameters(
-        self, prior_type="BDeu", equivalent_sample_size=5, pseudo_counts=None
+        self, prior_type="BDeu", equivalent_sample_size=5, pseudo_counts=None, n_jobs=1
     ):
         """
         Method to estimate the model parameters (CPDs).
 
+        The state counts of all the nodes are computed at once with a single pass over
+        the data (see `state_counts_arrays`), before estimating the CPDs.
+
         Parameters
         ----------
         prior_type: 'dirichlet', 'BDeu', or 'K2'
@@ -47,6 +50,10 @@ class BayesianEstimator(ParameterEstimator):
             - A prior_type of 'K2' is a shorthand for 'dirichlet' + setting every pseudo_count to 1,
                 regardless of the cardinality of the variable.
 
+        n_jobs: int (default: 1)
+            The number of threads to compute the state counts in. -1 means all the
+            CPUs.
+
         Returns
         -------
         parameters: list
@@ -69,6 +76,10 @@ class BayesianEstimator(ParameterEstimator):
         <TabularCPD representing P(D:2 | C:2) at 0x7f7b4df822b0>]
         """
         parameters = []
+        families = [
+            (node, sorted(self.model.get_parents(node))) for node in self.model.nodes()
+        ]
+        self.state_counts_arrays(families, n_jobs=n_jobs)
         for node in self.model.nodes():
             _equivalent_sample_size = (
                 equivalent_sample_size[node]
@@ -91,7 +102,12 @@ class BayesianEstimator(ParameterEstimator):
         return parameters
 
     def estimate_cpd(
-        self, node, prior_type="BDeu", pseudo_counts=[], equivalent_sample_size=5
+        self,
+        node,
+        prior_type="BDeu",
+        pseudo_counts=[],
+        equivalent_sample_size=5,
+        state_counts=None,
     ):
         """
         Method to estimate the CPD for a given variable.
@@ -116,6 +132,11 @@ class BayesianEstimator(ParameterEstimator):
             - A prior_type of 'K2' is a shorthand for 'dirichlet' + setting every
               pseudo_count to 1, regardless of the cardinality of the variable.
 
+        state_counts: 2D array (optional)
+            The state counts of `node` and its (sorted) parents to estimate the CPD
+            from, in the layout of `state_counts_array`, e.g. counts accumulated over
+            several batches of data. Defaults to the state counts of the data.
+
         Returns
         -------
         CPD: TabularCPD
@@ -166,13 +187,14 @@ class BayesianEstimator(ParameterEstimator):
         else:
             raise ValueError("'prior_type' not specified")
 
-        state_counts = self.state_counts(node)
+        if state_counts is None:
+            state_counts = self.state_counts_array(node, parents)
         bayesian_counts = state_counts + pseudo_counts
 
         cpd = TabularCPD(
             node,
             node_cardinality,
-            np.array(bayesian_counts),
+            bayesian_counts,
             evidence=parents,
             evidence_card=parents_cardinalities,
             state_names={var: self.state_names[var] for var in chain([node], parents)},
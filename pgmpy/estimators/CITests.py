@@ -2,8 +2,9 @@ from warnings import warn
 
 import numpy as np
 import pandas as pd
-from scipy import stats
+from scipy import special, stats
 
+from pgmpy.estimators.base import BaseEstimator
 from pgmpy.independencies import IndependenceAssertion
 
 
@@ -43,6 +44,9 @@ def chi_square(X, Y, Z, data, boolean=True, **kwargs):
     `P(X,Y,Zs) = P(X|Zs)*P(Y|Zs)*P(Zs)`. The latter term can be computed
     as `P(X,Zs)*P(Y,Zs)/P(Zs).
 
+    The statistic is computed for all the states of Zs at once from the counts of
+    (X, Y, Zs), and the results are cached for each `data` (see `power_divergence`).
+
     Parameters
     ----------
     X: int, string, hashable object
@@ -71,14 +75,14 @@ def chi_square(X, Y, Z, data, boolean=True, **kwargs):
         chi: float
             The chi-squre test statistic.
 
+        dof: int
+            The degrees of freedom of the test.
+
         p_value: float
             The p_value, i.e. the probability of observing the computed chi-square
             statistic (or an even higher value), given the null hypothesis
             that X _|_ Y | Zs.
 
-        dof: int
-            The degrees of freedom of the test.
-
     If boolean = True, returns:
         independent: boolean
             If the p_value of the test is greater than significance_level, returns True.
@@ -106,46 +110,316 @@ def chi_square(X, Y, Z, data, boolean=True, **kwargs):
     >>> chi_square(X='A', Y='B', Z=['D', 'E'], data=data, boolean=True, significance_level=0.05)
     False
     """
+    return power_divergence(
+        X=X, Y=Y, Z=Z, data=data, boolean=boolean, lambda_="pearson", **kwargs
+    )
+
+
+def g_sq(X, Y, Z, data, boolean=True, **kwargs):
+    """
+    G-test (log-likelihood ratio) conditional independence test.
+    Tests the null hypothesis that X is independent from Y given Zs.
+
+    The G statistic `2 * sum(observed * log(observed / expected))` compares the
+    observed frequencies with the expected frequencies if X, Y were conditionally
+    independent, like `chi_square`. It is `2 * N * I(X; Y | Zs)`, where N is the
+    sample size and I the empirical conditional mutual information (in nats).
+
+    Parameters
+    ----------
+    X: int, string, hashable object
+        A variable name contained in the data set
+
+    Y: int, string, hashable object
+        A variable name contained in the data set, different from X
+
+    Z: list (array-like)
+        A list of variable names contained in the data set, different from X and Y.
+
+    data: pandas.DataFrame
+        The dataset on which to test the independence condition.
+
+    boolean: bool
+        If boolean=True, an additional argument `significance_level` must
+            be specified. If p_value of the test is greater than equal to
+            `significance_level`, returns True. Otherwise returns False.
+        If boolean=False, returns the G statistic, dof and p_value of the test.
+
+    Returns
+    -------
+    If boolean = False, Returns 3 values: the G statistic, the degrees of freedom and
+    the p_value. If boolean = True, returns whether X _|_ Y | Zs at `significance_level`.
+
+    References
+    ----------
+    [1] https://en.wikipedia.org/wiki/G-test
+    [2] Tsamardinos et al., The max-min hill-climbing BN structure learning algorithm, 2005, Section 4
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> import numpy as np
+    >>> data = pd.DataFrame(np.random.randint(0, 2, size=(50000, 4)), columns=list('ABCD'))
+    >>> data['E'] = data['A'] + data['B'] + data['C']
+    >>> g_sq(X='A', Y='C', Z=[], data=data, boolean=True, significance_level=0.05)
+    True
+    >>> g_sq(X='A', Y='B', Z=['D', 'E'], data=data, boolean=True, significance_level=0.05)
+    False
+    """
+    return power_divergence(
+        X=X, Y=Y, Z=Z, data=data, boolean=boolean, lambda_="log-likelihood", **kwargs
+    )
+
+
+def power_divergence(
+    X, Y, Z, data, boolean=True, lambda_="pearson", cache=None, **kwargs
+):
+    """
+    Computes the Cressie-Read power divergence statistic of a conditional
+    independence test, i.e. the chi-square test (`lambda_="pearson"`) or the G-test
+    (`lambda_="log-likelihood"`). The null hypothesis is that X is independent from
+    Y given Zs.
+
+    The counts of (X, Y, Zs) are computed as one array, from which the statistic and
+    the degrees of freedom of all the states of Zs are computed at once. The states
+    of X and Y which don't occur in a state of Zs don't add degrees of freedom, and
+    Yates' correction is used for the states of Zs with one degree of freedom, like
+    `scipy.stats.chi2_contingency`. The p-value is the chi-square survival function
+    of the sum of the statistics.
+
+    If a `cache` dict is given, the integer codes of `data` and the results are
+    stored in it by the test, {X, Y} and the set of Zs, so repeated tests aren't
+    recomputed. The structure learners use a new cache for each search (e.g. each
+    `PC.build_skeleton`), as it assumes that `data` isn't modified in place.
+
+    Parameters
+    ----------
+    X: int, string, hashable object
+        A variable name contained in the data set
+
+    Y: int, string, hashable object
+        A variable name contained in the data set, different from X
+
+    Z: list (array-like)
+        A list of variable names contained in the data set, different from X and Y.
+
+    data: pandas.DataFrame
+        The dataset on which to test the independence condition.
+
+    boolean: bool
+        If boolean=True, an additional argument `significance_level` must
+            be specified. If p_value of the test is greater than equal to
+            `significance_level`, returns True. Otherwise returns False.
+        If boolean=False, returns the statistic, dof and p_value of the test.
+
+    lambda_: str (one of "pearson", "log-likelihood")
+        The statistic of the test.
+
+    cache: dict (optional)
+        The cache for the tests on `data`, see above.
+
+    Returns
+    -------
+    If boolean = False, Returns 3 values: the statistic, the degrees of freedom and
+    the p_value. If boolean = True, returns whether X _|_ Y | Zs at `significance_level`.
 
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> import numpy as np
+    >>> data = pd.DataFrame(np.random.randint(0, 2, size=(50000, 4)), columns=list('ABCD'))
+    >>> data['E'] = data['A'] + data['B'] + data['C']
+    >>> power_divergence(X='A', Y='B', Z=['D', 'E'], data=data, boolean=False,
+    ...                  lambda_='log-likelihood')
+    (12988.06..., 4, 0.0)
+    """
     # Step 1: Check if the arguments are valid and type conversions.
     if hasattr(Z, "__iter__"):
         Z = list(Z)
     else:
-        raise (f"Z must be an iterable. Got object type: {type(Z)}")
+        raise ValueError(f"Z must be an iterable. Got object type: {type(Z)}")
 
     if (X in Z) or (Y in Z):
         raise ValueError(
             f"The variables X or Y can't be in Z. Found {X if X in Z else Y} in Z."
         )
-
-    # Step 2: Do a simple contingency test if there are no conditional variables.
-    if len(Z) == 0:
-        chi, p_value, dof, expected = stats.chi2_contingency(
-            data.groupby([X, Y]).size().unstack(Y)
+    if lambda_ not in ("pearson", "log-likelihood"):
+        raise ValueError(
+            f"lambda_ must be one of: pearson, log-likelihood. Got: {lambda_}"
         )
 
-    # Step 3: If there are conditionals variables, iterate over unique states and do
-    #         the contingency test.
-    else:
-        chi = 0
-        dof = 0
-        for _, df in data.groupby(Z):
-            c, _, d, _ = stats.chi2_contingency(
-                df.groupby([X, Y]).size().unstack(Y, fill_value=0)
-            )
-            chi += c
-            dof += d
-
-        p_value = stats.chi2.pdf(chi, df=dof)
-
-    # Step 4: Return the values
+    if cache is None:
+        # Without a cache only the columns of this test are encoded.
+        cache = {"estimator": BaseEstimator(data.loc[:, [X, Y] + Z])}
+    key = (lambda_, frozenset((X, Y)), frozenset(Z))
+    if key not in cache:
+        if "estimator" not in cache:
+            cache["estimator"] = BaseEstimator(data)
+        cache[key] = _power_divergence(cache["estimator"], X, Y, Z, lambda_)
+    statistic, dof, p_value = cache[key]
+
     if boolean:
-        if p_value >= kwargs["significance_level"]:
-            return True
+        return p_value >= kwargs["significance_level"]
+    else:
+        return statistic, dof, p_value
+
+
+def _power_divergence(estimator, X, Y, Z, lambda_):
+    "Computes the statistic, dof and p-value of the test (see `power_divergence`)."
+    # Step 2: Count the states of X and Y for each state of Zs, using the contingency
+    #         counts of the estimators, as an array of shape (X, Y, Zs). Only the
+    #         states of Zs which occur in the data are kept.
+    observed = estimator.state_counts_array(
+        X, [Y] + Z, complete_samples_only=False
+    ).reshape(len(estimator.state_names[X]), len(estimator.state_names[Y]), -1)
+    observed = observed[:, :, observed.sum(axis=(0, 1)) > 0].astype(float)
+
+    # Step 3: Compute the expected counts and the degrees of freedom of all the states
+    #         of Zs at once. Empty rows and columns have expected counts of 0.
+    x_counts = observed.sum(axis=1)
+    y_counts = observed.sum(axis=0)
+    z_counts = x_counts.sum(axis=0)
+    expected = x_counts[:, np.newaxis, :] * y_counts[np.newaxis, :, :] / z_counts
+    dofs = ((x_counts > 0).sum(axis=0) - 1) * ((y_counts > 0).sum(axis=0) - 1)
+    dof = int(dofs.sum())
+
+    # Yates' correction for the states of Zs with one degree of freedom.
+    corrected = dofs == 1
+    if corrected.any():
+        diff = expected[:, :, corrected] - observed[:, :, corrected]
+        observed[:, :, corrected] += np.sign(diff) * np.minimum(0.5, np.abs(diff))
+
+    # Step 4: Sum the statistic over the states of X, Y and Zs.
+    nonempty = expected > 0
+    if lambda_ == "pearson":
+        statistic = (
+            (observed[nonempty] - expected[nonempty]) ** 2 / expected[nonempty]
+        ).sum()
+    else:
+        ratio = observed[nonempty] / expected[nonempty]
+        statistic = 2 * special.xlogy(observed[nonempty], ratio).sum()
+
+    p_value = stats.chi2.sf(statistic, df=dof) if dof > 0 else 1.0
+    return statistic, dof, p_value
+
+
+def fisher_z(X, Y, Z, data=None, boolean=True, cache=None, **kwargs):
+    r"""
+    Fisher's z test of the partial correlation of X and Y given Z. Should be used only
+    on continuous data, for which it tests the null hypothesis that X is independent
+    from Y given Z, assuming that the data is multivariate normal.
+
+    The partial correlation :math:`\rho(X, Y | Z)` is computed from the inverse of the
+    (|Z|+2)x(|Z|+2) submatrix of the correlation (or covariance) matrix of X, Y and
+    Z. If a `cache` dict is given, the correlation matrix of `data` is computed once
+    and stored in it (together with the test results), so the test doesn't need the
+    data after the first call.
+    Instead of `data`, a covariance matrix and the sample size can be given as
+    `covariance` and `sample_size`, so the test can be run on summary statistics.
+
+    Parameters
+    ----------
+    X: str
+        The first variable for testing the independence condition X _|_ Y | Z
+
+    Y: str
+        The second variable for testing the independence condition X _|_ Y | Z
+
+    Z: list/array-like
+        A list of conditional variable for testing the condition X _|_ Y | Z
+
+    data: pandas.DataFrame
+        The dataset in which to test the indepenedence condition.
+
+    boolean: bool
+        If boolean=True, an additional argument `significance_level` must
+            be specified. If p_value of the test is greater than equal to
+            `significance_level`, returns True. Otherwise returns False.
+        If boolean=False, returns the partial correlation coefficient and p_value
+            of the test.
+
+    covariance: pandas.DataFrame (optional)
+        The covariance (or correlation) matrix of the variables, indexed by the
+        variable names in both the index and the columns. Used instead of `data`.
+
+    sample_size: int (optional)
+        The number of samples `covariance` is computed from. Required with
+        `covariance`.
+
+    cache: dict (optional)
+        The cache for the tests on `data` (or `covariance`), see `power_divergence`.
+
+    Returns
+    -------
+    Partial correlation coefficient: float
+    p-value: float
+
+    References
+    ----------
+    [1] https://en.wikipedia.org/wiki/Partial_correlation#Using_matrix_inversion
+    [2] https://en.wikipedia.org/wiki/Partial_correlation#As_conditional_independence_test
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> import numpy as np
+    >>> data = pd.DataFrame(np.random.randn(10000, 2), columns=list('XZ'))
+    >>> data['Y'] = 2 * data['Z'] + np.random.randn(10000)
+    >>> data['X'] += data['Z']
+    >>> fisher_z(X='X', Y='Y', Z=[], data=data, significance_level=0.05)
+    False
+    >>> fisher_z(X='X', Y='Y', Z=['Z'], data=data, significance_level=0.05)
+    True
+    >>> fisher_z(X='X', Y='Y', Z=['Z'], covariance=data.cov(), sample_size=10000,
+    ...          significance_level=0.05)
+    True
+    """
+    # Step 1: Test if the inputs are correct
+    if not hasattr(Z, "__iter__"):
+        raise ValueError(f"Variable Z. Expected type: iterable. Got type: {type(Z)}")
+    else:
+        Z = list(Z)
+
+    if cache is None:
+        cache = {}
+    covariance = kwargs.get("covariance")
+    if covariance is not None:
+        if kwargs.get("sample_size") is None:
+            raise ValueError("sample_size must be specified with covariance.")
+        sample_size = kwargs["sample_size"]
+    elif isinstance(data, pd.DataFrame):
+        if "correlation" not in cache:
+            cache["correlation"] = data.corr()
+        covariance = cache["correlation"]
+        sample_size = len(data)
+    else:
+        raise ValueError(
+            f"Variable data. Expected type: pandas.DataFrame. Got type: {type(data)}"
+        )
+
+    # Step 2: Compute the partial correlation from the inverse of the submatrix.
+    key = ("fisher_z", frozenset((X, Y)), frozenset(Z), sample_size)
+    if key not in cache:
+        variables = [X, Y] + Z
+        precision = np.linalg.pinv(covariance.loc[variables, variables].values)
+        coef = -precision[0, 1] / np.sqrt(precision[0, 0] * precision[1, 1])
+        coef = np.clip(coef, -1, 1)
+
+        # Step 3: Fisher's z transform, which is approximately normal with standard
+        #         deviation 1 / sqrt(n - |Z| - 3) under the null hypothesis.
+        dof = sample_size - len(Z) - 3
+        if dof > 0:
+            z = np.sqrt(dof) * np.abs(np.arctanh(np.clip(coef, -1 + 1e-15, 1 - 1e-15)))
+            p_value = 2 * stats.norm.sf(z)
         else:
-            return False
+            p_value = 1.0
+        cache[key] = (coef, p_value)
+    coef, p_value = cache[key]
+
+    if boolean:
+        return p_value >= kwargs["significance_level"]
     else:
-        return chi, dof, p_value
+        return coef, p_value
 
 
 def pearsonr(X, Y, Z, data, boolean=True, **kwargs):
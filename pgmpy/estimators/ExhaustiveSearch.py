@@ -4,15 +4,25 @@ from warnings import warn
 from itertools import combinations
 
 import networkx as nx
+import numpy as np
+from joblib import effective_n_jobs
+from scipy.special import comb
 
 from pgmpy.estimators import StructureEstimator, ScoreCache
 from pgmpy.estimators import K2Score
+from pgmpy.estimators.base import _dag_scores_worker
 from pgmpy.utils.mathext import powerset
 from pgmpy.base import DAG
 
+# The number of cells of the state counts of the parent sets scored together by
+# `ExhaustiveSearch._best_parent_sets`.
+_SCORE_BATCH_CELLS = 2 ** 22
+
 
 class ExhaustiveSearch(StructureEstimator):
-    def __init__(self, data, scoring_method=None, use_cache=True, **kwargs):
+    def __init__(
+        self, data, scoring_method=None, use_cache=True, cache_dir=None, **kwargs
+    ):
         """
         Search class for exhaustive searches over all DAGs with a given set of variables.
         Takes a `StructureScore`-Instance as parameter; `estimate` finds the model with maximal score.
@@ -38,6 +48,11 @@ class ExhaustiveSearch(StructureEstimator):
             Note: Caching only works for scoring methods which are decomposible. Can
             give wrong results in case of custom scoring methods.
 
+        cache_dir: str (optional)
+            If provided (and `use_cache` is True), the local scores are also stored
+            on disk in this directory, to be reused by later searches on the same data
+            with the same scoring method. See `ScoreCache`.
+
         complete_samples_only: bool (optional, default `True`)
             Specifies how to deal with missing data, if present. If set to `True` all rows
             that contain `np.Nan` somewhere are ignored. If `False` then, for each variable,
@@ -46,11 +61,15 @@ class ExhaustiveSearch(StructureEstimator):
         """
         if scoring_method is not None:
             if use_cache:
-                self.scoring_method = ScoreCache.ScoreCache(scoring_method, data)
+                self.scoring_method = ScoreCache.ScoreCache(
+                    scoring_method, data, cache_dir=cache_dir
+                )
             else:
                 self.scoring_method = scoring_method
         else:
-            self.scoring_method = ScoreCache.ScoreCache(K2Score(data, **kwargs), data)
+            self.scoring_method = ScoreCache.ScoreCache(
+                K2Score(data, **kwargs), data, cache_dir=cache_dir
+            )
 
         super(ExhaustiveSearch, self).__init__(data, **kwargs)
 
@@ -110,10 +129,36 @@ class ExhaustiveSearch(StructureEstimator):
             if nx.is_directed_acyclic_graph(graph):
                 yield graph
 
-    def all_scores(self):
+    def _dag_scores(self, dags, n_jobs=1):
+        """
+        Returns the scores of `dags`. If `n_jobs` isn't 1, the DAGs are scored in
+        batches by a pool of worker processes, to which only their edges are sent.
+        """
+        pool = self._score_pool(n_jobs)
+        if pool is None:
+            return [self.scoring_method.score(dag) for dag in dags]
+
+        nodes = list(self.state_names.keys())
+        edges = [list(dag.edges()) for dag in dags]
+        batch_size = 256
+        with pool:
+            batch_scores = pool.map(
+                _dag_scores_worker,
+                [nodes] * -(-len(edges) // batch_size),
+                [edges[i : i + batch_size] for i in range(0, len(edges), batch_size)],
+            )
+            return [score for scores in batch_scores for score in scores]
+
+    def all_scores(self, n_jobs=1):
         """
         Computes a list of DAGs and their structure scores, ordered by score.
 
+        Parameters
+        ----------
+        n_jobs: int (default: 1)
+            The number of worker processes to score the DAGs with. If -1, all the
+            CPUs are used.
+
         Returns
         -------
         list: a list of (score, dag) pairs
@@ -158,23 +203,113 @@ class ExhaustiveSearch(StructureEstimator):
         -16237.575725538434     [('C', 'B')]
         """
 
+        dags = list(self.all_dags())
         scored_dags = sorted(
-            [(self.scoring_method.score(dag), dag) for dag in self.all_dags()],
-            key=lambda x: x[0],
+            zip(self._dag_scores(dags, n_jobs), dags), key=lambda x: x[0]
         )
         return scored_dags
 
-    def estimate(self):
+    def _best_parent_sets(self, nodes, max_indegree=None, pool=None, n_jobs=1):
+        """
+        Computes, for each node and each subset of the other nodes, the best scoring
+        parent set of the node within the subset. Subsets of the other nodes are
+        encoded as bit masks over the other nodes in the order of `nodes`, without
+        the node itself.
+
+        The parent sets of a node are scored in batches whose state counts have about
+        `_SCORE_BATCH_CELLS` cells in total, so that the scoring methods which count
+        all the parent sets of a batch at once (see `StructureScore.local_scores`)
+        don't need memory for the counts of all the parent sets.
+
+        Returns
+        -------
+        best_scores, best_sets: lists of numpy.ndarray
+            For each node, the score of its best parent set and the bit mask (over
+            the other nodes) of the parent set, for each subset of the other nodes.
+        """
+        n_others = len(nodes) - 1
+        max_parents = n_others if max_indegree is None else min(max_indegree, n_others)
+        masks = [
+            [sum(1 << j for j in subset) for subset in combinations(range(n_others), k)]
+            for k in range(max_parents + 1)
+        ]
+        masks = np.array([mask for size in masks for mask in size], dtype=np.int64)
+
+        best_scores, best_sets = [], []
+        for index, node in enumerate(nodes):
+            others = nodes[:index] + nodes[index + 1 :]
+
+            # the number of cells of the state counts of each parent set
+            cells = np.full(len(masks), float(len(self.state_names[node])))
+            for j, other in enumerate(others):
+                cells[(masks >> j & 1).astype(bool)] *= len(self.state_names[other])
+            batches = np.floor(np.cumsum(cells) / _SCORE_BATCH_CELLS)
+            splits = np.flatnonzero(np.diff(batches)) + 1
+
+            best_score = np.full(2 ** n_others, -np.inf)
+            for batch in np.split(masks, splits):
+                parent_sets = [
+                    [others[j] for j in range(n_others) if mask >> j & 1]
+                    for mask in batch
+                ]
+                best_score[batch] = self._local_scores(
+                    [(node, parent_sets)], pool, n_jobs
+                )[0]
+            best_set = np.zeros(2 ** n_others, dtype=np.int64)
+            best_set[masks] = masks
+
+            # best[S] = max(score(S), max_{j in S} best[S - {j}]), one bit at a time.
+            for j in range(n_others):
+                with_j = best_score.reshape(-1, 2, 2 ** j)[:, 1, :]
+                without_j = best_score.reshape(-1, 2, 2 ** j)[:, 0, :]
+                better = without_j > with_j
+                with_j[better] = without_j[better]
+                sets = best_set.reshape(-1, 2, 2 ** j)
+                sets[:, 1, :][better] = sets[:, 0, :][better]
+            best_scores.append(best_score)
+            best_sets.append(best_set)
+        return best_scores, best_sets
+
+    def estimate(self, max_indegree=None, max_memory=None, n_jobs=1):
         """
         Estimates the `DAG` structure that fits best to the given data set,
         according to the scoring method supplied in the constructor.
         Exhaustively searches through all models. Only estimates network structure, no parametrization.
 
+        Instead of scoring all the DAGs, the optimal DAG is found with the dynamic
+        program of Silander & Myllymäki over the subsets of the variables, which
+        relies on the scoring method being decomposable. The best parent set of each
+        variable within each subset of the other variables is computed first, then
+        the best sink of each subset of the variables, which gives an optimal
+        ordering of the variables and the parents of each variable. This needs
+        `n * 2**(n-1)` local scores (fewer with `max_indegree`) and memory in the
+        order of `n * 2**n`, so it's feasible for up to about 25 variables.
+
+        Parameters
+        ----------
+        max_indegree: int or None
+            If provided, only DAGs where all nodes have at most `max_indegree` parents
+            are searched.
+
+        max_memory: int or None
+            If provided, the maximum number of bytes the tables of the dynamic
+            program and the state counts of a batch of scored parent sets may take. A
+            `ValueError` is raised before the search, if they would be larger.
+
+        n_jobs: int (default: 1)
+            The number of worker processes to compute the local scores with. If -1,
+            all the CPUs are used.
+
         Returns
         -------
         model: `DAG` instance
             A `DAG` with maximal score.
 
+        References
+        ----------
+        Silander, Tomi, and Petri Myllymäki. "A simple approach for finding the globally
+        optimal Bayesian network structure." UAI 2006.
+
         Examples
         --------
         >>> import pandas as pd
@@ -190,10 +325,73 @@ class ExhaustiveSearch(StructureEstimator):
         >>> best_model.edges()
         [('B', 'C')]
         """
+        nodes = sorted(self.state_names.keys())
+        n_nodes = len(nodes)
 
-        best_dag = max(self.all_dags(), key=self.scoring_method.score)
+        # best scores and parent sets of each node, and best scores and sinks of the
+        # subsets of nodes, plus the temporary arrays for the subsets.
+        memory = n_nodes * 2 ** (n_nodes - 1) * 16 + 2 ** n_nodes * 33
+        # the state counts of a batch of parent sets, and of the largest parent set.
+        max_parents = n_nodes - 1 if max_indegree is None else max_indegree
+        cardinalities = sorted(len(states) for states in self.state_names.values())
+        largest_family = np.prod(cardinalities[-(max_parents + 1) :], dtype=float)
+        memory += int(8 * (_SCORE_BATCH_CELLS + largest_family))
+        if max_memory is not None and memory > max_memory:
+            raise ValueError(
+                f"Exact search over {n_nodes} variables needs about {memory} bytes, "
+                f"more than max_memory={max_memory}."
+            )
+
+        pool = self._score_pool(n_jobs)
+        try:
+            best_scores, best_sets = self._best_parent_sets(
+                nodes, max_indegree, pool, effective_n_jobs(n_jobs)
+            )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        # score[W] is the score of the best DAG over the subset W of the nodes, whose
+        # sink is sink[W]. The subsets are processed in the order of their size.
+        subsets = np.arange(2 ** n_nodes, dtype=np.int64)
+        sizes = np.zeros(2 ** n_nodes, dtype=np.int8)
+        for i in range(n_nodes):
+            sizes += (subsets >> i & 1).astype(np.int8)
+        subsets = subsets[np.argsort(sizes, kind="stable")]
+        layer_starts = np.cumsum(
+            [0] + [comb(n_nodes, k, exact=True) for k in range(n_nodes + 1)]
+        )
+        del sizes
+
+        score = np.full(2 ** n_nodes, -np.inf)
+        score[0] = 0
+        sink = np.full(2 ** n_nodes, -1, dtype=np.int8)
+        for k in range(1, n_nodes + 1):
+            layer = subsets[layer_starts[k] : layer_starts[k + 1]]
+            for i in range(n_nodes):
+                with_i = layer[(layer >> i & 1).astype(bool)]
+                rest = with_i ^ (1 << i)
+                # the subset of the other nodes, as a bit mask without bit i
+                others = (rest & ((1 << i) - 1)) | ((rest >> (i + 1)) << i)
+                candidate = score[rest] + best_scores[i][others]
+                better = candidate > score[with_i]
+                score[with_i[better]] = candidate[better]
+                sink[with_i[better]] = i
 
         best_model = DAG()
-        best_model.add_nodes_from(sorted(best_dag.nodes()))
-        best_model.add_edges_from(sorted(best_dag.edges()))
+        best_model.add_nodes_from(nodes)
+        remaining = 2 ** n_nodes - 1
+        edges = []
+        while remaining:
+            i = int(sink[remaining])
+            remaining ^= 1 << i
+            others = (remaining & ((1 << i) - 1)) | ((remaining >> (i + 1)) << i)
+            parents = int(best_sets[i][others])
+            other_nodes = nodes[:i] + nodes[i + 1 :]
+            edges.extend(
+                (other_nodes[j], nodes[i])
+                for j in range(n_nodes - 1)
+                if parents >> j & 1
+            )
+        best_model.add_edges_from(sorted(edges))
         return best_model
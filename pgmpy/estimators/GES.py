@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+import numpy as np
+
+from pgmpy.base import PDAG
+from pgmpy.estimators import StructureEstimator, BDeuScore, ScoreCache
+from pgmpy.utils.mathext import powerset
+
+
+class GES(StructureEstimator):
+    def __init__(
+        self, data, scoring_method=None, use_cache=True, cache_dir=None, **kwargs
+    ):
+        """
+        Class for the Greedy Equivalence Search (GES) of Chickering, which learns the
+        equivalence class (as a CPDAG) of the network structure from data by greedily
+        adding and then removing edges in the space of equivalence classes.
+        `estimate` attempts to find an equivalence class with optimal score.
+
+        Parameters
+        ----------
+        data: pandas DataFrame object
+            datafame object where each column represents one variable.
+            (If some values in the data are missing the data cells should be set to `numpy.NaN`.
+            Note that pandas converts each column containing `numpy.NaN`s to dtype `float`.)
+
+        scoring_method: Instance of a `StructureScore`-subclass (`BDeuScore` is used as default)
+            An instance of `K2Score`, `BDeuScore`, or `BicScore`.
+            This score is optimized during structure estimation by the `estimate`-method.
+            GES relies on the score being decomposable and giving the same score to
+            equivalent DAGs (like `BDeuScore` and `BicScore`, but not `K2Score`).
+
+        state_names: dict (optional)
+            A dict indicating, for each variable, the discrete set of states (or values)
+            that the variable can take. If unspecified, the observed values in the data set
+            are taken to be the only possible states.
+
+        complete_samples_only: bool (optional, default `True`)
+            Specifies how to deal with missing data, if present. If set to `True` all rows
+            that contain `np.Nan` somewhere are ignored. If `False` then, for each variable,
+            every row where neither the variable nor its parents are `np.NaN` is used.
+            This sets the behavior of the `state_count`-method.
+
+        use_caching: boolean
+            If True, uses caching of score for faster computation.
+            Note: Caching only works for scoring methods which are decomposible. Can
+            give wrong results in case of custom scoring methods.
+
+        cache_dir: str (optional)
+            If provided (and `use_cache` is True), the local scores are also stored
+            on disk in this directory, to be reused by later searches on the same data
+            with the same scoring method. See `ScoreCache`.
+
+        References
+        ----------
+        Chickering, David Maxwell. "Optimal structure identification with greedy search."
+        Journal of Machine Learning Research 3 (2002): 507-554.
+        """
+        if scoring_method is not None:
+            if use_cache:
+                self.scoring_method = ScoreCache.ScoreCache(
+                    scoring_method, data, cache_dir=cache_dir
+                )
+            else:
+                self.scoring_method = scoring_method
+        else:
+            self.scoring_method = ScoreCache.ScoreCache(
+                BDeuScore(data, **kwargs), data, cache_dir=cache_dir
+            )
+
+        super(GES, self).__init__(data, **kwargs)
+        self._scores = {}
+
+    @staticmethod
+    def _is_clique(adjacency, nodes):
+        "Checks if all the `nodes` are adjacent to each other."
+        nodes = list(nodes)
+        sub_adjacency = (adjacency | adjacency.T)[np.ix_(nodes, nodes)]
+        return sub_adjacency.sum() == len(nodes) * (len(nodes) - 1)
+
+    @staticmethod
+    def _has_semi_directed_path(adjacency, source, target, blocked):
+        """
+        Checks if there is a semi-directed path (i.e. of undirected edges and edges
+        directed away from `source`) from `source` to `target`, that doesn't go
+        through the nodes in `blocked`.
+        """
+        visited = np.zeros(len(adjacency), dtype=bool)
+        visited[list(blocked)] = True
+        visited[source] = True
+        frontier = np.zeros(len(adjacency), dtype=bool)
+        frontier[source] = True
+        while frontier.any():
+            frontier = adjacency[frontier].any(axis=0) & ~visited
+            if frontier[target]:
+                return True
+            visited |= frontier
+        return False
+
+    def _local_score(self, node, parents):
+        """
+        Returns the local score of `node` with the set of `parents` (indices in
+        `self.variables`). The scores are memoized, so the score changes of the
+        operators which aren't affected by the last change of the model aren't
+        recomputed.
+        """
+        key = (node, parents)
+        if key not in self._scores:
+            self._scores[key] = self.scoring_method.local_score(
+                self.variables[node], [self.variables[i] for i in sorted(parents)]
+            )
+        return self._scores[key]
+
+    def _insert_candidates(self, adjacency, Y, max_indegree=None):
+        """
+        Generates the Insert(X, Y, T) operators with target `Y` on the CPDAG
+        `adjacency` which pass the local validity checks, together with the set of
+        parents they make adjacent to `Y` and their score changes. The operator adds
+        the edge X -> Y and orients the undirected edges T - Y as T -> Y. It's only
+        valid if there is also no semi-directed path from Y to X (see
+        `_insert_operators`), which isn't checked here as it depends on the whole
+        graph.
+        """
+        undirected = adjacency & adjacency.T
+        adjacent = adjacency | adjacency.T
+        neighbors = set(np.flatnonzero(undirected[Y]))
+        parents = frozenset(np.flatnonzero(adjacency[:, Y] & ~adjacency[Y]))
+        for X in np.flatnonzero(~adjacent[Y]):
+            if X == Y:
+                continue
+            adjacent_neighbors = neighbors & set(np.flatnonzero(adjacent[X]))
+            for T in powerset(sorted(neighbors - adjacent_neighbors)):
+                new_parents = adjacent_neighbors | set(T)
+                if (
+                    max_indegree is not None
+                    and len(new_parents | parents) + 1 > max_indegree
+                ):
+                    continue
+                if not self._is_clique(adjacency, new_parents):
+                    continue
+
+                old_parents = frozenset(new_parents) | parents
+                score_delta = self._local_score(
+                    Y, old_parents | {X}
+                ) - self._local_score(Y, old_parents)
+                yield (X, Y, T), new_parents, score_delta
+
+    def _insert_operators(self, adjacency, max_indegree=None):
+        """
+        Generates the valid Insert(X, Y, T) operators on the CPDAG `adjacency`,
+        together with their score changes. The operator adds the edge X -> Y and
+        orients the undirected edges T - Y as T -> Y.
+        """
+        for Y in range(len(adjacency)):
+            for (X, Y, T), new_parents, score_delta in self._insert_candidates(
+                adjacency, Y, max_indegree
+            ):
+                if not self._has_semi_directed_path(adjacency, Y, X, new_parents):
+                    yield (X, Y, T), score_delta
+
+    def _delete_operators(self, adjacency, targets=None):
+        """
+        Generates the valid Delete(X, Y, H) operators on the CPDAG `adjacency` with
+        the target Y in `targets` (all the nodes by default), together with their
+        score changes. The operator removes the edge X -> Y or X - Y, and orients the
+        undirected edges Y - H as Y -> H and X - H as X -> H.
+        """
+        undirected = adjacency & adjacency.T
+        adjacent = adjacency | adjacency.T
+        if targets is None:
+            targets = range(len(adjacency))
+        for Y in targets:
+            neighbors = set(np.flatnonzero(undirected[Y]))
+            parents = frozenset(np.flatnonzero(adjacency[:, Y] & ~adjacency[Y]))
+            for X in np.flatnonzero(adjacency[:, Y]):
+                adjacent_neighbors = neighbors & set(np.flatnonzero(adjacent[X]))
+                for H in powerset(sorted(adjacent_neighbors)):
+                    remaining = adjacent_neighbors - set(H)
+                    if not self._is_clique(adjacency, remaining):
+                        continue
+
+                    old_parents = (frozenset(remaining) | parents) - {X}
+                    score_delta = self._local_score(Y, old_parents) - self._local_score(
+                        Y, old_parents | {X}
+                    )
+                    yield (X, Y, H), score_delta
+
+    @staticmethod
+    def _changed_targets(old_adjacency, new_adjacency):
+        """
+        Returns the nodes whose operators may have changed between the two CPDAGs,
+        i.e. the nodes with a changed edge and their (old or new) undirected
+        neighbors. The operators with target Y only depend on the edges of Y and of
+        its undirected neighbors (apart from the semi-directed paths of Insert).
+        """
+        changed = old_adjacency != new_adjacency
+        touched = changed.any(axis=0) | changed.any(axis=1)
+        neighbors = old_adjacency & old_adjacency.T
+        neighbors |= new_adjacency & new_adjacency.T
+        return np.flatnonzero(touched | neighbors[:, touched].any(axis=1))
+
+    def _to_pdag(self, adjacency):
+        "Returns the `PDAG` of the adjacency matrix (undirected edges in both ways)."
+        directed, undirected = [], []
+        for X, Y in zip(*np.nonzero(adjacency)):
+            if not adjacency[Y, X]:
+                directed.append((self.variables[X], self.variables[Y]))
+            elif X < Y:
+                undirected.append((self.variables[X], self.variables[Y]))
+        pdag = PDAG(directed_ebunch=directed, undirected_ebunch=undirected)
+        pdag.add_nodes_from(self.variables)
+        return pdag
+
+    def _complete(self, adjacency):
+        """
+        Returns the adjacency matrix of the CPDAG of the equivalence class of the
+        PDAG `adjacency`, i.e. of the DAGs consistent with it.
+        """
+        cpdag = self._to_pdag(adjacency).to_dag().to_pdag()
+        node_index = {node: index for index, node in enumerate(self.variables)}
+        completed = np.zeros_like(adjacency)
+        for X, Y in cpdag.edges():
+            completed[node_index[X], node_index[Y]] = True
+        return completed
+
+    def estimate(self, max_indegree=None, epsilon=1e-4, return_type="pdag"):
+        """
+        Estimates the equivalence class of the `DAG` structure that has optimal score,
+        according to the scoring method supplied in the constructor. Starts from the
+        empty graph, adds edges (Insert operators) while the score improves and then
+        removes edges (Delete operators) while the score improves. Each operator is
+        applied to the CPDAG of the current equivalence class, and its score change
+        is computed from (memoized) local scores of the target node.
+
+        Parameters
+        ----------
+        max_indegree: int or None
+            If provided and unequal None, the Insert operators are limited to the ones
+            after which the target node has at most `max_indegree` parents.
+
+        epsilon: float (default: 1e-4)
+            Defines the exit condition of each phase. If the improvement in score is less
+            than `epsilon`, the phase stops.
+
+        return_type: str (one of "pdag", "cpdag", "dag")
+            "pdag" or "cpdag" returns the estimated equivalence class as a `PDAG`, and
+            "dag" returns a `DAG` in the equivalence class (using `PDAG.to_dag`).
+
+        Returns
+        -------
+        model: `PDAG` or `DAG` instance
+            The CPDAG of the (local) score maximum, or a DAG in its equivalence class.
+
+        Examples
+        --------
+        >>> import pandas as pd
+        >>> import numpy as np
+        >>> from pgmpy.estimators import GES, BicScore
+        >>> data = pd.DataFrame(np.random.randint(0, 3, size=(5000, 3)), columns=list('ABC'))
+        >>> data['D'] = data['A'] + data['B']
+        >>> est = GES(data, scoring_method=BicScore(data))
+        >>> pdag = est.estimate()
+        >>> sorted(pdag.directed_edges)
+        [('A', 'D'), ('B', 'D')]
+        >>> pdag.undirected_edges
+        set()
+        """
+        if return_type.lower() not in ("pdag", "cpdag", "dag"):
+            raise ValueError(
+                f"return_type must be one of: dag, pdag, or cpdag. Got: {return_type}"
+            )
+
+        n_nodes = len(self.variables)
+        adjacency = np.zeros((n_nodes, n_nodes), dtype=bool)
+
+        # Forward phase. The operators of each target node are kept with their score
+        # changes, and only recomputed for the nodes whose neighborhood changed. The
+        # semi-directed paths are checked for the best operators only, as they depend
+        # on the whole graph.
+        operators = {
+            Y: list(self._insert_candidates(adjacency, Y, max_indegree))
+            for Y in range(n_nodes)
+        }
+        while True:
+            candidates = sorted(
+                (operator for Y in range(n_nodes) for operator in operators[Y]),
+                key=lambda operator: -operator[2],
+            )
+            best_operation = None
+            for (X, Y, T), new_parents, score_delta in candidates:
+                if score_delta <= epsilon:
+                    break
+                if not self._has_semi_directed_path(adjacency, Y, X, new_parents):
+                    best_operation = (X, Y, T)
+                    break
+            if best_operation is None:
+                break
+
+            X, Y, T = best_operation
+            new_adjacency = adjacency.copy()
+            new_adjacency[X, Y] = True
+            new_adjacency[Y, list(T)] = False
+            new_adjacency = self._complete(new_adjacency)
+            for Y in self._changed_targets(adjacency, new_adjacency):
+                operators[Y] = list(
+                    self._insert_candidates(new_adjacency, Y, max_indegree)
+                )
+            adjacency = new_adjacency
+
+        # Backward phase
+        operators = {
+            Y: list(self._delete_operators(adjacency, [Y])) for Y in range(n_nodes)
+        }
+        while True:
+            best_operation, best_score_delta = None, epsilon
+            for Y in range(n_nodes):
+                for operation, score_delta in operators[Y]:
+                    if score_delta > best_score_delta:
+                        best_operation, best_score_delta = operation, score_delta
+            if best_operation is None:
+                break
+
+            X, Y, H = best_operation
+            new_adjacency = adjacency.copy()
+            new_adjacency[X, Y] = new_adjacency[Y, X] = False
+            for h in H:
+                new_adjacency[h, Y] = False
+                if new_adjacency[X, h]:
+                    new_adjacency[h, X] = False
+            new_adjacency = self._complete(new_adjacency)
+            for Y in self._changed_targets(adjacency, new_adjacency):
+                operators[Y] = list(self._delete_operators(new_adjacency, [Y]))
+            adjacency = new_adjacency
+
+        pdag = self._to_pdag(adjacency)
+        if return_type.lower() == "dag":
+            return pdag.to_dag()
+        return pdag
@@ -1,14 +1,15 @@
 #!/usr/bin/env python
-from itertools import permutations
-
-import networkx as nx
+import numpy as np
+from joblib import effective_n_jobs
 
 from pgmpy.estimators import StructureEstimator, K2Score, ScoreCache
 from pgmpy.base import DAG
 
 
 class HillClimbSearch(StructureEstimator):
-    def __init__(self, data, scoring_method=None, use_cache=True, **kwargs):
+    def __init__(
+        self, data, scoring_method=None, use_cache=True, cache_dir=None, **kwargs
+    ):
         """
         Class for heuristic hill climb searches for DAGs, to learn
         network structure from data. `estimate` attempts to find a model with optimal score.
@@ -40,6 +41,11 @@ class HillClimbSearch(StructureEstimator):
             Note: Caching only works for scoring methods which are decomposible. Can
             give wrong results in case of custom scoring methods.
 
+        cache_dir: str (optional)
+            If provided (and `use_cache` is True), the local scores are also stored
+            on disk in this directory, to be reused by later searches on the same data
+            with the same scoring method. See `ScoreCache`.
+
         References
         ----------
         Koller & Friedman, Probabilistic Graphical Models - Principles and Techniques, 2009
@@ -47,14 +53,127 @@ class HillClimbSearch(StructureEstimator):
         """
         if scoring_method is not None:
             if use_cache:
-                self.scoring_method = ScoreCache.ScoreCache(scoring_method, data)
+                self.scoring_method = ScoreCache.ScoreCache(
+                    scoring_method, data, cache_dir=cache_dir
+                )
             else:
                 self.scoring_method = scoring_method
         else:
-            self.scoring_method = ScoreCache.ScoreCache(K2Score(data, **kwargs), data)
+            self.scoring_method = ScoreCache.ScoreCache(
+                K2Score(data, **kwargs), data, cache_dir=cache_dir
+            )
 
         super(HillClimbSearch, self).__init__(data, **kwargs)
 
+    def _allowed_edges(self, black_list=None, white_list=None):
+        """
+        Returns a boolean matrix, indexed as `self.variables`, which is True for the
+        edges that can be in the model according to `black_list` and `white_list`.
+        """
+        node_index = {node: index for index, node in enumerate(self.variables)}
+        n_nodes = len(self.variables)
+
+        if white_list is None:
+            allowed = ~np.eye(n_nodes, dtype=bool)
+        else:
+            allowed = np.zeros((n_nodes, n_nodes), dtype=bool)
+            for X, Y in white_list:
+                if X in node_index and Y in node_index and X != Y:
+                    allowed[node_index[X], node_index[Y]] = True
+
+        if black_list is not None:
+            for X, Y in black_list:
+                if X in node_index and Y in node_index:
+                    allowed[node_index[X], node_index[Y]] = False
+        return allowed
+
+    @staticmethod
+    def _reachability(adjacency):
+        """
+        Returns the transitive closure of the adjacency matrix of a DAG, i.e. a
+        boolean matrix which is True at [X, Y] if there is a directed path from X to Y.
+        """
+        reach = adjacency.copy()
+        for k in range(len(reach)):
+            reach |= np.outer(reach[:, k], reach[k])
+        return reach
+
+    def _score_deltas(
+        self, nodes, adjacency, allowed, max_indegree=None, pool=None, n_jobs=1
+    ):
+        """
+        Returns a matrix with a column for each of `nodes` (indices in
+        `self.variables`), with the change in the local score of the node for adding
+        each variable to its parents (or removing it, if it already is a parent). The
+        parent sets are only scored for the additions that can be legal, for the rest
+        the matrix is -inf. If a process `pool` is given, the parent sets are split
+        into `n_jobs` chunks which are scored by its workers.
+        """
+        candidates, families = [], []
+        for node in nodes:
+            parents = list(np.flatnonzero(adjacency[:, node]))
+            node_candidates = list(parents)
+            if max_indegree is None or len(parents) < max_indegree:
+                node_candidates += list(
+                    np.flatnonzero(allowed[:, node] & ~adjacency[:, node])
+                )
+
+            parent_sets = [[self.variables[i] for i in parents]]
+            for candidate in node_candidates:
+                if candidate in parents:
+                    new_parents = [i for i in parents if i != candidate]
+                else:
+                    new_parents = sorted(parents + [candidate])
+                parent_sets.append([self.variables[i] for i in new_parents])
+
+            candidates.append(node_candidates)
+            families.append((self.variables[node], parent_sets))
+
+        scores = self._local_scores(families, pool, n_jobs)
+
+        deltas = np.full((len(self.variables), len(nodes)), -np.inf)
+        for column, node_scores in enumerate(scores):
+            deltas[candidates[column], column] = node_scores[1:] - node_scores[0]
+        return deltas
+
+    def _legal_operations_masks(
+        self, adjacency, reach, allowed, tabu_list=[], max_indegree=None
+    ):
+        """
+        Returns boolean matrices, indexed by (X, Y), for the legal operations of the
+        search: (1) adding the edge X -> Y, (2) removing it, or (3) flipping it.
+
+        Acyclicity is checked on the reachability matrix `reach` of the model: X -> Y
+        can be added if there is no path from Y to X, and X -> Y can be flipped if no
+        other parent of Y is reachable from X.
+        """
+        node_index = {node: index for index, node in enumerate(self.variables)}
+        indegree = adjacency.sum(axis=0)
+
+        add = allowed & ~adjacency & ~adjacency.T & ~reach.T
+        remove = adjacency.copy()
+        flip = adjacency & allowed.T
+        for X, Y in zip(*np.nonzero(flip)):
+            if reach[X, adjacency[:, Y]].any():
+                flip[X, Y] = False
+
+        if max_indegree is not None:
+            add &= (indegree + 1 <= max_indegree)[np.newaxis, :]
+            flip &= (indegree + 1 <= max_indegree)[:, np.newaxis]
+
+        for operation, (X, Y) in tabu_list:
+            if X not in node_index or Y not in node_index:
+                continue
+            X, Y = node_index[X], node_index[Y]
+            if operation == "+":
+                add[X, Y] = False
+            elif operation == "-":
+                remove[X, Y] = False
+            elif operation == "flip":
+                flip[X, Y] = flip[Y, X] = False
+
+        return add, remove, flip
+
     def _legal_operations(
         self, model, tabu_list=[], max_indegree=None, black_list=None, white_list=None
     ):
@@ -67,64 +186,34 @@ class HillClimbSearch(StructureEstimator):
         edges can optionally be passed as `black_list` or `white_list` to exclude those
         edges or to limit the search.
         """
+        adjacency = self._adjacency_matrix(model)
+        reach = self._reachability(adjacency)
+        allowed = self._allowed_edges(black_list, white_list)
+        deltas = self._score_deltas(
+            range(len(self.variables)), adjacency, allowed, max_indegree
+        )
 
-        local_score = self.scoring_method.local_score
-        nodes = self.state_names.keys()
-        potential_new_edges = (
-            set(permutations(nodes, 2))
-            - set(model.edges())
-            - set([(Y, X) for (X, Y) in model.edges()])
+        add, remove, flip = self._legal_operations_masks(
+            adjacency, reach, allowed, tabu_list, max_indegree
         )
+        for operation, mask, score_deltas in [
+            ("+", add, deltas),
+            ("-", remove, deltas),
+            ("flip", flip, deltas + deltas.T),
+        ]:
+            for X, Y in zip(*np.nonzero(mask)):
+                yield (
+                    (operation, (self.variables[X], self.variables[Y])),
+                    score_deltas[X, Y],
+                )
 
-        for (X, Y) in potential_new_edges:  # (1) add single edge
-            if nx.is_directed_acyclic_graph(nx.DiGraph(list(model.edges()) + [(X, Y)])):
-                operation = ("+", (X, Y))
-                if (
-                    operation not in tabu_list
-                    and (black_list is None or (X, Y) not in black_list)
-                    and (white_list is None or (X, Y) in white_list)
-                ):
-                    old_parents = model.get_parents(Y)
-                    new_parents = old_parents + [X]
-                    if max_indegree is None or len(new_parents) <= max_indegree:
-                        score_delta = local_score(Y, new_parents) - local_score(
-                            Y, old_parents
-                        )
-                        yield (operation, score_delta)
-
-        for (X, Y) in model.edges():  # (2) remove single edge
-            operation = ("-", (X, Y))
-            if operation not in tabu_list:
-                old_parents = model.get_parents(Y)
-                new_parents = old_parents[:]
-                new_parents.remove(X)
-                score_delta = local_score(Y, new_parents) - local_score(Y, old_parents)
-                yield (operation, score_delta)
-
-        for (X, Y) in model.edges():  # (3) flip single edge
-            new_edges = list(model.edges()) + [(Y, X)]
-            new_edges.remove((X, Y))
-            if nx.is_directed_acyclic_graph(nx.DiGraph(new_edges)):
-                operation = ("flip", (X, Y))
-                if (
-                    operation not in tabu_list
-                    and ("flip", (Y, X)) not in tabu_list
-                    and (black_list is None or (Y, X) not in black_list)
-                    and (white_list is None or (Y, X) in white_list)
-                ):
-                    old_X_parents = model.get_parents(X)
-                    old_Y_parents = model.get_parents(Y)
-                    new_X_parents = old_X_parents + [Y]
-                    new_Y_parents = old_Y_parents[:]
-                    new_Y_parents.remove(X)
-                    if max_indegree is None or len(new_X_parents) <= max_indegree:
-                        score_delta = (
-                            local_score(X, new_X_parents)
-                            + local_score(Y, new_Y_parents)
-                            - local_score(X, old_X_parents)
-                            - local_score(Y, old_Y_parents)
-                        )
-                        yield (operation, score_delta)
+    def _adjacency_matrix(self, model):
+        "Returns the adjacency matrix of `model`, indexed as `self.variables`."
+        node_index = {node: index for index, node in enumerate(self.variables)}
+        adjacency = np.zeros((len(self.variables), len(self.variables)), dtype=bool)
+        for X, Y in model.edges():
+            adjacency[node_index[X], node_index[Y]] = True
+        return adjacency
 
     def estimate(
         self,
@@ -135,6 +224,7 @@ class HillClimbSearch(StructureEstimator):
         white_list=None,
         epsilon=1e-4,
         max_iter=1e6,
+        n_jobs=1,
     ):
         """
         Performs local hill climb search to estimates the `DAG` structure
@@ -171,6 +261,11 @@ class HillClimbSearch(StructureEstimator):
             The maximum number of iterations allowed. Returns the learned model when the
             number of iterations is greater than `max_iter`.
 
+        n_jobs: int (default: 1)
+            The number of worker processes to score the candidate operations with. If
+            -1, all the CPUs are used. Each worker holds its own copy of the data and
+            the scoring method, and only sends back the scores.
+
         Returns
         -------
         model: `DAG` instance
@@ -207,32 +302,83 @@ class HillClimbSearch(StructureEstimator):
         tabu_list = []
         current_model = start
 
-        iter_no = 0
-        while iter_no <= max_iter:
-            iter_no += 1
-
-            best_score_delta = 0
-            best_operation = None
-
-            for operation, score_delta in self._legal_operations(
-                current_model, tabu_list, max_indegree, black_list, white_list
-            ):
-                if score_delta > best_score_delta:
-                    best_operation = operation
-                    best_score_delta = score_delta
-
-            if best_operation is None or best_score_delta < epsilon:
-                break
-            elif best_operation[0] == "+":
-                current_model.add_edge(*best_operation[1])
-                tabu_list = ([("-", best_operation[1])] + tabu_list)[:tabu_length]
-            elif best_operation[0] == "-":
-                current_model.remove_edge(*best_operation[1])
-                tabu_list = ([("+", best_operation[1])] + tabu_list)[:tabu_length]
-            elif best_operation[0] == "flip":
-                X, Y = best_operation[1]
-                current_model.remove_edge(X, Y)
-                current_model.add_edge(Y, X)
-                tabu_list = ([best_operation] + tabu_list)[:tabu_length]
+        # The search state: the adjacency and reachability matrices of the current
+        # model and, for each (X, Y), the change in the score of Y for adding X to
+        # (or removing it from) the parents of Y. An operation only changes the
+        # parents of one node (two for a flip), so only those columns are rescored.
+        n_jobs = effective_n_jobs(n_jobs)
+        pool = self._score_pool(n_jobs)
+        adjacency = self._adjacency_matrix(current_model)
+        reach = self._reachability(adjacency)
+        allowed = self._allowed_edges(black_list, white_list)
+        try:
+            deltas = self._score_deltas(
+                range(len(self.variables)),
+                adjacency,
+                allowed,
+                max_indegree,
+                pool,
+                n_jobs,
+            )
+
+            iter_no = 0
+            while iter_no <= max_iter:
+                iter_no += 1
+
+                add, remove, flip = self._legal_operations_masks(
+                    adjacency, reach, allowed, tabu_list, max_indegree
+                )
+
+                best_score_delta = 0
+                best_operation = None
+                for operation, mask, score_deltas in [
+                    ("+", add, deltas),
+                    ("-", remove, deltas),
+                    ("flip", flip, deltas + deltas.T),
+                ]:
+                    if mask.any():
+                        masked_deltas = np.where(mask, score_deltas, -np.inf)
+                        X, Y = np.unravel_index(masked_deltas.argmax(), mask.shape)
+                        if masked_deltas[X, Y] > best_score_delta:
+                            best_operation = (operation, (X, Y))
+                            best_score_delta = masked_deltas[X, Y]
+
+                if best_operation is None or best_score_delta < epsilon:
+                    break
+
+                operation, (X, Y) = best_operation
+                edge = (self.variables[X], self.variables[Y])
+                if operation == "+":
+                    current_model.add_edge(*edge)
+                    adjacency[X, Y] = True
+                    # Everything reaching X (and X) now reaches everything reached
+                    # from Y.
+                    sources = reach[:, X].copy()
+                    sources[X] = True
+                    targets = reach[Y].copy()
+                    targets[Y] = True
+                    reach |= np.outer(sources, targets)
+                    tabu_list = ([("-", edge)] + tabu_list)[:tabu_length]
+                    changed = [Y]
+                elif operation == "-":
+                    current_model.remove_edge(*edge)
+                    adjacency[X, Y] = False
+                    reach = self._reachability(adjacency)
+                    tabu_list = ([("+", edge)] + tabu_list)[:tabu_length]
+                    changed = [Y]
+                elif operation == "flip":
+                    current_model.remove_edge(*edge)
+                    current_model.add_edge(edge[1], edge[0])
+                    adjacency[X, Y] = False
+                    adjacency[Y, X] = True
+                    reach = self._reachability(adjacency)
+                    tabu_list = ([(operation, edge)] + tabu_list)[:tabu_length]
+                    changed = [X, Y]
+                deltas[:, changed] = self._score_deltas(
+                    changed, adjacency, allowed, max_indegree, pool, n_jobs
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         return current_model
@@ -52,10 +52,19 @@ class MaximumLikelihoodEstimator(ParameterEstimator):
 
         super(MaximumLikelihoodEstimator, self).__init__(model, data, **kwargs)
 
-    def get_parameters(self):
+    def get_parameters(self, n_jobs=1):
         """
         Method to estimate the model parameters (CPDs) using Maximum Likelihood Estimation.
 
+        The state counts of all the nodes are computed at once with a single pass over
+        the data (see `state_counts_arrays`), before estimating the CPDs.
+
+        Parameters
+        ----------
+        n_jobs: int (default: 1)
+            The number of threads to compute the state counts in. -1 means all the
+            CPUs.
+
         Returns
         -------
         parameters: list
@@ -79,13 +88,18 @@ class MaximumLikelihoodEstimator(ParameterEstimator):
         """
         parameters = []
 
-        for node in sorted(self.model.nodes()):
+        nodes = sorted(self.model.nodes())
+        self.state_counts_arrays(
+            [(node, sorted(self.model.get_parents(node))) for node in nodes],
+            n_jobs=n_jobs,
+        )
+        for node in nodes:
             cpd = self.estimate_cpd(node)
             parameters.append(cpd)
 
         return parameters
 
-    def estimate_cpd(self, node):
+    def estimate_cpd(self, node, state_counts=None):
         """
         Method to estimate the CPD for a given variable.
 
@@ -94,6 +108,11 @@ class MaximumLikelihoodEstimator(ParameterEstimator):
         node: int, string (any hashable python object)
             The name of the variable for which the CPD is to be estimated.
 
+        state_counts: 2D array (optional)
+            The state counts of `node` and its (sorted) parents to estimate the CPD
+            from, in the layout of `state_counts_array`, e.g. counts accumulated over
+            several batches of data. Defaults to the state counts of the data.
+
         Returns
         -------
         CPD: TabularCPD
@@ -125,30 +144,22 @@ class MaximumLikelihoodEstimator(ParameterEstimator):
         ╘══════╧══════╧══════╧══════╧══════╛
         """
 
-        state_counts = self.state_counts(node)
-
-        # if a column contains only `0`s (no states observed for some configuration
-        # of parents' states) fill that column uniformly instead
-        state_counts.loc[:, (state_counts == 0).all()] = 1
-
         parents = sorted(self.model.get_parents(node))
         parents_cardinalities = [len(self.state_names[parent]) for parent in parents]
         node_cardinality = len(self.state_names[node])
 
-        # Get the state names for the CPD
-        state_names = {node: list(state_counts.index)}
-        if parents:
-            state_names.update(
-                {
-                    state_counts.columns.names[i]: list(state_counts.columns.levels[i])
-                    for i in range(len(parents))
-                }
-            )
+        if state_counts is None:
+            state_counts = self.state_counts_array(node, parents)
+        state_counts = np.array(state_counts, dtype=float)
+
+        # if a column contains only `0`s (no states observed for some configuration
+        # of parents' states) fill that column uniformly instead
+        state_counts[:, (state_counts == 0).all(axis=0)] = 1
 
         cpd = TabularCPD(
             node,
             node_cardinality,
-            np.array(state_counts),
+            state_counts,
             evidence=parents,
             evidence_card=parents_cardinalities,
             state_names={var: self.state_names[var] for var in chain([node], parents)},
@@ -1,4 +1,8 @@
 #!/usr/bin/env python
+from concurrent.futures import ProcessPoolExecutor
+
+from joblib import effective_n_jobs
+
 from pgmpy.utils.mathext import powerset
 from pgmpy.base import UndirectedGraph
 from pgmpy.models import BayesianModel
@@ -37,8 +41,11 @@ class MmhcEstimator(StructureEstimator):
         http://www.dsl-lab.org/supplements/mmhc_paper/paper_online.pdf
         """
         super(MmhcEstimator, self).__init__(data, **kwargs)
+        self._p_values = {}
 
-    def estimate(self, scoring_method=None, tabu_length=10, significance_level=0.01):
+    def estimate(
+        self, scoring_method=None, tabu_length=10, significance_level=0.01, n_jobs=1
+    ):
         """
         Estimates a BayesianModel for the data set, using MMHC. First estimates a
         graph skeleton using MMPC and then orients the edges using score-based local
@@ -58,6 +65,10 @@ class MmhcEstimator(StructureEstimator):
             during the search procedure. This serves to enforce a wider exploration
             of the search space. Default value: 100.
 
+        n_jobs: int (default: 1)
+            The number of worker processes for the MMPC searches (see `mmpc`) and the
+            hill climbing (see `HillClimbSearch.estimate`). -1 means all the CPUs.
+
         Returns
         -------
         model: BayesianModel()-instance, not yet parametrized.
@@ -83,20 +94,27 @@ class MmhcEstimator(StructureEstimator):
         if scoring_method is None:
             scoring_method = BDeuScore(self.data, equivalent_sample_size=10)
 
-        skel = self.mmpc(significance_level)
+        skel = self.mmpc(significance_level, n_jobs=n_jobs)
 
         hc = HillClimbSearch(self.data, scoring_method=scoring_method)
 
         model = hc.estimate(
-            white_list=skel.to_directed().edges(), tabu_length=tabu_length
+            white_list=skel.to_directed().edges(),
+            tabu_length=tabu_length,
+            n_jobs=n_jobs,
         )
 
         return model
 
-    def mmpc(self, significance_level=0.01):
+    def mmpc(self, significance_level=0.01, n_jobs=1):
         """Estimates a graph skeleton (UndirectedGraph) for the data set, using then
         MMPC (max-min parents-and-children) algorithm.
 
+        The p-values of the independence tests are memoized, so the tests repeated
+        in the forward and backward phases and for the other nodes aren't recomputed,
+        and the minimal associations of the candidates are updated incrementally,
+        with only the conditioning sets that contain the last added neighbor.
+
         Parameters
         ----------
         significance_level: float, default=0.01
@@ -107,6 +125,10 @@ class MmhcEstimator(StructureEstimator):
             given that they are. The lower `significance_level`, the less likely
             we are to accept dependencies, resulting in a sparser graph.
 
+        n_jobs: int (default: 1)
+            The number of worker processes to run the searches of the parents and
+            children of the nodes in. -1 means all the CPUs.
+
         Returns
         -------
         skeleton: UndirectedGraph
@@ -153,65 +175,31 @@ class MmhcEstimator(StructureEstimator):
         {('X', 'Y'): ('Z',)}
         """
 
-        nodes = self.state_names.keys()
-
-        def assoc(X, Y, Zs):
-            """Measure for (conditional) association between variables. Use negative
-            p-value of independence test.
-            """
-            return 1 - chi_square(X, Y, Zs, self.data)[1]
-
-        def min_assoc(X, Y, Zs):
-            "Minimal association of X, Y given any subset of Zs."
-            return min(assoc(X, Y, Zs_subset) for Zs_subset in powerset(Zs))
-
-        def max_min_heuristic(X, Zs):
-            "Finds variable that maximizes min_assoc with `node` relative to `neighbors`."
-            max_min_assoc = 0
-            best_Y = None
-
-            for Y in set(nodes) - set(Zs + [X]):
-                min_assoc_val = min_assoc(X, Y, Zs)
-                if min_assoc_val >= max_min_assoc:
-                    best_Y = Y
-                    max_min_assoc = min_assoc_val
-
-            return (best_Y, max_min_assoc)
+        nodes = list(self.state_names.keys())
+        # The cache of the encoded data and the p-values of the independence tests
+        # of this search.
+        self._ci_test_cache = {}
+        self._p_values = {}
 
         # Find parents and children for each node
-        neighbors = dict()
-        for node in nodes:
-            neighbors[node] = []
-
-            # Forward Phase
-            while True:
-                new_neighbor, new_neighbor_min_assoc = max_min_heuristic(
-                    node, neighbors[node]
-                )
-                if new_neighbor_min_assoc > 0:
-                    neighbors[node].append(new_neighbor)
-                else:
-                    break
-
-            # Backward Phase
-            for neigh in neighbors[node]:
-                other_neighbors = [n for n in neighbors[node] if n != neigh]
-                for sep_set in powerset(other_neighbors):
-                    if chi_square(
-                        X=node,
-                        Y=neigh,
-                        Z=sep_set,
-                        data=self.data,
-                        significance_level=significance_level,
-                    ):
-                        neighbors[node].remove(neigh)
-                        break
+        n_jobs = effective_n_jobs(n_jobs)
+        if n_jobs == 1:
+            neighbors = {
+                node: self._mmpc_node(node, significance_level) for node in nodes
+            }
+        else:
+            with ProcessPoolExecutor(
+                max_workers=n_jobs,
+                initializer=_init_mmpc_worker,
+                initargs=(self, significance_level),
+            ) as pool:
+                neighbors = dict(zip(nodes, pool.map(_mmpc_worker, nodes)))
 
         # correct for false positives
         for node in nodes:
-            for neigh in neighbors[node]:
-                if node not in neighbors[neigh]:
-                    neighbors[node].remove(neigh)
+            neighbors[node] = [
+                neigh for neigh in neighbors[node] if node in neighbors[neigh]
+            ]
 
         skel = UndirectedGraph()
         skel.add_nodes_from(nodes)
@@ -219,3 +207,74 @@ class MmhcEstimator(StructureEstimator):
             skel.add_edges_from([(node, neigh) for neigh in neighbors[node]])
 
         return skel
+
+    def _assoc(self, X, Y, Zs, significance_level):
+        """Measure for (conditional) association between variables: 1 - p-value of the
+        independence test, or 0 if X and Y are independent given Zs at
+        `significance_level`. The p-values are memoized.
+        """
+        key = (frozenset((X, Y)), frozenset(Zs))
+        if key not in self._p_values:
+            _, _, p_value = chi_square(
+                X, Y, list(Zs), self.data, boolean=False, cache=self._ci_test_cache
+            )
+            self._p_values[key] = p_value
+        p_value = self._p_values[key]
+        return 1 - p_value if p_value < significance_level else 0
+
+    def _mmpc_node(self, node, significance_level):
+        "Finds the (candidate) parents and children of `node` with MMPC."
+        neighbors = []
+
+        # Minimal association of each candidate with `node` given any subset of
+        # `neighbors`. The association can only decrease when a neighbor is added,
+        # so the candidates with association 0 are dropped.
+        min_assocs = {}
+        for Y in self.state_names:
+            if Y != node:
+                min_assoc = self._assoc(node, Y, (), significance_level)
+                if min_assoc > 0:
+                    min_assocs[Y] = min_assoc
+
+        # Forward Phase: add the candidate that maximizes the minimal association.
+        while min_assocs:
+            new_neighbor = max(min_assocs, key=min_assocs.get)
+            del min_assocs[new_neighbor]
+
+            # Only the subsets with the new neighbor need to be tested.
+            for Y in list(min_assocs):
+                for Zs in powerset(neighbors):
+                    min_assocs[Y] = min(
+                        min_assocs[Y],
+                        self._assoc(node, Y, Zs + (new_neighbor,), significance_level),
+                    )
+                    if min_assocs[Y] == 0:
+                        del min_assocs[Y]
+                        break
+            neighbors.append(new_neighbor)
+
+        # Backward Phase
+        for neigh in list(neighbors):
+            other_neighbors = [n for n in neighbors if n != neigh]
+            for sep_set in powerset(other_neighbors):
+                if self._assoc(node, neigh, sep_set, significance_level) == 0:
+                    neighbors.remove(neigh)
+                    break
+
+        return neighbors
+
+
+# The estimator and the significance level in a worker process of
+# `MmhcEstimator.mmpc`.
+_worker_estimator = None
+_worker_significance_level = None
+
+
+def _init_mmpc_worker(estimator, significance_level):
+    global _worker_estimator, _worker_significance_level
+    _worker_estimator = estimator
+    _worker_significance_level = significance_level
+
+
+def _mmpc_worker(node):
+    return _worker_estimator._mmpc_node(node, _worker_significance_level)
@@ -1,17 +1,39 @@
 #!/usr/bin/env python
 
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from warnings import warn
-from itertools import combinations
-from joblib import Parallel, delayed
+from itertools import chain, combinations, repeat
+from joblib import Parallel, delayed, effective_n_jobs
 import networkx as nx
+import numpy as np
+import pandas as pd
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
 
 from pgmpy.base import PDAG
-from pgmpy.estimators import StructureEstimator
-from pgmpy.estimators.CITests import chi_square, pearsonr, independence_match
+from pgmpy.estimators import BaseEstimator, StructureEstimator
+from pgmpy.estimators.CITests import (
+    chi_square,
+    g_sq,
+    fisher_z,
+    pearsonr,
+    independence_match,
+)
 
 
 class PC(StructureEstimator):
-    def __init__(self, data=None, independencies=None, **kwargs):
+    def __init__(
+        self,
+        data=None,
+        independencies=None,
+        covariance=None,
+        sample_size=None,
+        **kwargs,
+    ):
         """
         Class for constraint-based estimation of DAGs using the PC algorithm
         from a given data set.  Identifies (conditional) dependencies in data
@@ -27,6 +49,18 @@ class PC(StructureEstimator):
             `numpy.NaN`.  Note that pandas converts each column containing
             `numpy.NaN`s to dtype `float`.)
 
+        independencies: Independencies object (optional)
+            The independencies to use with `ci_test="independence_match"`.
+
+        covariance: pandas DataFrame object (optional)
+            The covariance (or correlation) matrix of continuous variables, indexed by
+            the variable names in both the index and the columns. Can be given instead
+            of `data` to learn the structure from summary statistics with
+            `ci_test="fisher_z"`.
+
+        sample_size: int (optional)
+            The number of samples `covariance` is computed from.
+
         References
         ----------
         [1] Koller & Friedman, Probabilistic Graphical Models - Principles and Techniques,
@@ -34,6 +68,10 @@ class PC(StructureEstimator):
         [2] Neapolitan, Learning Bayesian Networks, Section 10.1.2 for the PC algorithm (page 550), http://www.cs.technion.ac.il/~dang/books/Learning%20Bayesian%20Networks(Neapolitan,%20Richard).pdf
         """
         super(PC, self).__init__(data=data, independencies=independencies, **kwargs)
+        self.covariance = covariance
+        self.sample_size = sample_size
+        if (data is None) and (covariance is not None):
+            self.variables = list(covariance.columns)
 
     def estimate(
         self,
@@ -54,7 +92,7 @@ class PC(StructureEstimator):
 
         Parameters
         ----------
-        variant: str (one of "orig", "stable", "parallel")
+        variant: str (one of "orig", "stable", "parallel", "processes")
             The variant of PC algorithm to run.
                 "orig": The original PC algorithm. Might not give the same
                         results in different runs but does less independence
@@ -63,6 +101,10 @@ class PC(StructureEstimator):
                         do more statistical independence tests.
                 "parallel": Parallel version of PC Stable. Can run on multiple
                         cores with the same result on each run.
+                "processes": Parallel version of PC Stable which runs the tests in
+                        `n_jobs` worker processes, with the data in shared memory.
+                        Gives the same result for any number of workers. `ci_test`
+                        must be picklable (e.g. not a lambda).
 
         ci_test: str or fun
             The statistical test to use for testing conditional independence in
@@ -71,9 +113,15 @@ class PC(StructureEstimator):
                         `independencies` must be specified.
                 "chi_square": Uses the Chi-Square independence test. This works
                         only for discrete datasets.
+                "g_sq": Uses the G-test (log-likelihood ratio) independence test.
+                        This works only for discrete datasets.
                 "pearsonr": Uses the pertial correlation based on pearson
                         correlation coefficient to test independence. This works
                         only for continuous datasets.
+                "fisher_z": Uses Fisher's z test of the partial correlation,
+                        computed from the correlation matrix of the data or from
+                        the `covariance` given in the constructor. This works
+                        only for continuous datasets.
 
         max_cond_vars: int
             The maximum number of conditional variables allowed to do the statistical
@@ -92,10 +140,14 @@ class PC(StructureEstimator):
             The statistical tests use this value to compare with the p-value of
             the test to decide whether the tested variables are independent or
             not. Different tests can treat this parameter differently:
-                1. Chi-Square: If p-value > significance_level, it assumes that the
-                    independence condition satisfied in the data.
-                2. pearsonr: If p-value > significance_level, it assumes that the
-                    independence condition satisfied in the data.
+                1. Chi-Square and G-test: If p-value > significance_level, it assumes
+                    that the independence condition satisfied in the data.
+                2. pearsonr and fisher_z: If p-value > significance_level, it assumes
+                    that the independence condition satisfied in the data.
+
+        n_jobs: int (default: -1)
+            The number of threads of the "parallel" variant, or of worker processes
+            of the "processes" variant. -1 means all the CPUs.
 
         Returns
         -------
@@ -142,25 +194,30 @@ class PC(StructureEstimator):
         [('Z', 'sum'), ('X', 'sum'), ('Y', 'sum')]
         """
         # Step 0: Do checks that the specified parameters are correct, else throw meaningful error.
-        if variant not in ("orig", "stable", "parallel"):
+        if variant not in ("orig", "stable", "parallel", "processes"):
             raise ValueError(
-                f"variant must be one of: orig, stable, or parallel. Got: {variant}"
+                f"variant must be one of: orig, stable, parallel, or processes. Got: {variant}"
             )
         elif (not callable(ci_test)) and (
-            ci_test not in ("chi_square", "independence_match", "pearsonr")
+            ci_test
+            not in ("chi_square", "g_sq", "independence_match", "pearsonr", "fisher_z")
         ):
             raise ValueError(
-                "ci_test must be a callable or one of: chi_square, pearsonr, independence_match"
+                "ci_test must be a callable or one of: chi_square, g_sq, pearsonr, fisher_z, independence_match"
             )
 
         if (ci_test == "independence_match") and (self.independencies is None):
             raise ValueError(
                 "For using independence_match, independencies argument must be specified"
             )
-        elif (ci_test in ("chi_square", "pearsonr")) and (self.data is None):
+        elif (ci_test in ("chi_square", "g_sq", "pearsonr")) and (self.data is None):
             raise ValueError(
                 "For using Chi Square or Pearsonr, data arguement must be specified"
             )
+        elif ci_test == "fisher_z" and self.data is None and self.covariance is None:
+            raise ValueError(
+                "For using fisher_z, data or covariance argument must be specified"
+            )
 
         # Step 1: Run the PC algorithm to build the skeleton and get the separating sets.
         skel, separating_sets = self.build_skeleton(
@@ -257,8 +314,12 @@ class PC(StructureEstimator):
         separating_sets = dict()
         if ci_test == "chi_square":
             ci_test = chi_square
+        elif ci_test == "g_sq":
+            ci_test = g_sq
         elif ci_test == "pearsonr":
             ci_test = pearsonr
+        elif ci_test == "fisher_z":
+            ci_test = fisher_z
         elif ci_test == "independence_match":
             ci_test = independence_match
         elif callable(ci_test):
@@ -269,97 +330,205 @@ class PC(StructureEstimator):
         # Step 1: Initialize a fully connected undirected graph
         graph = nx.complete_graph(n=self.variables, create_using=nx.Graph)
 
-        # Exit condition: 1. If all the nodes in graph has less than `lim_neighbors` neighbors.
-        #             or  2. `lim_neighbors` is greater than `max_conditional_variables`.
-        while not all(
-            [len(list(graph.neighbors(var))) < lim_neighbors for var in self.variables]
-        ):
-
-            # Step 2: Iterate over the edges and find a conditioning set of
-            # size `lim_neighbors` which makes u and v independent.
-            if variant == "orig":
-                for (u, v) in graph.edges():
-                    for separating_set in combinations(
-                        set(graph.neighbors(u)) - set([v]), lim_neighbors
-                    ):
-                        # If a conditioning set exists remove the edge, store the separating set
-                        # and move on to finding conditioning set for next edge.
-                        if ci_test(
-                            u,
-                            v,
-                            separating_set,
-                            data=self.data,
-                            independencies=self.independencies,
-                            significance_level=significance_level,
+        # The cache of the CI tests (e.g. the encoded data and the results of the
+        # tests) for this skeleton, see `power_divergence`.
+        cache = {}
+        if ci_test in (chi_square, g_sq) and self.data is not None:
+            # The data is encoded before the threads of the parallel variant share it.
+            cache["estimator"] = BaseEstimator(self.data)
+            cache["estimator"]._encode_data()
+        n_workers = effective_n_jobs(n_jobs)
+        node_order = {node: index for index, node in enumerate(self.variables)}
+        with self._skeleton_pool(
+            variant, ci_test, significance_level, n_workers
+        ) as pool:
+            # Exit condition: 1. If all the nodes in graph has less than `lim_neighbors` neighbors.
+            #             or  2. `lim_neighbors` is greater than `max_conditional_variables`.
+            while not all(
+                [
+                    len(list(graph.neighbors(var))) < lim_neighbors
+                    for var in self.variables
+                ]
+            ):
+
+                # Step 2: Iterate over the edges and find a conditioning set of
+                # size `lim_neighbors` which makes u and v independent.
+                if variant == "orig":
+                    for (u, v) in graph.edges():
+                        for separating_set in combinations(
+                            set(graph.neighbors(u)) - set([v]), lim_neighbors
                         ):
-                            separating_sets[frozenset((u, v))] = separating_set
-                            graph.remove_edge(u, v)
-                            break
-
-            elif variant == "stable":
-                # In case of stable, precompute neighbors as this is the stable algorithm.
-                neighbors = {node: set(graph[node]) for node in graph.nodes()}
-                for (u, v) in graph.edges():
-                    for separating_set in combinations(
-                        neighbors[u] - set([v]), lim_neighbors
-                    ):
-                        # If a conditioning set exists remove the edge, store the
-                        # separating set and move on to finding conditioning set for next edge.
-                        if ci_test(
-                            u,
-                            v,
-                            separating_set,
-                            data=self.data,
-                            independencies=self.independencies,
-                            significance_level=significance_level,
+                            # If a conditioning set exists remove the edge, store the separating set
+                            # and move on to finding conditioning set for next edge.
+                            if ci_test(
+                                u,
+                                v,
+                                separating_set,
+                                data=self.data,
+                                independencies=self.independencies,
+                                covariance=self.covariance,
+                                sample_size=self.sample_size,
+                                significance_level=significance_level,
+                                cache=cache,
+                            ):
+                                separating_sets[frozenset((u, v))] = separating_set
+                                graph.remove_edge(u, v)
+                                break
+
+                elif variant == "stable":
+                    # In case of stable, precompute neighbors as this is the stable algorithm.
+                    neighbors = {node: set(graph[node]) for node in graph.nodes()}
+                    for (u, v) in graph.edges():
+                        for separating_set in combinations(
+                            neighbors[u] - set([v]), lim_neighbors
                         ):
-                            separating_sets[frozenset((u, v))] = separating_set
-                            graph.remove_edge(u, v)
-                            break
-
-            elif variant == "parallel":
-                neighbors = {node: set(graph[node]) for node in graph.nodes()}
-
-                def _parallel_fun(u, v):
-                    for separating_set in combinations(
-                        neighbors[u] - set([v]), lim_neighbors
-                    ):
-                        if ci_test(
-                            u,
-                            v,
-                            separating_set,
-                            data=self.data,
-                            independencies=self.independencies,
-                            significance_level=significance_level,
+                            # If a conditioning set exists remove the edge, store the
+                            # separating set and move on to finding conditioning set for next edge.
+                            if ci_test(
+                                u,
+                                v,
+                                separating_set,
+                                data=self.data,
+                                independencies=self.independencies,
+                                covariance=self.covariance,
+                                sample_size=self.sample_size,
+                                significance_level=significance_level,
+                                cache=cache,
+                            ):
+                                separating_sets[frozenset((u, v))] = separating_set
+                                graph.remove_edge(u, v)
+                                break
+
+                elif variant == "parallel":
+                    neighbors = {node: set(graph[node]) for node in graph.nodes()}
+
+                    def _parallel_fun(u, v):
+                        for separating_set in combinations(
+                            neighbors[u] - set([v]), lim_neighbors
                         ):
-                            return (u, v), separating_set
-
-                results = Parallel(n_jobs=n_jobs, prefer="threads")(
-                    delayed(_parallel_fun)(u, v) for (u, v) in graph.edges()
-                )
-                for result in results:
-                    if result is not None:
-                        (u, v), sep_set = result
-                        graph.remove_edge(u, v)
-                        separating_sets[frozenset((u, v))] = sep_set
+                            if ci_test(
+                                u,
+                                v,
+                                separating_set,
+                                data=self.data,
+                                independencies=self.independencies,
+                                covariance=self.covariance,
+                                sample_size=self.sample_size,
+                                significance_level=significance_level,
+                                cache=cache,
+                            ):
+                                return (u, v), separating_set
+
+                    results = Parallel(n_jobs=n_jobs, prefer="threads")(
+                        delayed(_parallel_fun)(u, v) for (u, v) in graph.edges()
+                    )
+                    for result in results:
+                        if result is not None:
+                            (u, v), sep_set = result
+                            graph.remove_edge(u, v)
+                            separating_sets[frozenset((u, v))] = sep_set
+
+                elif variant == "processes":
+                    # The edges are tested in batches by the workers, with the
+                    # neighbors at the start of the level (as in stable). The
+                    # candidates are sorted, so the separating sets don't depend on
+                    # the number of workers.
+                    neighbors = {node: set(graph[node]) for node in graph.nodes()}
+                    edges = [
+                        (u, v, sorted(neighbors[u] - set([v]), key=node_order.get))
+                        for (u, v) in graph.edges()
+                    ]
+                    batch_size = max(-(-len(edges) // (4 * n_workers)), 1)
+                    batches = [
+                        edges[i : i + batch_size]
+                        for i in range(0, len(edges), batch_size)
+                    ]
+                    results = chain.from_iterable(
+                        pool.map(_skeleton_worker, batches, repeat(lim_neighbors))
+                    )
+                    for (u, v, _), separating_set in zip(edges, results):
+                        if separating_set is not None:
+                            graph.remove_edge(u, v)
+                            separating_sets[frozenset((u, v))] = separating_set
 
-            else:
-                raise ValueError(
-                    f"variant must be one of (orig, stable, parallel). Got: {variant}"
-                )
+                else:
+                    raise ValueError(
+                        f"variant must be one of (orig, stable, parallel, processes). Got: {variant}"
+                    )
 
-            # Step 3: After iterating over all the edges, expand the search space by increasing the size
-            #         of conditioning set by 1.
-            if lim_neighbors >= max_cond_vars:
-                warn("Reached maximum number of allowed conditional variables. Exiting")
-            lim_neighbors += 1
+                # Step 3: After iterating over all the edges, expand the search space by increasing the size
+                #         of conditioning set by 1.
+                if lim_neighbors >= max_cond_vars:
+                    warn(
+                        "Reached maximum number of allowed conditional variables. Exiting"
+                    )
+                lim_neighbors += 1
 
         return graph, separating_sets
 
+    @contextmanager
+    def _skeleton_pool(self, variant, ci_test, significance_level, n_jobs):
+        """
+        Context manager for the process pool of the "processes" variant of
+        `build_skeleton`, which is None for the other variants. The data is put in
+        shared memory once, as a float column for each variable (non-numeric columns
+        are replaced by their integer codes, which doesn't change the tests), and the
+        workers use it without copying it. Before Python 3.8, where there is no
+        `multiprocessing.shared_memory`, each worker gets a copy of the data.
+        """
+        if variant != "processes":
+            yield None
+            return
+
+        shared, data_args = None, None
+        if self.data is not None:
+            shape = (len(self.data.columns), len(self.data))
+            if shared_memory is not None:
+                shared = shared_memory.SharedMemory(
+                    create=True, size=max(int(np.prod(shape)) * 8, 1)
+                )
+                array = np.ndarray(shape, buffer=shared.buf)
+            else:
+                array = np.empty(shape)
+            for row, column in enumerate(self.data.columns):
+                values = self.data[column]
+                if not pd.api.types.is_numeric_dtype(values):
+                    codes = pd.Categorical(values).codes
+                    values = np.where(codes == -1, np.nan, codes)
+                array[row] = values
+            data_args = (
+                array if shared is None else shared.name,
+                shape,
+                list(self.data.columns),
+            )
+            del array
+
+        pool = ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_skeleton_worker,
+            initargs=(
+                data_args,
+                ci_test,
+                self.independencies,
+                self.covariance,
+                self.sample_size,
+                significance_level,
+            ),
+        )
+        try:
+            yield pool
+        finally:
+            pool.shutdown()
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+
     @staticmethod
     def skeleton_to_pdag(skeleton, separating_sets):
         """Orients the edges of a graph skeleton based on information from
-        `separating_sets` to form a DAG pattern (DAG).
+        `separating_sets` to form a DAG pattern (DAG). The v-structures are found,
+        and the remaining edges oriented with Meek's rules, on the boolean adjacency
+        matrix of the skeleton.
 
         Parameters
         ----------
@@ -400,63 +569,132 @@ class PC(StructureEstimator):
         [('B', 'C'), ('A', 'C'), ('A', 'D'), ('D', 'A')]
         """
 
-        pdag = skeleton.to_directed()
-        node_pairs = combinations(pdag.nodes(), 2)
+        # The PDAG as a boolean adjacency matrix, with both directions of the
+        # undirected edges.
+        nodes = list(skeleton.nodes())
+        node_index = {node: index for index, node in enumerate(nodes)}
+        skel = nx.to_numpy_array(skeleton, nodelist=nodes, weight=None, dtype=bool)
+        pdag = skel.copy()
 
         # 1) for each X-Z-Y, if Z not in the separating set of X,Y, then orient edges as X->Z<-Y
         # (Algorithm 3.4 in Koller & Friedman PGM, page 86)
-        for X, Y in node_pairs:
-            if not skeleton.has_edge(X, Y):
-                for Z in set(skeleton.neighbors(X)) & set(skeleton.neighbors(Y)):
-                    if Z not in separating_sets[frozenset((X, Y))]:
-                        pdag.remove_edges_from([(Z, X), (Z, Y)])
+        common_neighbors = skel.astype(float) @ skel.astype(float)
+        for X, Y in zip(*np.nonzero(np.triu((common_neighbors > 0) & ~skel, k=1))):
+            Zs = skel[X] & skel[Y]
+            separating_set = separating_sets[frozenset((nodes[X], nodes[Y]))]
+            Zs[[node_index[Z] for Z in separating_set]] = False
+            pdag[Zs, X] = False
+            pdag[Zs, Y] = False
+
+        # 2) orient the remaining undirected edges with Meek's rules.
+        pdag = PC._apply_meek_rules(pdag)
+
+        edges = [(nodes[X], nodes[Y]) for X, Y in zip(*np.nonzero(pdag))]
+        undirected = pdag & pdag.T
+        undirected_edges = [edge for edge, u in zip(edges, undirected[pdag]) if u]
+        directed_edges = [edge for edge, u in zip(edges, undirected[pdag]) if not u]
+        return PDAG(directed_ebunch=directed_edges, undirected_ebunch=undirected_edges)
 
+    @staticmethod
+    def _apply_meek_rules(adjacency):
+        """
+        Orients the undirected edges of the PDAG `adjacency` (a boolean adjacency
+        matrix with both directions of the undirected edges) with Meek's rules R1-R4
+        until none of them applies. Each rule is applied to all the undirected edges
+        at once with matrix products. Edges which would be oriented both ways are left
+        undirected.
+
+        References
+        ----------
+        Meek, Christopher. "Causal inference and causal explanation with background
+        knowledge." Proceedings of the Eleventh Conference on Uncertainty in
+        Artificial Intelligence (1995).
+        """
+        adjacency = adjacency.copy()
         progress = True
         while progress:  # as long as edges can be oriented (removed)
-            num_edges = pdag.number_of_edges()
-
-            # 2) for each X->Z-Y, orient edges to Z->Y
-            for X, Y in node_pairs:
-                for Z in (set(pdag.successors(X)) - set(pdag.predecessors(X))) & (
-                    set(pdag.successors(Y)) & set(pdag.predecessors(Y))
-                ):
-                    pdag.remove(Y, Z)
-
-            # 3) for each X-Y with a directed path from X to Y, orient edges to X->Y
-            for X, Y in node_pairs:
-                for path in nx.all_simple_paths(pdag, X, Y):
-                    is_directed = True
-                    for src, dst in path:
-                        if pdag.has_edge(dst, src):
-                            is_directed = False
-                    if is_directed:
-                        pdag.remove(Y, X)
-                        break
-
-            # 4) for each X-Z-Y with X->W, Y->W, and Z-W, orient edges to Z->W
-            for X, Y in node_pairs:
-                for Z in (
-                    set(pdag.successors(X))
-                    & set(pdag.predecessors(X))
-                    & set(pdag.successors(Y))
-                    & set(pdag.predecessors(Y))
-                ):
-                    for W in (
-                        (set(pdag.successors(X)) - set(pdag.predecessors(X)))
-                        & (set(pdag.successors(Y)) - set(pdag.predecessors(Y)))
-                        & (set(pdag.successors(Z)) & set(pdag.predecessors(Z)))
-                    ):
-                        pdag.remove(W, Z)
-
-            progress = num_edges > pdag.number_of_edges()
-
-        # TODO: This is temp fix to get a PDAG object.
-        edges = set(pdag.edges())
-        undirected_edges = []
-        directed_edges = []
-        for u, v in edges:
-            if (v, u) in edges:
-                undirected_edges.append((u, v))
-            else:
-                directed_edges.append((u, v))
-        return PDAG(directed_ebunch=directed_edges, undirected_ebunch=undirected_edges)
+            progress = False
+            for rule in (1, 2, 3, 4):
+                undirected = adjacency & adjacency.T
+                if not undirected.any():
+                    return adjacency
+                directed = (adjacency & ~adjacency.T).astype(float)
+                adjacent = adjacency | adjacency.T
+                non_adjacent = ~adjacent
+                np.fill_diagonal(non_adjacent, False)
+
+                if rule == 1:
+                    # R1: W -> X - Y, and W, Y not adjacent: orient X -> Y
+                    orient = (directed.T @ non_adjacent) > 0
+                elif rule == 2:
+                    # R2: X -> W -> Y and X - Y: orient X -> Y
+                    orient = (directed @ directed) > 0
+                else:
+                    X, Y = np.nonzero(undirected)
+                    if rule == 3:
+                        # R3: X - W1 -> Y, X - W2 -> Y, W1, W2 not adjacent and X - Y:
+                        # orient X -> Y
+                        Ws = undirected[X] & (directed[:, Y].T > 0)
+                        found = ((Ws @ non_adjacent.astype(float)) > 0) & Ws
+                    else:
+                        # R4: X - W -> V -> Y, W, Y not adjacent, X, V adjacent and
+                        # X - Y: orient X -> Y
+                        Ws = undirected[X] & non_adjacent[:, Y].T
+                        Vs = (Ws @ directed) > 0
+                        found = Vs & (directed[:, Y].T > 0) & adjacent[X]
+                    orient = np.zeros_like(adjacency)
+                    orient[X, Y] = found.any(axis=1)
+
+                orient &= undirected
+                orient &= ~orient.T
+                if orient.any():
+                    adjacency[orient.T] = False
+                    progress = True
+        return adjacency
+
+
+# The CI test, its arguments and the shared memory of the data in a worker process
+# of `PC._skeleton_pool`.
+_worker_ci_test = None
+_worker_ci_test_kwargs = None
+_worker_shared_memory = None
+
+
+def _init_skeleton_worker(
+    data_args, ci_test, independencies, covariance, sample_size, significance_level
+):
+    global _worker_ci_test, _worker_ci_test_kwargs, _worker_shared_memory
+    data = None
+    if data_args is not None:
+        array, shape, columns = data_args
+        if isinstance(array, str):
+            _worker_shared_memory = shared_memory.SharedMemory(name=array)
+            array = np.ndarray(shape, buffer=_worker_shared_memory.buf)
+        # Each column of `array` is a variable, so this doesn't copy the data.
+        data = pd.DataFrame(array.T, columns=columns, copy=False)
+
+    _worker_ci_test = ci_test
+    _worker_ci_test_kwargs = dict(
+        data=data,
+        independencies=independencies,
+        covariance=covariance,
+        sample_size=sample_size,
+        significance_level=significance_level,
+        cache={},
+    )
+
+
+def _skeleton_worker(edges, lim_neighbors):
+    """
+    For each (u, v, candidates) in `edges`, returns the first separating set of
+    `lim_neighbors` candidates that makes u and v independent, or None.
+    """
+    results = []
+    for u, v, candidates in edges:
+        for separating_set in combinations(candidates, lim_neighbors):
+            if _worker_ci_test(u, v, separating_set, **_worker_ci_test_kwargs):
+                results.append(separating_set)
+                break
+        else:
+            results.append(None)
+    return results
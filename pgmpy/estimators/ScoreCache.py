@@ -1,9 +1,25 @@
 #!/usr/bin/env python
+import hashlib
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
 from pgmpy.estimators import StructureScore
 
 
 class ScoreCache(StructureScore):
-    def __init__(self, base_scorer, data, max_size=10000, **kwargs):
+    def __init__(
+        self,
+        base_scorer,
+        data,
+        max_size=10000,
+        cache_dir=None,
+        max_disk_size=1000000,
+        **kwargs
+    ):
         """
         A wrapper class for StructureScore instances, which implement a decomposable score,
         that caches local scores.
@@ -20,6 +36,15 @@ class ScoreCache(StructureScore):
         max_size: int (optional, default 10_000)
             The maximum number of elements allowed in the cache. When the limit is reached, the least recently used
             entries will be discarded.
+        cache_dir: str (optional, default None)
+            If provided, the local scores are also stored in a SQLite database in this
+            directory, which persists across runs and can be shared by several processes.
+            The stored scores are keyed by a fingerprint of the data, the type of the
+            base scorer and its hyperparameters, so they are only reused for the same
+            score on the same data.
+        max_disk_size: int (optional, default 1_000_000)
+            The maximum number of local scores stored in the database in `cache_dir`.
+            When the limit is reached, the least recently used scores are removed.
         **kwargs
             Additional arguments that will be handed to the super constructor.
 
@@ -36,19 +61,267 @@ class ScoreCache(StructureScore):
         self.cache = LRUCache(
             original_function=self._wrapped_original, max_size=int(max_size)
         )
+        if cache_dir is None:
+            self.disk_cache = None
+        else:
+            self.disk_cache = SQLiteCache(
+                path=os.path.join(cache_dir, "scores.sqlite"),
+                namespace=self._fingerprint(),
+                max_size=int(max_disk_size),
+            )
         super(ScoreCache, self).__init__(data, **kwargs)
 
+    def _fingerprint(self):
+        """
+        Returns a hash of the data of the base scorer, its state names, its type and
+        its (scalar) hyperparameters. Private attributes (e.g. the state of the
+        counting) aren't hyperparameters, so a scorer which has already computed some
+        scores has the same fingerprint as a new one.
+        """
+        scorer = self.base_scorer
+        fingerprint = hashlib.sha256()
+        fingerprint.update(type(scorer).__qualname__.encode())
+        hyperparameters = sorted(
+            (name, value)
+            for name, value in vars(scorer).items()
+            if not name.startswith("_") and isinstance(value, (bool, int, float, str))
+        )
+        fingerprint.update(repr(hyperparameters).encode())
+        fingerprint.update(repr(sorted(scorer.state_names.items(), key=repr)).encode())
+        fingerprint.update(repr(list(scorer.data.columns)).encode())
+        fingerprint.update(pd.util.hash_pandas_object(scorer.data, index=False).values)
+        return fingerprint.hexdigest()
+
     def local_score(self, variable, parents):
         hashable = tuple(parents)
         return self.cache(variable, hashable)
 
+    def local_scores(self, variable, parent_sets):
+        """
+        Computes the local scores of `variable` for each of the `parent_sets`. The
+        cached scores are reused and all the others are computed with a single call
+        to `local_scores` of the base scorer.
+        """
+        parent_sets = [tuple(parents) for parents in parent_sets]
+        scores = np.empty(len(parent_sets))
+        uncached = {}
+        for index, parents in enumerate(parent_sets):
+            score = self.cache.get((variable, parents))
+            if score is None:
+                uncached.setdefault(parents, []).append(index)
+            else:
+                scores[index] = score
+
+        if uncached:
+            new_scores = self._wrapped_original_many(variable, list(uncached))
+            for (parents, indices), score in zip(uncached.items(), new_scores):
+                self.cache.put((variable, parents), score)
+                scores[indices] = score
+        return scores
+
+    def __getstate__(self):
+        # The cached scores aren't pickled (e.g. when the scorer is sent to worker
+        # processes), the unpickled instance starts with an empty cache.
+        state = self.__dict__.copy()
+        state["cache"] = self.cache.max_size
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache = LRUCache(
+            original_function=self._wrapped_original, max_size=state["cache"]
+        )
+
     def _wrapped_original(self, variable, parents):
+        if self.disk_cache is not None:
+            return self.disk_cache(self._base_local_score, variable, parents)
+        return self._base_local_score(variable, parents)
+
+    def _base_local_score(self, variable, parents):
         expected = list(parents)
         return self.base_scorer.local_score(variable, expected)
 
+    def _wrapped_original_many(self, variable, parent_sets):
+        if self.disk_cache is None:
+            return self._base_local_scores(variable, parent_sets)
+
+        stored = self.disk_cache.get_many(variable, parent_sets)
+        missing = [parents for parents in parent_sets if parents not in stored]
+        if missing:
+            new_scores = self._base_local_scores(variable, missing)
+            self.disk_cache.put_many(variable, zip(missing, new_scores))
+            stored.update(zip(missing, new_scores))
+        return [stored[parents] for parents in parent_sets]
+
+    def _base_local_scores(self, variable, parent_sets):
+        expected = [list(parents) for parents in parent_sets]
+        return self.base_scorer.local_scores(variable, expected)
+
+
+class SQLiteCache:
+    def __init__(self, path, namespace, max_size=1000000):
+        """
+        Persistent cache of local scores in a SQLite database, which can be shared by
+        several processes. The scores are stored under a `namespace`, e.g. a
+        fingerprint of the data and the scorer.
+
+        Parameters
+        ----------
+        path: str
+            The path of the database file. It's created if it doesn't exist.
+        namespace: str
+            The namespace of the scores in the database.
+        max_size: int (optional, default 1_000_000)
+            The maximum number of scores in the database, over all the namespaces. When
+            the limit is reached, the least recently used scores are removed. The times
+            of the last use of the stored scores are written in batches, so the ones of
+            the latest reads might not be recorded.
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_size = max_size
+        self._connection = None
+        self._inserts = 0
+        self._reads = []
+
+    def __getstate__(self):
+        # sqlite connections can't be pickled, the unpickled instance reconnects.
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_reads"] = []
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, timeout=60, isolation_level=None
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores (namespace TEXT, variable TEXT, "
+                "parents TEXT, score REAL, last_used REAL, "
+                "PRIMARY KEY (namespace, variable, parents)) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)"
+            )
+        return self._connection
+
+    def __call__(self, function, variable, parents):
+        """
+        Returns the stored score of `variable` with `parents`, or computes it with
+        `function(variable, parents)` and stores it.
+        """
+        key = (self.namespace, repr(variable), repr(tuple(parents)))
+        row = self.connection.execute(
+            "SELECT score FROM scores WHERE namespace=? AND variable=? AND parents=?",
+            key,
+        ).fetchone()
+        if row is not None:
+            self._record_reads([key])
+            return row[0]
+
+        score = function(variable, parents)
+        self.put_many(variable, [(parents, score)])
+        return score
+
+    def get_many(self, variable, parent_sets):
+        """
+        Returns a dict of the stored scores of `variable` with each of the
+        `parent_sets` (tuples) which are in the database.
+        """
+        parents_keys = {repr(tuple(parents)): parents for parents in parent_sets}
+        keys = list(parents_keys)
+        rows = []
+        # Stay below the limit of the number of parameters of a query.
+        for start in range(0, len(keys), 500):
+            block = keys[start : start + 500]
+            rows.extend(
+                self.connection.execute(
+                    "SELECT parents, score FROM scores WHERE namespace=? AND "
+                    f"variable=? AND parents IN ({', '.join('?' * len(block))})",
+                    [self.namespace, repr(variable)] + block,
+                ).fetchall()
+            )
+        self._record_reads([(self.namespace, repr(variable), key) for key, _ in rows])
+        return {parents_keys[key]: score for key, score in rows}
+
+    def put_many(self, variable, scores):
+        "Stores the scores of `variable` given as (parents, score) pairs."
+        now = time.time()
+        rows = [
+            (self.namespace, repr(variable), repr(tuple(parents)), float(score), now)
+            for parents, score in scores
+        ]
+        self._executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?)", rows)
+        inserts = self._inserts + len(rows)
+        # Evict once every 1000 inserts.
+        if inserts // 1000 > self._inserts // 1000:
+            self._evict()
+        self._inserts = inserts
+
+    def _record_reads(self, keys):
+        """
+        Records that the scores of the `keys` have been used now. The times are
+        written to the database once every 1000 reads (and before an eviction),
+        instead of once per read.
+        """
+        now = time.time()
+        self._reads.extend((now,) + key for key in keys)
+        if len(self._reads) >= 1000:
+            self._write_reads()
+
+    def _write_reads(self):
+        reads, self._reads = self._reads, []
+        self._executemany(
+            "UPDATE scores SET last_used=MAX(last_used, ?) "
+            "WHERE namespace=? AND variable=? AND parents=?",
+            reads,
+        )
+
+    def _executemany(self, statement, rows):
+        "Executes the statement for each of the rows in a single transaction."
+        if not rows:
+            return
+        connection = self.connection
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(statement, rows)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _evict(self):
+        """
+        Removes the least recently used scores if there are more than `max_size`,
+        down to 90% of `max_size` so that the eviction isn't done at every insert.
+        """
+        self._write_reads()
+        connection = self.connection
+        (size,) = connection.execute("SELECT COUNT(*) FROM scores").fetchone()
+        if size > self.max_size:
+            connection.execute(
+                "DELETE FROM scores WHERE last_used <= (SELECT last_used FROM scores "
+                "ORDER BY last_used DESC LIMIT 1 OFFSET ?)",
+                (int(0.9 * self.max_size),),
+            )
+
+    def clear(self):
+        "Removes all the scores of the namespace from the database."
+        self.connection.execute(
+            "DELETE FROM scores WHERE namespace=?", (self.namespace,)
+        )
+
 
 # link fields
 _PREV, _NEXT, _KEY, _VALUE = 0, 1, 2, 3
+# marker of the keys which aren't cached
+_MISSING = object()
 
 
 class LRUCache:
@@ -80,30 +353,40 @@ class LRUCache:
         self.head[_NEXT] = self.tail
 
     def __call__(self, *key):
-        mapping, head, tail = self.mapping, self.head, self.tail
-
-        link = mapping.get(key, head)
-        if link is head:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
             # Not yet in map
             value = self.original_function(*key)
-            if len(mapping) >= self.max_size:
-                # Unlink the least recently used element
-                old_prev, old_next, old_key, old_value = head[_NEXT]
-                head[_NEXT] = old_next
-                old_next[_PREV] = head
-                del mapping[old_key]
-            # Add new value as most recently used element
-            last = tail[_PREV]
-            link = [last, tail, key, value]
-            mapping[key] = last[_NEXT] = tail[_PREV] = link
-        else:
-            # Unlink element from current position
-            link_prev, link_next, key, value = link
-            link_prev[_NEXT] = link_next
-            link_next[_PREV] = link_prev
-            # Add as most recently used element
-            last = tail[_PREV]
-            last[_NEXT] = tail[_PREV] = link
-            link[_PREV] = last
-            link[_NEXT] = tail
+            self.put(key, value)
         return value
+
+    def get(self, key, default=None):
+        "Returns the cached value of `key` (as most recently used) or `default`."
+        link = self.mapping.get(key)
+        if link is None:
+            return default
+        # Unlink element from current position
+        link_prev, link_next, _, value = link
+        link_prev[_NEXT] = link_next
+        link_next[_PREV] = link_prev
+        # Add as most recently used element
+        tail = self.tail
+        last = tail[_PREV]
+        last[_NEXT] = tail[_PREV] = link
+        link[_PREV] = last
+        link[_NEXT] = tail
+        return value
+
+    def put(self, key, value):
+        "Caches the `value` of `key`, which must not be cached yet."
+        mapping, head, tail = self.mapping, self.head, self.tail
+        if len(mapping) >= self.max_size:
+            # Unlink the least recently used element
+            old_prev, old_next, old_key, old_value = head[_NEXT]
+            head[_NEXT] = old_next
+            old_next[_PREV] = head
+            del mapping[old_key]
+        # Add new value as most recently used element
+        last = tail[_PREV]
+        link = [last, tail, key, value]
+        mapping[key] = last[_NEXT] = tail[_PREV] = link
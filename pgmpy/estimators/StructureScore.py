@@ -1,5 +1,6 @@
 #!/usr/bin/env python
-from math import lgamma, log
+import numpy as np
+from scipy.special import gammaln, xlogy
 
 from pgmpy.estimators import BaseEstimator
 
@@ -72,6 +73,58 @@ class StructureScore(BaseEstimator):
         score += self.structure_prior(model)
         return score
 
+    def local_scores(self, variable, parent_sets):
+        """
+        Computes the local scores of `variable` for each of the parent sets in
+        `parent_sets`. Subclasses can override this to score many candidate families
+        at once. By default `local_score` is called for each of the parent sets.
+
+        Parameters
+        ----------
+        variable: int, string (any hashable python object)
+            The variable whose local scores are to be computed.
+
+        parent_sets: list of lists
+            The candidate sets of parents of `variable`.
+
+        Returns
+        -------
+        scores: numpy.ndarray
+            The local score for each of the parent sets.
+
+        Examples
+        --------
+        >>> import pandas as pd
+        >>> import numpy as np
+        >>> from pgmpy.estimators import K2Score
+        >>> data = pd.DataFrame(np.random.randint(0, 5, size=(5000, 2)), columns=list('AB'))
+        >>> data['C'] = data['B']
+        >>> K2Score(data).local_scores('C', [[], ['A'], ['B'], ['A', 'B']])
+        array([-8059.27930685, -8092.08262047,  -122.30638765,  -451.3916807 ])
+        """
+        return np.array(
+            [self.local_score(variable, parents) for parents in parent_sets],
+            dtype=float,
+        )
+
+    def _family_counts(self, variable, parent_sets):
+        """
+        Returns the state counts of `variable` for all the `parent_sets`, concatenated
+        along the columns, and the number of columns (states of the parents) for
+        each of the parent sets.
+        """
+        state_counts = [
+            self.state_counts_array(variable, parents) for parents in parent_sets
+        ]
+        num_parents_states = np.array([counts.shape[1] for counts in state_counts])
+        return np.concatenate(state_counts, axis=1), num_parents_states
+
+    @staticmethod
+    def _sum_by_parent_set(column_scores, num_parents_states):
+        "Sums the scores of the columns of `_family_counts` for each parent set."
+        offsets = np.concatenate(([0], np.cumsum(num_parents_states)[:-1]))
+        return np.add.reduceat(column_scores, offsets)
+
     def structure_prior(self, model):
         """A (log) prior distribution over models. Currently unused (= uniform)."""
         return 0
@@ -115,24 +168,24 @@ class K2Score(StructureScore):
         'Computes a score that measures how much a \
         given variable is "influenced" by a given list of potential parents.'
 
-        var_states = self.state_names[variable]
-        var_cardinality = len(var_states)
-        state_counts = self.state_counts(variable, parents)
+        return self.local_scores(variable, [parents])[0]
 
-        score = 0
-        for (
-            parents_state
-        ) in state_counts:  # iterate over df columns (only 1 if no parents)
-            conditional_sample_size = sum(state_counts[parents_state])
-
-            score += lgamma(var_cardinality) - lgamma(
-                conditional_sample_size + var_cardinality
-            )
-
-            for state in var_states:
-                if state_counts[parents_state][state] > 0:
-                    score += lgamma(state_counts[parents_state][state] + 1)
-        return score
+    def local_scores(self, variable, parent_sets):
+        "Computes the local scores of `variable` for each of the `parent_sets` at once."
+        if len(parent_sets) == 0:
+            return np.array([])
+
+        var_cardinality = len(self.state_names[variable])
+        state_counts, num_parents_states = self._family_counts(variable, parent_sets)
+        conditional_sample_size = state_counts.sum(axis=0)
+
+        # score for each state of the parents (i.e. for each column)
+        column_scores = (
+            gammaln(var_cardinality)
+            - gammaln(conditional_sample_size + var_cardinality)
+            + gammaln(state_counts + 1).sum(axis=0)
+        )
+        return self._sum_by_parent_set(column_scores, num_parents_states)
 
 
 class BDeuScore(StructureScore):
@@ -179,33 +232,30 @@ class BDeuScore(StructureScore):
         'Computes a score that measures how much a \
         given variable is "influenced" by a given list of potential parents.'
 
-        var_states = self.state_names[variable]
-        var_cardinality = len(var_states)
-        state_counts = self.state_counts(variable, parents)
-        num_parents_states = float(len(state_counts.columns))
+        return self.local_scores(variable, [parents])[0]
 
-        score = 0
-        for (
-            parents_state
-        ) in state_counts:  # iterate over df columns (only 1 if no parents)
-            conditional_sample_size = sum(state_counts[parents_state])
-
-            score += lgamma(self.equivalent_sample_size / num_parents_states) - lgamma(
-                conditional_sample_size
-                + self.equivalent_sample_size / num_parents_states
-            )
-
-            for state in var_states:
-                if state_counts[parents_state][state] > 0:
-                    score += lgamma(
-                        state_counts[parents_state][state]
-                        + self.equivalent_sample_size
-                        / (num_parents_states * var_cardinality)
-                    ) - lgamma(
-                        self.equivalent_sample_size
-                        / (num_parents_states * var_cardinality)
-                    )
-        return score
+    def local_scores(self, variable, parent_sets):
+        "Computes the local scores of `variable` for each of the `parent_sets` at once."
+        if len(parent_sets) == 0:
+            return np.array([])
+
+        var_cardinality = len(self.state_names[variable])
+        state_counts, num_parents_states = self._family_counts(variable, parent_sets)
+        conditional_sample_size = state_counts.sum(axis=0)
+
+        # pseudo counts of each column and of each cell of the column
+        alpha = np.repeat(
+            self.equivalent_sample_size / num_parents_states, num_parents_states
+        )
+        beta = alpha / var_cardinality
+
+        # score for each state of the parents (i.e. for each column)
+        column_scores = (
+            gammaln(alpha)
+            - gammaln(conditional_sample_size + alpha)
+            + (gammaln(state_counts + beta) - gammaln(beta)).sum(axis=0)
+        )
+        return self._sum_by_parent_set(column_scores, num_parents_states)
 
 
 class BicScore(StructureScore):
@@ -247,25 +297,24 @@ class BicScore(StructureScore):
         'Computes a score that measures how much a \
         given variable is "influenced" by a given list of potential parents.'
 
-        var_states = self.state_names[variable]
-        var_cardinality = len(var_states)
-        state_counts = self.state_counts(variable, parents)
-        sample_size = len(self.data)
-        num_parents_states = float(len(state_counts.columns))
-
-        score = 0
-        for (
-            parents_state
-        ) in state_counts:  # iterate over df columns (only 1 if no parents)
-            conditional_sample_size = sum(state_counts[parents_state])
+        return self.local_scores(variable, [parents])[0]
 
-            for state in var_states:
-                if state_counts[parents_state][state] > 0:
-                    score += state_counts[parents_state][state] * (
-                        log(state_counts[parents_state][state])
-                        - log(conditional_sample_size)
-                    )
+    def local_scores(self, variable, parent_sets):
+        "Computes the local scores of `variable` for each of the `parent_sets` at once."
+        if len(parent_sets) == 0:
+            return np.array([])
 
-        score -= 0.5 * log(sample_size) * num_parents_states * (var_cardinality - 1)
+        var_cardinality = len(self.state_names[variable])
+        state_counts, num_parents_states = self._family_counts(variable, parent_sets)
+        conditional_sample_size = state_counts.sum(axis=0)
+        sample_size = len(self.data)
 
-        return score
+        # log likelihood for each state of the parents (i.e. for each column):
+        # sum_k N_jk * (log(N_jk) - log(N_j)), where sum_k N_jk = N_j.
+        column_scores = xlogy(state_counts, state_counts).sum(axis=0) - xlogy(
+            conditional_sample_size, conditional_sample_size
+        )
+        scores = self._sum_by_parent_set(column_scores, num_parents_states)
+        return scores - (
+            0.5 * np.log(sample_size) * num_parents_states * (var_cardinality - 1)
+        )
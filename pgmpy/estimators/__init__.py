@@ -4,6 +4,7 @@ from pgmpy.estimators.BayesianEstimator import BayesianEstimator
 from pgmpy.estimators.StructureScore import StructureScore, K2Score, BDeuScore, BicScore
 from pgmpy.estimators.ExhaustiveSearch import ExhaustiveSearch
 from pgmpy.estimators.HillClimbSearch import HillClimbSearch
+from pgmpy.estimators.GES import GES
 from pgmpy.estimators.SEMEstimator import SEMEstimator, IVEstimator
 from pgmpy.estimators.ScoreCache import ScoreCache
 from pgmpy.estimators.MmhcEstimator import MmhcEstimator
@@ -17,6 +18,7 @@ __all__ = [
     "StructureEstimator",
     "ExhaustiveSearch",
     "HillClimbSearch",
+    "GES",
     "StructureScore",
     "K2Score",
     "BDeuScore",
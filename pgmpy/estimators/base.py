@@ -1,12 +1,21 @@
 #!/usr/bin/env python
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
 from warnings import warn
-from functools import lru_cache
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 from scipy.stats import chisquare
 
-from pgmpy.utils.decorators import convert_args_tuple
+from pgmpy.base import DAG
+
+# The number of rows of each block of the data in `BaseEstimator.state_counts_arrays`.
+_COUNTS_BLOCK_SIZE = 2 ** 18
+
+# The default number of rows of each chunk read from a file by `ParameterEstimator`.
+_DEFAULT_CHUNKSIZE = 10 ** 5
 
 
 class BaseEstimator(object):
@@ -65,8 +74,242 @@ class BaseEstimator(object):
         states = sorted(list(self.data.loc[:, variable].dropna().unique()))
         return states
 
-    @convert_args_tuple
-    @lru_cache(maxsize=2048)
+    def _encode_data(self):
+        """
+        Encodes each column of the data as compact integer codes of the variable's
+        states, i.e. the code of a value is its index in `self.state_names`. Missing
+        values are coded as the cardinality of the variable. The encoding is done
+        once for the data and reused by all the calls to `state_counts_array`.
+        """
+        if getattr(self, "_encoded", None) is not self.data:
+            # The encoding is built first and then published, so that threads which
+            # share the estimator never see a partial encoding.
+            all_codes = {}
+            all_missing = {}
+            for var in self.variables:
+                states = self.state_names[var]
+                codes = pd.Categorical(self.data.loc[:, var], categories=states).codes
+                missing = codes < 0
+                codes = codes.astype(np.min_scalar_type(len(states)))
+                codes[missing] = len(states)
+                all_codes[var] = codes
+                all_missing[var] = missing if missing.any() else None
+
+            missing = [m for m in all_missing.values() if m is not None]
+            self._complete_rows = ~np.logical_or.reduce(missing) if missing else None
+            self._codes = all_codes
+            self._missing = all_missing
+            self._counts_cache = {}
+            self._counts_cache_size = 2048
+            self._encoded = self.data
+
+    def state_counts_array(self, variable, parents=[], complete_samples_only=None):
+        """
+        Return counts how often each state of 'variable' occurred in the data, as a
+        dense array. If a list of parents is provided, counting is done conditionally
+        for each state configuration of the parents.
+
+        The data is encoded into integer codes only once, and the counts of a family
+        are computed with a single `np.bincount` over the mixed radix index of the
+        states of `variable` and `parents`.
+
+        Parameters
+        ----------
+        variable: string
+            Name of the variable for which the state count is to be done.
+
+        parents: list
+            Optional list of variable parents, if conditional counting is desired.
+
+        complete_samples_only: bool
+            Specifies how to deal with missing data, if present. If set to `True` all rows
+            that contain `np.NaN` somewhere are ignored. If `False` then
+            every row where neither the variable nor its parents are `np.NaN` is used.
+            Desired default behavior can be passed to the class constructor.
+
+        Returns
+        -------
+        state_counts: numpy.ndarray
+            Array of shape (cardinality of `variable`, product of the cardinalities of
+            `parents`). The states are ordered as in `self.state_names` and the
+            columns enumerate the states of the parents with the last parent changing
+            the fastest, same as the columns of `state_counts`.
+
+        Examples
+        --------
+        >>> import pandas as pd
+        >>> from pgmpy.estimators import BaseEstimator
+        >>> data = pd.DataFrame(data={'A': ['a1', 'a1', 'a2'],
+                                      'B': ['b1', 'b2', 'b1'],
+                                      'C': ['c1', 'c1', 'c2']})
+        >>> estimator = BaseEstimator(data)
+        >>> estimator.state_counts_array('C', parents=['A', 'B'])
+        array([[1, 1, 0, 0],
+               [0, 0, 1, 0]])
+        """
+        parents = tuple(parents)
+
+        # default for how to deal with missing data can be set in class constructor
+        if complete_samples_only is None:
+            complete_samples_only = self.complete_samples_only
+
+        self._encode_data()
+        key = (variable, parents, complete_samples_only)
+        state_counts = self._counts_cache.get(key)
+        if state_counts is not None:
+            return state_counts
+
+        self._check_data([key])
+        family = (variable,) + parents
+        cardinalities = [len(self.state_names[var]) for var in family]
+        state_counts = self._bincount_family(family, complete_samples_only)
+        state_counts = state_counts.reshape(cardinalities[0], -1)
+        self._cache_counts(key, state_counts)
+        return state_counts
+
+    def state_counts_arrays(self, families, complete_samples_only=None, n_jobs=1):
+        """
+        Return the state counts of several families at once, i.e. the same as
+        `state_counts_array(variable, parents)` for each (variable, parents) pair in
+        `families`. The counts which aren't cached yet are computed in a single pass
+        over the data, which goes through the rows in blocks and counts all the
+        families in each block.
+
+        Parameters
+        ----------
+        families: list of (variable, parents) tuples
+            The variables and their (lists of) parents to count the states of.
+
+        complete_samples_only: bool
+            Specifies how to deal with missing data, see `state_counts_array`.
+
+        n_jobs: int (default: 1)
+            The number of threads to count the families in. The threads share the
+            encoded data, each one counts a part of the families. -1 means all the
+            CPUs.
+
+        Returns
+        -------
+        state_counts: list of numpy.ndarray
+            The state counts of each of the families, see `state_counts_array`.
+
+        Examples
+        --------
+        >>> import pandas as pd
+        >>> from pgmpy.estimators import BaseEstimator
+        >>> data = pd.DataFrame(data={'A': ['a1', 'a1', 'a2'],
+                                      'B': ['b1', 'b2', 'b1'],
+                                      'C': ['c1', 'c1', 'c2']})
+        >>> estimator = BaseEstimator(data)
+        >>> estimator.state_counts_arrays([('A', []), ('C', ['A', 'B'])])
+        [array([[2],
+               [1]]), array([[1, 1, 0, 0],
+               [0, 0, 1, 0]])]
+        """
+        # default for how to deal with missing data can be set in class constructor
+        if complete_samples_only is None:
+            complete_samples_only = self.complete_samples_only
+
+        # The data is encoded before the threads share it.
+        self._encode_data()
+        keys = [
+            (variable, tuple(parents), complete_samples_only)
+            for variable, parents in families
+        ]
+        # Keep the counts of all the families in the cache.
+        self._counts_cache_size = max(self._counts_cache_size, len(keys))
+
+        uncached = list(
+            dict.fromkeys(key for key in keys if key not in self._counts_cache)
+        )
+        self._check_data(uncached)
+        n_jobs = min(effective_n_jobs(n_jobs), len(uncached))
+        if n_jobs > 0:
+            groups = [uncached[i::n_jobs] for i in range(n_jobs)]
+            if n_jobs == 1:
+                results = [self._count_families(groups[0])]
+            else:
+                results = Parallel(n_jobs=n_jobs, prefer="threads")(
+                    delayed(self._count_families)(group) for group in groups
+                )
+            for group, group_counts in zip(groups, results):
+                for key, state_counts in zip(group, group_counts):
+                    self._cache_counts(key, state_counts)
+
+        return [self._counts_cache[key] for key in keys]
+
+    def _count_families(self, keys):
+        """
+        Returns the state counts of the families of the `keys` of the counts cache,
+        counting all of them in each block of rows of the data.
+        """
+        families = [(variable,) + parents for variable, parents, _ in keys]
+        cardinalities = [
+            [len(self.state_names[var]) for var in family] for family in families
+        ]
+        counts = [
+            np.zeros(np.prod(family_cardinalities, dtype=np.int64), dtype=np.int64)
+            for family_cardinalities in cardinalities
+        ]
+        for start in range(0, len(self.data), _COUNTS_BLOCK_SIZE):
+            rows = slice(start, start + _COUNTS_BLOCK_SIZE)
+            for family, (_, _, complete_samples_only), family_counts in zip(
+                families, keys, counts
+            ):
+                family_counts += self._bincount_family(
+                    family, complete_samples_only, rows
+                )
+
+        return [
+            family_counts.reshape(family_cardinalities[0], -1)
+            for family_counts, family_cardinalities in zip(counts, cardinalities)
+        ]
+
+    def _bincount_family(self, family, complete_samples_only, rows=slice(None)):
+        """
+        Returns the (flat) counts of the states of the variables in `family` in the
+        `rows` of the encoded data.
+        """
+        cardinalities = [len(self.state_names[var]) for var in family]
+
+        # ignores either any row containing NaN, or only those where the variable or its parents is NaN
+        if complete_samples_only:
+            mask = None if self._complete_rows is None else self._complete_rows[rows]
+        else:
+            missing = [
+                self._missing[var][rows]
+                for var in family
+                if self._missing[var] is not None
+            ]
+            mask = ~np.logical_or.reduce(missing) if missing else None
+
+        index = np.zeros(len(range(*rows.indices(len(self.data)))), dtype=np.int64)
+        for var, card in zip(family, cardinalities):
+            index *= card
+            index += self._codes[var][rows]
+        if mask is not None:
+            index = index[mask]
+
+        return np.bincount(index, minlength=int(np.prod(cardinalities, dtype=np.int64)))
+
+    def _check_data(self, keys):
+        """
+        Raises an error if the state counts of some of the `keys` of the counts cache
+        have to be computed, but the data was only read in chunks.
+        """
+        if keys and self.data is None:
+            raise ValueError(
+                f"The state counts of {[key[:2] for key in keys]} weren't collected "
+                "from the chunks of data. Only the families of the model are counted."
+            )
+
+    def _cache_counts(self, key, state_counts):
+        # The array is shared through the cache, so it shouldn't be modified.
+        state_counts.setflags(write=False)
+        if len(self._counts_cache) >= self._counts_cache_size:
+            self._counts_cache.pop(next(iter(self._counts_cache), None), None)
+        self._counts_cache[key] = state_counts
+
     def state_counts(self, variable, parents=[], complete_samples_only=None):
         """
         Return counts how often each state of 'variable' occurred in the data.
@@ -112,58 +355,31 @@ class BaseEstimator(object):
         c1  1   1   0   0
         c2  0   0   1   0
         >>> estimator.state_counts('C', parents=['A'])
-        A    a1   a2
+        A   a1  a2
         C
-        c1  2.0  0.0
-        c2  0.0  1.0
+        c1   2   0
+        c2   0   1
         """
         parents = list(parents)
-
-        # default for how to deal with missing data can be set in class constructor
-        if complete_samples_only is None:
-            complete_samples_only = self.complete_samples_only
-        # ignores either any row containing NaN, or only those where the variable or its parents is NaN
-        data = (
-            self.data.dropna()
-            if complete_samples_only
-            else self.data.dropna(subset=[variable] + parents)
+        state_counts = self.state_counts_array(
+            variable, parents, complete_samples_only=complete_samples_only
         )
 
         if not parents:
-            # count how often each state of 'variable' occured
-            state_count_data = data.loc[:, variable].value_counts()
-            state_counts = (
-                state_count_data.reindex(self.state_names[variable])
-                .fillna(0)
-                .to_frame()
+            return pd.DataFrame(
+                state_counts, index=self.state_names[variable], columns=[variable]
             )
-
         else:
             parents_states = [self.state_names[parent] for parent in parents]
-            # count how often each state of 'variable' occured, conditional on parents' states
-            state_count_data = (
-                data.groupby([variable] + parents).size().unstack(parents)
+            return pd.DataFrame(
+                state_counts,
+                index=pd.Index(self.state_names[variable], name=variable),
+                columns=pd.MultiIndex.from_product(parents_states, names=parents),
             )
-            if not isinstance(state_count_data.columns, pd.MultiIndex):
-                state_count_data.columns = pd.MultiIndex.from_arrays(
-                    [state_count_data.columns]
-                )
-
-            # reindex rows & columns to sort them and to add missing ones
-            # missing row    = some state of 'variable' did not occur in data
-            # missing column = some state configuration of current 'variable's parents
-            #                  did not occur in data
-            row_index = self.state_names[variable]
-            column_index = pd.MultiIndex.from_product(parents_states, names=parents)
-            state_counts = state_count_data.reindex(
-                index=row_index, columns=column_index
-            ).fillna(0)
-
-        return state_counts
 
 
 class ParameterEstimator(BaseEstimator):
-    def __init__(self, model, data, **kwargs):
+    def __init__(self, model, data, chunksize=None, **kwargs):
         """
         Base class for parameter estimators in pgmpy.
 
@@ -172,10 +388,18 @@ class ParameterEstimator(BaseEstimator):
         model: pgmpy.models.BayesianModel or pgmpy.models.MarkovModel or pgmpy.models.NoisyOrModel
             model for which parameter estimation is to be done
 
-        data: pandas DataFrame object
+        data: pandas DataFrame object, iterable of DataFrames, or str
             datafame object with column names identical to the variable names of the model.
             (If some values in the data are missing the data cells should be set to `numpy.NaN`.
             Note that pandas converts each column containing `numpy.NaN`s to dtype `float`.)
+            Data which doesn't fit in memory can be given as an iterable of DataFrame chunks
+            or as the path of a CSV or Parquet file (reading Parquet requires `pyarrow`).
+            The chunks are read once, and only the state counts of the families of the
+            model are kept, so the memory doesn't depend on the number of samples. The
+            data itself isn't stored in the estimator (`self.data` is None) in this case.
+
+        chunksize: int (optional, default 100_000)
+            The number of rows of each chunk read from the file, if `data` is a path.
 
         state_names: dict (optional)
             A dict indicating, for each variable, the discrete set of states (or values)
@@ -189,6 +413,12 @@ class ParameterEstimator(BaseEstimator):
             This sets the behavior of the `state_count`-method.
         """
 
+        if not isinstance(data, pd.DataFrame):
+            self.model = model
+            super(ParameterEstimator, self).__init__(None)
+            self._count_chunks(_iter_chunks(data, chunksize), **kwargs)
+            return
+
         if not set(model.nodes()) <= set(data.columns.values):
             raise ValueError(
                 "variable names of the model must be identical to column names in data"
@@ -197,6 +427,95 @@ class ParameterEstimator(BaseEstimator):
 
         super(ParameterEstimator, self).__init__(data, **kwargs)
 
+    def _count_chunks(self, chunks, state_names=None, complete_samples_only=True):
+        """
+        Collects the state counts of the families (node and parents) of the model from
+        an iterable of DataFrame `chunks`, and stores them in the counts cache. Only
+        one chunk and the count arrays are in memory at a time. States which weren't
+        seen before are appended to the states of the variable (and to the count
+        arrays) as they are found, and sorted at the end.
+        """
+        self.complete_samples_only = complete_samples_only
+        self.variables = None
+        nodes = sorted(self.model.nodes())
+        families = [
+            (node,) + tuple(sorted(self.model.get_parents(node))) for node in nodes
+        ]
+        fixed_states = state_names if isinstance(state_names, dict) else {}
+        states = {node: list(fixed_states.get(node, [])) for node in nodes}
+        counts = [
+            np.zeros([len(states[var]) for var in family], dtype=np.int64)
+            for family in families
+        ]
+
+        for chunk in chunks:
+            if self.variables is None:
+                if not set(nodes) <= set(chunk.columns.values):
+                    raise ValueError(
+                        "variable names of the model must be identical to column names in data"
+                    )
+                self.variables = list(chunk.columns.values)
+
+            codes, missing = {}, {}
+            for node in nodes:
+                values = chunk.loc[:, node]
+                node_codes = pd.Categorical(values, categories=states[node]).codes
+                new_states = values[(node_codes < 0) & values.notna().values].unique()
+                if len(new_states):
+                    if node in fixed_states:
+                        raise ValueError(
+                            f"Data contains unexpected states for variable: {node}."
+                        )
+                    old_cardinality = len(states[node])
+                    states[node].extend(sorted(new_states))
+                    node_codes = pd.Categorical(values, categories=states[node]).codes
+                    for i, family in enumerate(families):
+                        if node in family:
+                            pad_width = [(0, 0)] * len(family)
+                            pad_width[family.index(node)] = (
+                                0,
+                                len(states[node]) - old_cardinality,
+                            )
+                            counts[i] = np.pad(counts[i], pad_width)
+                missing[node] = node_codes < 0
+                codes[node] = np.where(missing[node], 0, node_codes).astype(np.int64)
+
+            complete_rows = chunk.notna().all(axis=1).values
+            for family, family_counts in zip(families, counts):
+                if complete_samples_only:
+                    mask = complete_rows
+                else:
+                    mask = ~np.logical_or.reduce([missing[var] for var in family])
+                index = np.zeros(len(chunk), dtype=np.int64)
+                for var in family:
+                    index *= len(states[var])
+                    index += codes[var]
+                family_counts += np.bincount(
+                    index[mask], minlength=family_counts.size
+                ).reshape(family_counts.shape)
+
+        if self.variables is None:
+            raise ValueError("The data doesn't contain any chunks.")
+
+        # The states are sorted the same way as the ones collected from a DataFrame.
+        for node in nodes:
+            if node not in fixed_states:
+                order = sorted(range(len(states[node])), key=states[node].__getitem__)
+                states[node] = [states[node][i] for i in order]
+                for i, family in enumerate(families):
+                    if node in family:
+                        counts[i] = counts[i].take(order, axis=family.index(node))
+        self.state_names = states
+
+        self._encoded = self.data
+        self._counts_cache = {}
+        self._counts_cache_size = max(2048, len(families))
+        for family, family_counts in zip(families, counts):
+            self._cache_counts(
+                (family[0], family[1:], complete_samples_only),
+                family_counts.reshape(len(states[family[0]]), -1),
+            )
+
     def state_counts(self, variable, **kwargs):
         """
         Return counts how often each state of 'variable' occurred in the data.
@@ -280,5 +599,102 @@ class StructureEstimator(BaseEstimator):
 
         super(StructureEstimator, self).__init__(data=data, **kwargs)
 
+    def _score_pool(self, n_jobs=1):
+        """
+        Returns a process pool of `n_jobs` workers (following the joblib convention,
+        -1 means all CPUs) for scoring with `self.scoring_method`, or None if
+        `n_jobs` is 1. Each worker gets its own copy of the scoring method, and with
+        it of the data, once when it starts, so only the candidates to score and the
+        scores are sent between the processes afterwards.
+        """
+        n_jobs = effective_n_jobs(n_jobs)
+        if n_jobs == 1:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_score_worker,
+            initargs=(self.scoring_method,),
+        )
+
+    def _local_scores(self, families, pool=None, n_jobs=1):
+        """
+        Returns the local scores of `self.scoring_method` for a list of
+        (variable, parent_sets) pairs, as a list with an array of scores for each
+        pair. If a process `pool` (see `_score_pool`) is given, the parent sets are
+        split into `n_jobs` chunks which are scored by its workers.
+        """
+        if pool is None:
+            return [
+                self.scoring_method.local_scores(variable, parent_sets)
+                for variable, parent_sets in families
+            ]
+
+        items = [
+            (variable, parents)
+            for variable, parent_sets in families
+            for parents in parent_sets
+        ]
+        chunk_size = max(-(-len(items) // n_jobs), 1)
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        scores = np.concatenate(
+            [np.array([])] + list(pool.map(_local_scores_worker, chunks))
+        )
+        splits = np.cumsum([len(parent_sets) for _, parent_sets in families])
+        return np.split(scores, splits[:-1])
+
     def estimate(self):
         pass
+
+
+# The scoring method of a worker process of `StructureEstimator._score_pool`.
+_worker_scoring_method = None
+
+
+def _iter_chunks(data, chunksize=None):
+    """
+    Iterates over the DataFrame chunks of `data`, which is either an iterable of
+    DataFrames or the path of a CSV or Parquet file that is read in chunks of
+    `chunksize` rows.
+    """
+    if not isinstance(data, (str, os.PathLike)):
+        yield from data
+        return
+
+    chunksize = _DEFAULT_CHUNKSIZE if chunksize is None else chunksize
+    if str(data).endswith(".parquet"):
+        import pyarrow.parquet
+
+        for batch in pyarrow.parquet.ParquetFile(data).iter_batches(chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(data, chunksize=chunksize)
+
+
+def _init_score_worker(scoring_method):
+    global _worker_scoring_method
+    _worker_scoring_method = scoring_method
+
+
+def _local_scores_worker(families):
+    """
+    Computes the local scores of a list of (variable, parents) pairs with the
+    scoring method of the worker.
+    """
+    scores = [
+        _worker_scoring_method.local_scores(
+            variable, [parents for _, parents in family]
+        )
+        for variable, family in groupby(families, key=lambda family: family[0])
+    ]
+    return np.concatenate(scores) if scores else np.array([])
+
+
+def _dag_scores_worker(nodes, dags_edges):
+    "Computes the scores of the DAGs over `nodes` with the given lists of edges."
+    scores = []
+    for edges in dags_edges:
+        dag = DAG()
+        dag.add_nodes_from(nodes)
+        dag.add_edges_from(edges)
+        scores.append(_worker_scoring_method.score(dag))
+    return scores
@@ -1,10 +1,11 @@
 from .FactorSet import FactorSet, factorset_product, factorset_divide
-from .base import factor_product, factor_divide
+from .base import factor_product, factor_divide, factor_sum_product
 
 __all__ = [
     "FactorSet",
     "factorset_divide",
     "factorset_product",
     "factor_product",
+    "factor_sum_product",
     "factor_divide",
 ]
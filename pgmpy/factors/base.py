@@ -1,5 +1,11 @@
 from abc import abstractmethod
 from functools import reduce
+from itertools import chain
+
+import numpy as np
+
+# Maximum number of distinct subscripts that np.einsum can handle.
+_EINSUM_MAX_SUBSCRIPTS = 52
 
 
 class BaseFactor(object):
@@ -67,9 +73,141 @@ def factor_product(*args):
             "All the args are expected to be instances of the same factor class."
         )
 
+    if len(args) > 1 and _is_discrete_factor(args[0]) and not _is_log_factor(args[0]):
+        # Keep the variables in the order of their first appearance, which is what
+        # the pairwise product results in.
+        variables = list(dict.fromkeys(chain(*[phi.variables for phi in args])))
+        return factor_sum_product(output_vars=variables, factors=args)
+
     return reduce(lambda phi1, phi2: phi1 * phi2, args)
 
 
+def factor_sum_product(output_vars, factors):
+    """
+    Returns the product of `factors` with all the variables not in `output_vars`
+    summed out, computed in a single contraction.
+
+    Instead of materializing the product of all the `factors` and then summing
+    out the variables not in `output_vars`, the computation is expressed as an
+    Einstein summation and contracted pairwise along an optimized path, so the
+    full product table is never built unless it is needed.
+
+    Parameters
+    ----------
+    output_vars: list, array-like
+        The variables in the scope of the resulting factor (in that order). All
+        the other variables in the scope of `factors` are summed out.
+
+    factors: list, array-like
+        List of `DiscreteFactor` instances to be multiplied.
+
+    Returns
+    -------
+    DiscreteFactor: `DiscreteFactor` over `output_vars`.
+
+    Examples
+    --------
+    >>> from pgmpy.factors.discrete import DiscreteFactor
+    >>> from pgmpy.factors import factor_sum_product
+    >>> phi1 = DiscreteFactor(['x1', 'x2', 'x3'], [2, 3, 2], range(12))
+    >>> phi2 = DiscreteFactor(['x3', 'x4', 'x1'], [2, 2, 2], range(8))
+    >>> phi = factor_sum_product(output_vars=['x2', 'x4'], factors=[phi1, phi2])
+    >>> phi.variables
+    ['x2', 'x4']
+    >>> phi.values
+    array([[ 45.,  73.],
+           [ 65., 109.],
+           [ 85., 145.]])
+    """
+    if isinstance(output_vars, str):
+        raise TypeError("output_vars: Expected type list or array-like, got type str")
+
+    factors = list(factors)
+    if not factors:
+        raise ValueError("factors: Expected at least one factor")
+    if not all(_is_discrete_factor(phi) for phi in factors):
+        raise TypeError("factors: Expected a list of DiscreteFactor instances")
+
+    from pgmpy.factors.discrete import DiscreteFactor, LogDiscreteFactor
+
+    log_space = _is_log_factor(factors[0])
+    if any(_is_log_factor(phi) != log_space for phi in factors):
+        raise NotImplementedError(
+            "Can't mix factors in log space with factors in linear space."
+        )
+
+    output_vars = list(output_vars)
+    all_vars = list(dict.fromkeys(chain(*[phi.variables for phi in factors])))
+    if set(output_vars) - set(all_vars):
+        raise ValueError(
+            f"Variables not in scope of any factor: {set(output_vars) - set(all_vars)}"
+        )
+
+    state_names = {}
+    for phi in factors:
+        state_names.update(phi.state_names)
+
+    # np.einsum only accepts 52 distinct subscripts. In the (rare) case of more
+    # variables, fall back to the product followed by the marginalization.
+    if len(all_vars) > _EINSUM_MAX_SUBSCRIPTS:
+        phi = reduce(lambda phi1, phi2: phi1 * phi2, factors)
+        phi.marginalize(
+            [var for var in phi.variables if var not in output_vars], inplace=True
+        )
+        phi_vars = phi.variables
+        values = phi.values.transpose([phi_vars.index(var) for var in output_vars])
+    else:
+        var_index = {var: index for index, var in enumerate(all_vars)}
+        operands = []
+        shift = 0
+        for phi in factors:
+            if log_space:
+                # Contract exp(values - max) and add the maximums back in log space,
+                # i.e. the logsumexp trick applied to each operand.
+                phi_max = np.max(phi.values, initial=-np.inf)
+                phi_max = phi_max if np.isfinite(phi_max) else 0
+                operands.append(np.exp(phi.values - phi_max))
+                shift += phi_max
+            else:
+                operands.append(phi.values)
+            operands.append([var_index[var] for var in phi.variables])
+        operands.append([var_index[var] for var in output_vars])
+        # The contraction path only matters when there are more than two operands.
+        optimize = "greedy" if len(factors) > 2 else False
+        values = np.einsum(*operands, optimize=optimize)
+
+        if log_space:
+            with np.errstate(divide="ignore"):
+                values = np.log(values) + shift
+
+    factor_class = LogDiscreteFactor if log_space else DiscreteFactor
+    return factor_class(
+        variables=output_vars,
+        cardinality=values.shape,
+        values=values,
+        state_names={var: state_names[var] for var in output_vars},
+    )
+
+
+def _is_log_factor(phi):
+    """
+    Checks if `phi` is a `LogDiscreteFactor`, i.e. its values are in log space.
+    """
+    from pgmpy.factors.discrete import LogDiscreteFactor
+
+    return isinstance(phi, LogDiscreteFactor)
+
+
+def _is_discrete_factor(phi):
+    """
+    Checks if `phi` is a `DiscreteFactor` without importing the discrete module at
+    import time (it depends on this module).
+    """
+    from pgmpy.factors.discrete import DiscreteFactor
+
+    return isinstance(phi, DiscreteFactor)
+
+
 def factor_divide(phi1, phi2):
     """
     Returns `DiscreteFactor` representing `phi1 / phi2`.
@@ -712,6 +712,30 @@ class DiscreteFactor(BaseFactor, StateNameMixin):
         if not inplace:
             return phi
 
+    def to_log_factor(self):
+        """
+        Returns the equivalent `LogDiscreteFactor`, i.e. a factor storing the natural
+        logarithm of the values, on which all the operations are done in log space.
+
+        Examples
+        --------
+        >>> from pgmpy.factors.discrete import DiscreteFactor
+        >>> phi = DiscreteFactor(['x1', 'x2'], [2, 2], [0.1, 0.2, 0.3, 0.4])
+        >>> phi.to_log_factor()
+        <LogDiscreteFactor representing log_phi(x1:2, x2:2) at 0x7f8188fcaa90>
+        """
+        from pgmpy.factors.discrete import LogDiscreteFactor
+
+        with np.errstate(divide="ignore"):
+            log_values = np.log(self.values)
+
+        return LogDiscreteFactor(
+            variables=self.variables,
+            cardinality=self.cardinality,
+            values=log_values,
+            state_names=self.state_names,
+        )
+
     def copy(self):
         """
         Returns a copy of the factor.
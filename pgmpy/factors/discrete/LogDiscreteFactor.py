@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Contains the log-space representation of discrete factors"""
+import numpy as np
+from scipy.special import logsumexp
+
+from pgmpy.factors.discrete import DiscreteFactor
+
+
+class LogDiscreteFactor(DiscreteFactor):
+    """
+    A DiscreteFactor whose values are stored as natural logarithms.
+
+    All the factor operations are carried out in the log domain: the factor
+    product becomes an addition, marginalization is a logsumexp and maximization
+    stays a max. Long chains of products (for example in large networks or
+    unrolled Dynamic Bayesian Networks) therefore don't underflow to zero.
+
+    Parameters
+    ----------
+    variables: list, array-like
+        List of variables in the scope of the factor.
+
+    cardinality: list, array_like
+        List of cardinalities of each variable.
+
+    values: list, array_like
+        List of log values of the factor in the same ordering as `DiscreteFactor`.
+        `-np.inf` represents a zero probability.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pgmpy.factors.discrete import LogDiscreteFactor
+    >>> phi = LogDiscreteFactor(['x1', 'x2'], [2, 2], np.log([0.1, 0.2, 0.3, 0.4]))
+    >>> phi.marginalize(['x2'], inplace=False).to_factor().values
+    array([0.3, 0.7])
+    """
+
+    def identity_factor(self):
+        """
+        Returns the identity factor, i.e. a factor with all the log values as 0.
+
+        Examples
+        --------
+        >>> from pgmpy.factors.discrete import LogDiscreteFactor
+        >>> phi = LogDiscreteFactor(['x1', 'x2'], [2, 3], range(6))
+        >>> phi.identity_factor().values
+        array([[0., 0., 0.],
+               [0., 0., 0.]])
+        """
+        return LogDiscreteFactor(
+            variables=self.variables,
+            cardinality=self.cardinality,
+            values=np.zeros(self.values.size),
+            state_names=self.state_names,
+        )
+
+    def marginalize(self, variables, inplace=True):
+        """
+        Sums out `variables` in linear space, i.e. applies logsumexp over them.
+
+        Parameters
+        ----------
+        variables: list, array-like
+            List of variables over which to marginalize.
+
+        inplace: boolean
+            If inplace=True it will modify the factor itself, else would return
+            a new factor.
+
+        Returns
+        -------
+        LogDiscreteFactor or None: if inplace=True (default) returns None
+                        if inplace=False returns a new `LogDiscreteFactor` instance.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from pgmpy.factors.discrete import LogDiscreteFactor
+        >>> phi = LogDiscreteFactor(['x1', 'x2'], [2, 2], np.log([0.1, 0.2, 0.3, 0.4]))
+        >>> np.exp(phi.marginalize(['x1'], inplace=False).values)
+        array([0.4, 0.6])
+        """
+        if isinstance(variables, str):
+            raise TypeError("variables: Expected type list or array-like, got type str")
+
+        phi = self if inplace else self.copy()
+        log_values = phi.values
+        var_indexes = tuple(
+            phi.variables.index(var) for var in variables if var in phi.variables
+        )
+
+        # Reuse maximize for the argument checks and the bookkeeping of scope,
+        # cardinality and state names.
+        phi.maximize(variables, inplace=True)
+        phi.values = logsumexp(log_values, axis=var_indexes)
+
+        if not inplace:
+            return phi
+
+    def normalize(self, inplace=True):
+        """
+        Normalizes the factor so that the exponentiated values sum to 1.
+
+        Parameters
+        ----------
+        inplace: boolean
+            If inplace=True it will modify the factor itself, else would return
+            a new factor
+
+        Returns
+        -------
+        LogDiscreteFactor or None: if inplace=True (default) returns None
+                        if inplace=False returns a new `LogDiscreteFactor` instance.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from pgmpy.factors.discrete import LogDiscreteFactor
+        >>> phi = LogDiscreteFactor(['x1'], [2], [-1000, -1000])
+        >>> phi.normalize(inplace=False).to_factor().values
+        array([0.5, 0.5])
+        """
+        phi = self if inplace else self.copy()
+
+        phi.values = phi.values - logsumexp(phi.values)
+
+        if not inplace:
+            return phi
+
+    def _broadcast(self, phi1, add_vars=True):
+        """
+        Returns the values of `phi1` arranged so that they broadcast against the
+        values of this factor. If `add_vars` is True, the variables of `phi1` that
+        are not in the scope of this factor are added to it (as axes of size 1).
+        """
+        if add_vars:
+            extra_vars = [var for var in phi1.variables if var not in self.variables]
+            if extra_vars:
+                slice_ = [slice(None)] * len(self.variables)
+                slice_.extend([np.newaxis] * len(extra_vars))
+                self.values = self.values[tuple(slice_)]
+
+                extra_card = phi1.get_cardinality(extra_vars)
+                self.variables.extend(extra_vars)
+                self.cardinality = np.append(
+                    self.cardinality, [extra_card[var] for var in extra_vars]
+                )
+            self.add_state_names(phi1)
+
+        axes = [
+            phi1.variables.index(var) for var in self.variables if var in phi1.variables
+        ]
+        shape = [
+            card if var in phi1.variables else 1
+            for var, card in zip(self.variables, self.cardinality)
+        ]
+        return phi1.values.transpose(axes).reshape(shape)
+
+    def sum(self, phi1, inplace=True):
+        """
+        Factor sum (in linear space) with `phi1`, i.e. `logaddexp` of the log values.
+
+        Parameters
+        ----------
+        phi1: `LogDiscreteFactor` instance or a number.
+            The factor (or the linear space constant) to be added.
+
+        inplace: boolean
+            If inplace=True it will modify the factor itself, else would return
+            a new factor.
+
+        Returns
+        -------
+        LogDiscreteFactor or None: if inplace=True (default) returns None
+                        if inplace=False returns a new `LogDiscreteFactor` instance.
+        """
+        phi = self if inplace else self.copy()
+        with np.errstate(divide="ignore"):
+            if isinstance(phi1, (int, float)):
+                phi.values = np.logaddexp(phi.values, np.log(phi1))
+            else:
+                phi1_values = phi._broadcast(phi1)
+                phi.values = np.logaddexp(phi.values, phi1_values)
+
+        if not inplace:
+            return phi
+
+    def product(self, phi1, inplace=True):
+        """
+        Factor product with `phi1`, i.e. the sum of the log values.
+
+        Parameters
+        ----------
+        phi1: `LogDiscreteFactor` instance or a number.
+            The factor (or the linear space constant) to be multiplied.
+
+        inplace: boolean
+            If inplace=True it will modify the factor itself, else would return
+            a new factor.
+
+        Returns
+        -------
+        LogDiscreteFactor or None: if inplace=True (default) returns None
+                        if inplace=False returns a new `LogDiscreteFactor` instance.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from pgmpy.factors.discrete import LogDiscreteFactor
+        >>> phi1 = LogDiscreteFactor(['x1', 'x2'], [2, 2], np.log([1, 2, 3, 4]))
+        >>> phi2 = LogDiscreteFactor(['x2'], [2], np.log([10, 100]))
+        >>> np.exp(phi1.product(phi2, inplace=False).values)
+        array([[ 10., 200.],
+               [ 30., 400.]])
+        """
+        phi = self if inplace else self.copy()
+        if isinstance(phi1, (int, float)):
+            with np.errstate(divide="ignore"):
+                phi.values = phi.values + np.log(phi1)
+        else:
+            phi1_values = phi._broadcast(phi1)
+            phi.values = phi.values + phi1_values
+
+        if not inplace:
+            return phi
+
+    def divide(self, phi1, inplace=True):
+        """
+        Factor division by `phi1`, i.e. the difference of the log values.
+
+        Parameters
+        ----------
+        phi1 : `LogDiscreteFactor` instance
+            The denominator for division.
+
+        inplace: boolean
+            If inplace=True it will modify the factor itself, else would return
+            a new factor.
+
+        Returns
+        -------
+        LogDiscreteFactor or None: if inplace=True (default) returns None
+                        if inplace=False returns a new `LogDiscreteFactor` instance.
+        """
+        phi = self if inplace else self.copy()
+
+        if set(phi1.variables) - set(phi.variables):
+            raise ValueError("Scope of divisor should be a subset of dividend")
+
+        phi1_values = phi._broadcast(phi1, add_vars=False)
+        phi.values = phi.values - phi1_values
+
+        # Same as DiscreteFactor, 0/0 = 0. In log space: -inf - (-inf) = -inf.
+        phi.values[np.isnan(phi.values)] = -np.inf
+
+        if not inplace:
+            return phi
+
+    def copy(self):
+        """
+        Returns a copy of the factor.
+
+        Returns
+        -------
+        LogDiscreteFactor: copy of the factor
+        """
+        return LogDiscreteFactor(
+            self.scope(),
+            self.cardinality,
+            self.values,
+            state_names=self.state_names.copy(),
+        )
+
+    def to_factor(self):
+        """
+        Returns the equivalent `DiscreteFactor` with the values in linear space.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from pgmpy.factors.discrete import LogDiscreteFactor
+        >>> phi = LogDiscreteFactor(['x1'], [2], np.log([0.25, 0.75]))
+        >>> phi.to_factor()
+        <DiscreteFactor representing phi(x1:2) at 0x7f847a4f2d68>
+        """
+        return DiscreteFactor(
+            variables=self.variables,
+            cardinality=self.cardinality,
+            values=np.exp(self.values),
+            state_names=self.state_names,
+        )
+
+    def to_log_factor(self):
+        """
+        Returns a copy of the factor, as it is already in log space.
+        """
+        return self.copy()
+
+    def __str__(self):
+        return self._str(phi_or_p="log_phi", tablefmt="grid")
+
+    def __repr__(self):
+        var_card = ", ".join(
+            [f"{var}:{card}" for var, card in zip(self.variables, self.cardinality)]
+        )
+        return (
+            f"<LogDiscreteFactor representing log_phi({var_card}) at {hex(id(self))}>"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, LogDiscreteFactor):
+            return False
+        return super(LogDiscreteFactor, self).__eq__(other)
+
+    __hash__ = DiscreteFactor.__hash__
@@ -1,5 +1,6 @@
 from .DiscreteFactor import DiscreteFactor, State
+from .LogDiscreteFactor import LogDiscreteFactor
 from .CPD import TabularCPD
 from .JointProbabilityDistribution import JointProbabilityDistribution
 
-__all__ = ["TabularCPD", "State", "DiscreteFactor"]
+__all__ = ["TabularCPD", "State", "DiscreteFactor", "LogDiscreteFactor"]
@@ -1,43 +1,87 @@
+import heapq
 from abc import abstractmethod
+from functools import reduce
 from itertools import combinations
-from tqdm import tqdm
+from operator import mul
 
-import numpy as np
+from tqdm import tqdm
 
-from pgmpy.models import BayesianModel
+from pgmpy.models import BayesianModel, MarkovModel, FactorGraph
 
 
 class BaseEliminationOrder:
     """
     Base class for finding elimination orders.
+
+    The interaction graph of the model (the moralized graph for a BayesianModel)
+    is stored as an indexed adjacency structure. While finding the elimination
+    order, the nodes are kept in a priority queue on their cost and on
+    eliminating a node only the costs of the nodes whose neighborhood changed are
+    recomputed.
     """
 
+    # If True, the cost of a node depends on the edges between its neighbors,
+    # and also needs to be updated when fill in edges are added between them.
+    _cost_uses_fill_in = False
+
     def __init__(self, model):
         """
         Init method for the base class of Elimination Orders.
 
         Parameters
         ----------
-        model: BayesianModel instance
+        model: BayesianModel, MarkovModel or FactorGraph instance
             The model on which we want to compute the elimination orders.
         """
-        if not isinstance(model, BayesianModel):
-            raise ValueError("Model should be a BayesianModel instance")
-        self.bayesian_model = model.copy()
-        self.moralized_model = self.bayesian_model.moralize()
+        if isinstance(model, BayesianModel):
+            nodes = list(model.nodes())
+            edges = model.moralize().edges()
+        elif isinstance(model, MarkovModel):
+            nodes = list(model.nodes())
+            edges = model.edges()
+        elif isinstance(model, FactorGraph):
+            nodes = list(model.get_variable_nodes())
+            edges = [
+                edge
+                for factor in model.get_factors()
+                for edge in combinations(factor.scope(), 2)
+            ]
+        else:
+            raise ValueError(
+                "Model should be a BayesianModel, MarkovModel or FactorGraph instance"
+            )
+
+        self.model = model
+        self.nodes = nodes
+        self.node_index = {node: index for index, node in enumerate(nodes)}
+
+        cardinality = model.get_cardinality()
+        self.cardinality = [cardinality[node] for node in nodes]
+        self.neighbors = [set() for _ in nodes]
+        for u, v in edges:
+            if u != v:
+                self.neighbors[self.node_index[u]].add(self.node_index[v])
+                self.neighbors[self.node_index[v]].add(self.node_index[u])
 
-    @abstractmethod
     def cost(self, node):
         """
         The cost function to compute the cost of elimination of each node.
-        This method is just a dummy and returns 0 for all the nodes. Actual cost functions
-        are implemented in the classes inheriting BaseEliminationOrder.
 
         Parameters
         ----------
         node: string, any hashable python object.
             The node whose cost is to be computed.
         """
+        return self._cost(self.node_index[node], self.neighbors)
+
+    @abstractmethod
+    def _cost(self, index, neighbors):
+        """
+        Computes the cost of eliminating the node at `index` when the interaction
+        graph is given by the adjacency sets `neighbors`. This method is just a dummy
+        and returns 0 for all the nodes. Actual cost functions are implemented in the
+        classes inheriting BaseEliminationOrder.
+        """
         return 0
 
     def get_elimination_order(self, nodes=None, show_progress=True):
@@ -76,31 +120,58 @@ class BaseEliminationOrder:
         >>> model.add_cpds(cpd_c, cpd_d, cpd_g, cpd_i, cpd_s, cpd_j,
         ...                cpd_l, cpd_h)
         >>> WeightedMinFill(model).get_elimination_order(['c', 'd', 'g', 'l', 's'])
-        ['c', 's', 'l', 'd', 'g']
-        >>> WeightedMinFill(model).get_elimination_order(['c', 'd', 'g', 'l', 's'])
-        ['c', 's', 'l', 'd', 'g']
-        >>> WeightedMinFill(model).get_elimination_order(['c', 'd', 'g', 'l', 's'])
-        ['c', 's', 'l', 'd', 'g']
+        ['c', 'd', 's', 'l', 'g']
         """
         if nodes is None:
-            nodes = self.bayesian_model.nodes()
-        nodes = set(nodes)
+            nodes = self.nodes
+        to_eliminate = set(self.node_index[node] for node in nodes)
+
+        # Eliminate on a copy of the graph, so that the instance can be reused.
+        neighbors = [set(adjacent) for adjacent in self.neighbors]
+        costs = {index: self._cost(index, neighbors) for index in to_eliminate}
+
+        # Ties are broken by the position of the node in the model. Entries whose
+        # cost has changed since they were pushed are skipped when popped.
+        queue = [(cost, index) for index, cost in costs.items()]
+        heapq.heapify(queue)
 
         ordering = []
         if show_progress:
-            pbar = tqdm(total=len(nodes))
+            pbar = tqdm(total=len(to_eliminate))
             pbar.set_description("Finding Elimination Order: ")
 
-        while nodes:
-            scores = {node: self.cost(node) for node in nodes}
-            min_score_node = min(scores, key=scores.get)
-            ordering.append(min_score_node)
-            nodes.remove(min_score_node)
-            self.bayesian_model.remove_node(min_score_node)
-            self.moralized_model.remove_node(min_score_node)
+        while queue:
+            cost, index = heapq.heappop(queue)
+            if (index not in to_eliminate) or (costs[index] != cost):
+                continue
+            ordering.append(self.nodes[index])
+            to_eliminate.remove(index)
+
+            adjacent = neighbors[index]
+            fill_in = [
+                (u, v) for u, v in combinations(adjacent, 2) if v not in neighbors[u]
+            ]
+            for u in adjacent:
+                neighbors[u].discard(index)
+                neighbors[u].update(adjacent)
+                neighbors[u].discard(u)
+            neighbors[index] = set()
+
+            affected = set(adjacent)
+            if self._cost_uses_fill_in:
+                for u, v in fill_in:
+                    affected.update(neighbors[u] & neighbors[v])
+            for node in affected & to_eliminate:
+                new_cost = self._cost(node, neighbors)
+                if new_cost != costs[node]:
+                    costs[node] = new_cost
+                    heapq.heappush(queue, (new_cost, node))
 
             if show_progress:
                 pbar.update(1)
+
+        if show_progress:
+            pbar.close()
         return ordering
 
     def fill_in_edges(self, node):
@@ -112,54 +183,54 @@ class BaseEliminationOrder:
         node: string (any hashable python object)
             Node to be removed from the graph.
         """
-        return combinations(self.bayesian_model.neighbors(node), 2)
+        index = self.node_index[node]
+        return (
+            (self.nodes[u], self.nodes[v])
+            for u, v in combinations(sorted(self.neighbors[index]), 2)
+            if v not in self.neighbors[u]
+        )
 
 
 class WeightedMinFill(BaseEliminationOrder):
-    def cost(self, node):
+    def _cost(self, index, neighbors):
         """
         Cost function for WeightedMinFill.
-        The cost of eliminating a node is the sum of weights of the edges that need to
-        be added to the graph due to its elimination, where a weight of an edge is the
-        product of the weights, domain cardinality, of its constituent vertices.
-        """
-        edges = combinations(self.moralized_model.neighbors(node), 2)
-        return sum(
-            [
-                self.bayesian_model.get_cardinality(edge[0])
-                * self.bayesian_model.get_cardinality(edge[1])
-                for edge in edges
-            ]
-        )
+        The cost of eliminating a node is the sum of weights of the edges between its
+        neighbors, where a weight of an edge is the product of the weights, domain
+        cardinality, of its constituent vertices.
+        """
+        # Sum over all the pairs of neighbors: ((sum w)^2 - sum w^2) / 2
+        weights = [self.cardinality[node] for node in neighbors[index]]
+        return (sum(weights) ** 2 - sum(weight**2 for weight in weights)) // 2
 
 
 class MinNeighbors(BaseEliminationOrder):
-    def cost(self, node):
+    def _cost(self, index, neighbors):
         """
         The cost of a eliminating a node is the number of neighbors it has in the
         current graph.
         """
-        return len(list(self.moralized_model.neighbors(node)))
+        return len(neighbors[index])
 
 
 class MinWeight(BaseEliminationOrder):
-    def cost(self, node):
+    def _cost(self, index, neighbors):
         """
         The cost of a eliminating a node is the product of weights, domain cardinality,
         of its neighbors.
         """
-        return np.prod(
-            [
-                self.bayesian_model.get_cardinality(neig_node)
-                for neig_node in self.moralized_model.neighbors(node)
-            ]
-        )
+        return reduce(mul, (self.cardinality[node] for node in neighbors[index]), 1)
 
 
 class MinFill(BaseEliminationOrder):
-    def cost(self, node):
+    _cost_uses_fill_in = True
+
+    def _cost(self, index, neighbors):
         """
         The cost of a eliminating a node is the number of edges that need to be added
         (fill in edges) to the graph due to its elimination
         """
-        return len(list(self.fill_in_edges(node)))
+        adjacent = neighbors[index]
+        # Each missing edge is counted from both of its ends. `node` itself is also
+        # in `adjacent - neighbors[node]`.
+        return sum(len(adjacent - neighbors[node]) - 1 for node in adjacent) // 2
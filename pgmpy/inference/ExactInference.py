@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 import copy
 import itertools
+from collections import namedtuple, OrderedDict
 
 import networkx as nx
 import numpy as np
+import pandas as pd
+from scipy.special import logsumexp
 from tqdm import tqdm
 
-from pgmpy.factors import factor_product
+from pgmpy.factors import factor_product, factor_sum_product
+from pgmpy.factors.discrete import DiscreteFactor
 from pgmpy.inference import Inference
 from pgmpy.inference.EliminationOrder import (
     WeightedMinFill,
@@ -14,45 +18,55 @@ from pgmpy.inference.EliminationOrder import (
     MinFill,
     MinWeight,
 )
-from pgmpy.models import JunctionTree, BayesianModel
+from pgmpy.models import JunctionTree, BayesianModel, MarkovModel, FactorGraph
+
+
+QueryPlan = namedtuple(
+    "QueryPlan", ["elimination_order", "reductions", "steps", "final_factors"]
+)
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
 
 
 class VariableElimination(Inference):
-    def _get_working_factors(self, evidence):
-        """
-        Uses the evidence given to the query methods to modify the factors before running
-        the variable elimination algorithm.
+    """
+    Class for performing inference using the Variable Elimination algorithm.
 
-        Parameters
-        ----------
-        evidence: dict
-            Dict of the form {variable: state}
+    The elimination schedule of a query (the elimination order and which factors
+    are combined at each step) only depends on the query variables and on the
+    *set* of evidence variables, not on the observed states. It is compiled once
+    into a query plan and cached, so that repeated queries of the same shape only
+    do the factor operations.
 
-        Returns
-        -------
-        dict: Modified working factors.
-        """
+    Parameters
+    ----------
+    model: BayesianModel, MarkovModel, FactorGraph, JunctionTree
+        model for which inference is to performed
 
-        working_factors = {
-            node: {(factor, None) for factor in self.factors[node]}
-            for node in self.factors
-        }
+    log_space: boolean (default: False)
+        If True, the inference is done in log space.
 
-        # Dealing with evidence. Reducing factors over it before VE is run.
-        if evidence:
-            for evidence_var in evidence:
-                for factor, origin in working_factors[evidence_var]:
-                    factor_reduced = factor.reduce(
-                        [(evidence_var, evidence[evidence_var])], inplace=False
-                    )
-                    for var in factor_reduced.scope():
-                        working_factors[var].remove((factor, origin))
-                        working_factors[var].add((factor_reduced, evidence_var))
-                del working_factors[evidence_var]
-        return working_factors
+    max_cached_plans: int (default: 128)
+        Maximum number of query plans to keep. When the limit is reached, the
+        least recently used plan is discarded.
+    """
+
+    def __init__(self, model, log_space=False, max_cached_plans=128):
+        super(VariableElimination, self).__init__(model, log_space=log_space)
+
+        # All the distinct factors of the model. A factor is shared by all the
+        # variables in its scope in `self.factors`.
+        self._factor_list = list(
+            {
+                id(factor): factor for factor in itertools.chain(*self.factors.values())
+            }.values()
+        )
+        self.max_cached_plans = max_cached_plans
+        self._query_plans = OrderedDict()
+        self._plan_cache_hits = 0
+        self._plan_cache_misses = 0
 
     def _get_elimination_order(
-        self, variables, evidence, elimination_order, show_progress=True
+        self, variables, evidence, elimination_order, show_progress=True, nodes=None
     ):
         """
         Deals with all elimination order parameters given to _variable_elimination method
@@ -62,12 +76,16 @@ class VariableElimination(Inference):
         ----------
         elimination_order: str or list
 
+        nodes: set (optional)
+            The variables to consider for elimination. If None, all the variables
+            of the model are considered.
+
         Returns
         -------
         list: A list of variables names in the order they need to be eliminated.
         """
         to_eliminate = (
-            set(self.variables)
+            set(self.variables if nodes is None else nodes)
             - set(variables)
             - set(evidence.keys() if evidence else [])
         )
@@ -86,17 +104,19 @@ class VariableElimination(Inference):
                     "Elimination order contains variables which are in"
                     " variables or evidence args"
                 )
+            elif nodes is not None:
+                return [var for var in elimination_order if var in to_eliminate]
             else:
                 return elimination_order
 
-        # Step 2: If elimination order is None or a Markov model, return a random order.
-        elif (elimination_order is None) or (not isinstance(self.model, BayesianModel)):
+        # Step 2: If elimination order is None or a JunctionTree, return a random order.
+        elif (elimination_order is None) or (
+            not isinstance(self.model, (BayesianModel, MarkovModel, FactorGraph))
+        ):
             return to_eliminate
 
         # Step 3: If elimination order is a str, compute the order using the specified heuristic.
-        elif isinstance(elimination_order, str) and isinstance(
-            self.model, BayesianModel
-        ):
+        elif isinstance(elimination_order, str):
             heuristic_dict = {
                 "weightedminfill": WeightedMinFill,
                 "minneighbors": MinNeighbors,
@@ -108,6 +128,252 @@ class VariableElimination(Inference):
             ).get_elimination_order(nodes=to_eliminate, show_progress=show_progress)
             return elimination_order
 
+    def _get_requisite_factors(self, variables, evidence_vars):
+        """
+        Returns the indexes (in `self._factor_list`) of the CPDs of a Bayesian
+        model that are needed to compute the posterior of `variables` given
+        `evidence_vars`.
+
+        The CPDs of barren nodes (nodes which are not ancestors of the query or the
+        evidence variables) sum to 1 and can be removed. Out of the remaining nodes,
+        only the ones d-connected to `variables` given `evidence_vars` contribute to
+        the posterior, the rest (including the evidence which is d-separated from
+        `variables`) only add a constant factor, which is normalized away.
+
+        Parameters
+        ----------
+        variables: list, array-like
+            The query variables.
+
+        evidence_vars: frozenset
+            The set of observed variables.
+
+        Returns
+        -------
+        set: The indexes of the requisite factors.
+        """
+        ancestors = self.model._get_ancestors_of(list(variables) + list(evidence_vars))
+        d_connected = set(variables).union(
+            *self.model.active_trail_nodes(
+                list(variables), observed=list(evidence_vars)
+            ).values()
+        )
+
+        # Each factor of a Bayesian model is a CPD with the child node as its first
+        # variable. In the moralized ancestral graph, the scope of a CPD (without
+        # the evidence) is either completely d-connected to `variables` or not at all.
+        return set(
+            index
+            for index, factor in enumerate(self._factor_list)
+            if factor.variables[0] in ancestors
+            and any(
+                var in d_connected
+                for var in factor.variables
+                if var not in evidence_vars
+            )
+        )
+
+    def _compile_query_plan(
+        self, variables, evidence_vars, elimination_order, prune, show_progress=True
+    ):
+        """
+        Simulates variable elimination on the scopes of the factors and returns the
+        schedule as a `QueryPlan`.
+
+        Parameters
+        ----------
+        variables: list, array-like
+            variables that are not to be eliminated.
+
+        evidence_vars: frozenset
+            The set of observed variables.
+
+        elimination_order: str or list (array-like)
+            Same as in `_variable_elimination`.
+
+        prune: boolean
+            If True and the model is a BayesianModel, only the requisite factors
+            (see `_get_requisite_factors`) are used.
+
+        Returns
+        -------
+        QueryPlan: namedtuple with the fields:
+            elimination_order: The list of variables in the order they are eliminated.
+            reductions: List of (factor index, evidence variables in its scope).
+            steps: List of (variable, input factor indexes, output variables). The
+                factor computed at step i gets the index `len(self._factor_list) + i`.
+            final_factors: Indexes of the factors whose product is the result.
+        """
+        if prune and isinstance(self.model, BayesianModel):
+            requisite_factors = self._get_requisite_factors(variables, evidence_vars)
+        else:
+            requisite_factors = set(range(len(self._factor_list)))
+
+        # Reduce the scopes of the factors over evidence. Factors with an empty
+        # scope after the reduction and the factors which aren't requisite are
+        # dropped.
+        scopes = []
+        reductions = []
+        working_factors = {
+            node: set()
+            for node in (variables if prune else self.factors)
+            if node not in evidence_vars
+        }
+        for index, factor in enumerate(self._factor_list):
+            if index not in requisite_factors:
+                scopes.append([])
+                continue
+            reduce_vars = [var for var in factor.scope() if var in evidence_vars]
+            if reduce_vars:
+                reductions.append((index, reduce_vars))
+            scopes.append([var for var in factor.scope() if var not in evidence_vars])
+            for var in scopes[index]:
+                working_factors.setdefault(var, set()).add(index)
+
+        elimination_order = self._get_elimination_order(
+            variables,
+            dict.fromkeys(evidence_vars),
+            elimination_order,
+            show_progress=show_progress,
+            nodes=working_factors.keys() if prune else None,
+        )
+
+        # Eliminate the variables symbolically.
+        steps = []
+        eliminated_variables = set()
+        for var in elimination_order:
+            # Removing all the factors containing the variables which are
+            # eliminated (as all the factors should be considered only once)
+            factor_indexes = sorted(
+                index
+                for index in working_factors[var]
+                if not eliminated_variables.intersection(scopes[index])
+            )
+            output_vars = [
+                node
+                for node in dict.fromkeys(
+                    itertools.chain(*[scopes[index] for index in factor_indexes])
+                )
+                if node != var
+            ]
+            steps.append((var, factor_indexes, output_vars))
+
+            scopes.append(output_vars)
+            del working_factors[var]
+            for node in output_vars:
+                working_factors[node].add(len(scopes) - 1)
+            eliminated_variables.add(var)
+
+        final_factors = sorted(
+            set(
+                index
+                for node in working_factors
+                for index in working_factors[node]
+                if not eliminated_variables.intersection(scopes[index])
+            )
+        )
+        return QueryPlan(list(elimination_order), reductions, steps, final_factors)
+
+    def _get_query_plan(
+        self, variables, evidence_vars, elimination_order, prune, show_progress=True
+    ):
+        """
+        Returns the `QueryPlan` for the given query shape, compiling it if it is not
+        already in the plan cache.
+        """
+        if hasattr(elimination_order, "__iter__") and (
+            not isinstance(elimination_order, str)
+        ):
+            order_key = tuple(elimination_order)
+        else:
+            order_key = elimination_order
+        key = (tuple(variables), frozenset(evidence_vars), order_key, prune)
+
+        if key in self._query_plans:
+            self._plan_cache_hits += 1
+            self._query_plans.move_to_end(key)
+            return self._query_plans[key]
+
+        self._plan_cache_misses += 1
+        plan = self._compile_query_plan(
+            variables,
+            frozenset(evidence_vars),
+            elimination_order,
+            prune=prune,
+            show_progress=show_progress,
+        )
+        if self.max_cached_plans > 0:
+            self._query_plans[key] = plan
+            if len(self._query_plans) > self.max_cached_plans:
+                self._query_plans.popitem(last=False)
+        return plan
+
+    def plan_cache_info(self):
+        """
+        Returns the statistics of the query plan cache.
+
+        Returns
+        -------
+        CacheInfo: namedtuple with the fields `hits`, `misses`, `maxsize` and `currsize`.
+
+        Examples
+        --------
+        >>> from pgmpy.inference import VariableElimination
+        >>> inference = VariableElimination(model)
+        >>> inference.query(['J'], evidence={'A': 0})
+        >>> inference.query(['J'], evidence={'A': 1})
+        >>> inference.plan_cache_info()
+        CacheInfo(hits=1, misses=1, maxsize=128, currsize=1)
+        """
+        return CacheInfo(
+            self._plan_cache_hits,
+            self._plan_cache_misses,
+            self.max_cached_plans,
+            len(self._query_plans),
+        )
+
+    def clear_plan_cache(self):
+        """
+        Removes all the cached query plans and resets the statistics.
+        """
+        self._query_plans.clear()
+        self._plan_cache_hits = 0
+        self._plan_cache_misses = 0
+
+    def _execute_query_plan(self, plan, operation, evidence, show_progress=True):
+        """
+        Runs the factor operations of `plan` for the given evidence states.
+
+        Returns
+        -------
+        list: The factors whose product is the (unnormalized) result.
+        """
+        factors = list(self._factor_list)
+        for index, reduce_vars in plan.reductions:
+            factors[index] = factors[index].reduce(
+                [(var, evidence[var]) for var in reduce_vars], inplace=False
+            )
+
+        if show_progress:
+            pbar = tqdm(plan.steps)
+        else:
+            pbar = plan.steps
+
+        for var, factor_indexes, output_vars in pbar:
+            if show_progress:
+                pbar.set_description(f"Eliminating: {var}")
+            step_factors = [factors[index] for index in factor_indexes]
+            if operation == "marginalize":
+                # Multiply and sum out `var` in a single contraction so that the
+                # product of all the factors is never materialized.
+                phi = factor_sum_product(output_vars=output_vars, factors=step_factors)
+            else:
+                phi = factor_product(*step_factors)
+                phi = getattr(phi, operation)([var], inplace=False)
+            factors.append(phi)
+
+        return [factors[index] for index in plan.final_factors]
+
     def _variable_elimination(
         self,
         variables,
@@ -153,45 +419,22 @@ class VariableElimination(Inference):
             else:
                 return set(all_factors)
 
-        # Step 2: Prepare data structures to run the algorithm.
-        eliminated_variables = set()
-        # Get working factors and elimination order
-        working_factors = self._get_working_factors(evidence)
-        elimination_order = self._get_elimination_order(
-            variables, evidence, elimination_order, show_progress=show_progress
+        # Step 2: Get the (cached) query plan and run it with the evidence states.
+        evidence = evidence if evidence else {}
+        # Removing the irrelevant factors is only valid for sum-product queries,
+        # as for example maximizing over a barren node isn't a no-op.
+        plan = self._get_query_plan(
+            variables,
+            evidence.keys(),
+            elimination_order,
+            prune=(operation == "marginalize"),
+            show_progress=show_progress,
+        )
+        final_distribution = self._execute_query_plan(
+            plan, operation, evidence, show_progress=show_progress
         )
 
-        # Step 3: Run variable elimination
-        if show_progress:
-            pbar = tqdm(elimination_order)
-        else:
-            pbar = elimination_order
-
-        for var in pbar:
-            if show_progress:
-                pbar.set_description(f"Eliminating: {var}")
-            # Removing all the factors containing the variables which are
-            # eliminated (as all the factors should be considered only once)
-            factors = [
-                factor
-                for factor, _ in working_factors[var]
-                if not set(factor.variables).intersection(eliminated_variables)
-            ]
-            phi = factor_product(*factors)
-            phi = getattr(phi, operation)([var], inplace=False)
-            del working_factors[var]
-            for variable in phi.variables:
-                working_factors[variable].add((phi, var))
-            eliminated_variables.add(var)
-
-        # Step 4: Prepare variables to be returned.
-        final_distribution = set()
-        for node in working_factors:
-            for factor, origin in working_factors[node]:
-                if not set(factor.variables).intersection(eliminated_variables):
-                    final_distribution.add((factor, origin))
-        final_distribution = [factor for factor, _ in final_distribution]
-
+        # Step 3: Prepare variables to be returned.
         if joint:
             if isinstance(self.model, BayesianModel):
                 return factor_product(*final_distribution).normalize(inplace=False)
@@ -199,8 +442,8 @@ class VariableElimination(Inference):
                 return factor_product(*final_distribution)
         else:
             query_var_factor = {}
+            phi = factor_product(*final_distribution)
             for query_var in variables:
-                phi = factor_product(*final_distribution)
                 query_var_factor[query_var] = phi.marginalize(
                     list(set(variables) - set([query_var])), inplace=False
                 ).normalize(inplace=False)
@@ -262,6 +505,169 @@ class VariableElimination(Inference):
             show_progress=show_progress,
         )
 
+    def batch_query(
+        self,
+        variables,
+        evidence,
+        elimination_order="MinFill",
+        joint=True,
+        show_progress=True,
+    ):
+        """
+        Computes the posterior over `variables` for each row of `evidence` in a single
+        pass of variable elimination.
+
+        The evidence reductions add a leading batch axis to the factors, which is
+        carried through all the elimination steps, so the cost of running the
+        elimination is paid once for the whole batch instead of once per row.
+        Duplicate evidence rows are only computed once.
+
+        Parameters
+        ----------
+        variables: list
+            list of variables for which you want to compute the probability.
+
+        evidence: pandas.DataFrame or dict
+            Each column (or key) is an evidence variable and each row an assignment
+            of states to the evidence variables.
+
+        elimination_order: str or list (default: "MinFill")
+            Same as in `query`.
+
+        joint: boolean (default: True)
+            If True, returns an array of shape (n_rows, card(variables[0]), ...,
+            card(variables[-1])) with the joint distribution for each row.
+            If False, returns a dict of arrays of shape (n_rows, card(var)) for each
+            of the `variables`. With `log_space=True` the arrays contain log values.
+
+        show_progress: boolean
+            If True, shows a progress bar.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> from pgmpy.models import BayesianModel
+        >>> from pgmpy.inference import VariableElimination
+        >>> values = pd.DataFrame(np.random.randint(low=0, high=2, size=(1000, 5)),
+        ...                       columns=['A', 'B', 'C', 'D', 'E'])
+        >>> model = BayesianModel([('A', 'B'), ('C', 'B'), ('C', 'D'), ('B', 'E')])
+        >>> model.fit(values)
+        >>> inference = VariableElimination(model)
+        >>> inference.batch_query(['B', 'E'], evidence=values[['A', 'C']]).shape
+        (1000, 2, 2)
+        """
+        if isinstance(variables, str):
+            raise TypeError("variables must be a list of strings")
+        if not variables:
+            raise ValueError("variables: Expected at least one variable")
+
+        evidence = pd.DataFrame(evidence)
+        common_vars = set(evidence.columns).intersection(set(variables))
+        if common_vars:
+            raise ValueError(
+                f"Can't have the same variables in both `variables` and `evidence`. Found in both: {common_vars}"
+            )
+
+        # Convert the state names to state numbers and only keep the distinct rows.
+        evidence_vars = list(evidence.columns)
+        codes = np.empty(evidence.shape, dtype=int)
+        for index, var in enumerate(evidence_vars):
+            state_codes = evidence[var].map(self.factors[var][0].name_to_no[var])
+            if state_codes.isnull().any():
+                raise ValueError(f"Found unknown state names for variable: {var}")
+            codes[:, index] = state_codes.values
+        if codes.shape[0]:
+            codes, inverse = np.unique(codes, axis=0, return_inverse=True)
+        else:
+            inverse = np.zeros(0, dtype=int)
+        n_batch = codes.shape[0]
+
+        plan = self._get_query_plan(
+            variables,
+            evidence_vars,
+            elimination_order,
+            prune=True,
+            show_progress=show_progress,
+        )
+
+        # Batched factors are tuples of (values, variables, batched). If batched is
+        # True, the first axis of values is the batch axis.
+        factors = [
+            (factor.values, factor.scope(), False) for factor in self._factor_list
+        ]
+        for index, reduce_vars in plan.reductions:
+            factor = self._factor_list[index]
+            axes = [factor.variables.index(var) for var in reduce_vars]
+            keep = [axis for axis in range(len(factor.variables)) if axis not in axes]
+            values = factor.values.transpose(axes + keep)[
+                tuple(codes[:, evidence_vars.index(var)] for var in reduce_vars)
+            ]
+            factors[index] = (values, [factor.variables[axis] for axis in keep], True)
+
+        # In log space the factors are contracted as exp(values - shift) and the
+        # (per row) log shifts are tracked separately.
+        shifts = [0] * len(factors)
+        if self.log_space:
+            for index, (values, factor_vars, batched) in enumerate(factors):
+                values, shifts[index] = _rescale(values, batched, log_values=True)
+                factors[index] = (values, factor_vars, batched)
+
+        if show_progress:
+            pbar = tqdm(plan.steps)
+        else:
+            pbar = plan.steps
+
+        for var, factor_indexes, output_vars in pbar:
+            if show_progress:
+                pbar.set_description(f"Eliminating: {var}")
+            values, output_vars, batched = _batched_sum_product(
+                output_vars, [factors[index] for index in factor_indexes]
+            )
+            shift = sum(shifts[index] for index in factor_indexes)
+            if self.log_space:
+                values, step_shift = _rescale(values, batched)
+                shift = shift + step_shift
+            factors.append((values, output_vars, batched))
+            shifts.append(shift)
+
+        values, _, batched = _batched_sum_product(
+            list(variables), [factors[index] for index in plan.final_factors]
+        )
+        if not batched:
+            values = np.broadcast_to(values, (n_batch,) + values.shape)
+
+        sum_axes = tuple(range(1, values.ndim))
+        if self.log_space:
+            shift = np.broadcast_to(
+                sum(shifts[index] for index in plan.final_factors), (n_batch,)
+            )
+            with np.errstate(divide="ignore"):
+                values = np.log(values) + shift.reshape((-1,) + (1,) * len(variables))
+            normalize = lambda log_values, axes: log_values - logsumexp(
+                log_values, axis=axes, keepdims=True
+            )
+            marginalize = lambda log_values, axes: logsumexp(log_values, axis=axes)
+        else:
+            normalize = lambda values, axes: values / values.sum(
+                axis=axes, keepdims=True
+            )
+            marginalize = lambda values, axes: values.sum(axis=axes)
+
+        # Normalize each of the rows (for Bayesian Models) and expand to the
+        # original rows of evidence.
+        if joint:
+            if isinstance(self.model, BayesianModel):
+                values = normalize(values, sum_axes)
+            return values[inverse]
+        else:
+            query_var_values = {}
+            for index, query_var in enumerate(variables):
+                axes = tuple(axis for axis in sum_axes if axis != index + 1)
+                marginal = normalize(marginalize(values, axes), (1,))
+                query_var_values[query_var] = marginal[inverse]
+            return query_var_values
+
     def max_marginal(
         self,
         variables=None,
@@ -270,7 +676,8 @@ class VariableElimination(Inference):
         show_progress=True,
     ):
         """
-        Computes the max-marginal over the variables given the evidence.
+        Computes the max-marginal over the variables given the evidence. If the
+        inference is done in log space, the log of the max-marginal is returned.
 
         Parameters
         ----------
@@ -477,6 +884,88 @@ class VariableElimination(Inference):
         return nx.graph_clique_number(induced_graph) - 1
 
 
+def _rescale(values, batched, log_values=False):
+    """
+    Scales `values` so that the maximum (of each batch row) is 1 and returns the
+    scaled values along with the log of the scaling factor. If `log_values` is True,
+    `values` are log values and the scaled values are returned in linear space.
+    """
+    axes = tuple(range(1 if batched else 0, values.ndim))
+    if log_values:
+        log_max = np.max(values, axis=axes, keepdims=True, initial=-np.inf)
+    else:
+        with np.errstate(divide="ignore"):
+            log_max = np.log(np.max(values, axis=axes, keepdims=True, initial=0))
+    log_max[~np.isfinite(log_max)] = 0
+
+    if log_values:
+        values = np.exp(values - log_max)
+    else:
+        values = values / np.exp(log_max)
+    return values, log_max.reshape(-1) if batched else log_max.item()
+
+
+def _batched_sum_product(output_vars, factors):
+    """
+    Returns the product of the batched `factors` with all the variables not in
+    `output_vars` summed out.
+
+    Parameters
+    ----------
+    output_vars: list
+        The variables of the resulting factor.
+
+    factors: list
+        List of tuples (values, variables, batched). If batched is True, the first
+        axis of values is the batch axis.
+
+    Returns
+    -------
+    tuple: (values, output_vars, batched) of the resulting factor.
+    """
+    batched = any(is_batched for _, _, is_batched in factors)
+    all_vars = list(
+        dict.fromkeys(itertools.chain(*[variables for _, variables, _ in factors]))
+    )
+    var_index = {var: index + 1 for index, var in enumerate(all_vars)}
+    # Label 0 is used for the batch axis.
+    output = ([0] if batched else []) + [var_index[var] for var in output_vars]
+
+    if len(all_vars) < 52:
+        operands = []
+        for values, variables, is_batched in factors:
+            operands.append(values)
+            operands.append(
+                ([0] if is_batched else []) + [var_index[var] for var in variables]
+            )
+        operands.append(output)
+        optimize = "greedy" if len(factors) > 2 else False
+        return np.einsum(*operands, optimize=optimize), output_vars, batched
+
+    # np.einsum only accepts 52 distinct subscripts. Fall back to broadcasting the
+    # factors against each other.
+    labels = ([0] if batched else []) + [var_index[var] for var in all_vars]
+    product = 1
+    for values, variables, is_batched in factors:
+        factor_labels = ([0] if is_batched else []) + [
+            var_index[var] for var in variables
+        ]
+        order = sorted(range(len(factor_labels)), key=lambda i: factor_labels[i])
+        values = values.transpose(order)
+        shape = [
+            values.shape[sorted(factor_labels).index(label)]
+            if label in factor_labels
+            else 1
+            for label in labels
+        ]
+        product = product * values.reshape(shape)
+    sum_axes = tuple(axis for axis, label in enumerate(labels) if label not in output)
+    values = np.sum(product, axis=sum_axes)
+    remaining = [label for label in labels if label in output]
+    values = values.transpose([remaining.index(label) for label in output])
+    return values, output_vars, batched
+
+
 class BeliefPropagation(Inference):
     """
     Class for performing inference using Belief Propagation method.
@@ -489,19 +978,50 @@ class BeliefPropagation(Inference):
     ----------
     model: BayesianModel, MarkovModel, FactorGraph, JunctionTree
         model for which inference is to performed
+
+    log_space: boolean (default: False)
+        If True, the clique potentials are converted to `LogDiscreteFactor` and
+        the calibration is done in log space.
     """
 
-    def __init__(self, model):
-        super(BeliefPropagation, self).__init__(model)
+    def __init__(self, model, log_space=False):
+        super(BeliefPropagation, self).__init__(model, log_space=log_space)
 
         if not isinstance(model, JunctionTree):
             self.junction_tree = model.to_junction_tree()
         else:
             self.junction_tree = copy.deepcopy(model)
 
+        if log_space:
+            factors = list(self.junction_tree.get_factors())
+            self.junction_tree.remove_factors(*factors)
+            self.junction_tree.add_factors(
+                *[factor.to_log_factor() for factor in factors]
+            )
+
         self.clique_beliefs = {}
         self.sepset_beliefs = {}
 
+        self._reset_messages()
+
+    def _reset_messages(self):
+        """
+        Resets the state used for evidence absorption from the current factors of
+        the junction tree.
+        """
+        # Each evidence variable is entered into a single clique containing it. The
+        # (Shafer-Shenoy) messages are cached with the key (operation, sending
+        # clique, receiving clique) and are only valid for the currently absorbed
+        # evidence.
+        self._clique_potentials = {
+            clique: self.junction_tree.get_factors(clique)
+            for clique in self.junction_tree.nodes()
+        }
+        self._evidence_potentials = dict(self._clique_potentials)
+        self._evidence = {}
+        self._variable_cliques = {}
+        self._messages = {}
+
     def get_cliques(self):
         """
         Returns cliques used for belief propagation.
@@ -548,10 +1068,11 @@ class BeliefPropagation(Inference):
         )
 
         # \beta_j = \beta_j * \frac{\sigma_{i \rightarrow j}}{\mu_{i, j}}
-        self.clique_beliefs[recieving_clique] *= (
+        self.clique_beliefs[recieving_clique] = factor_product(
+            self.clique_beliefs[recieving_clique],
             sigma / self.sepset_beliefs[sepset_key]
             if self.sepset_beliefs[sepset_key]
-            else sigma
+            else sigma,
         )
 
         # \mu_{i, j} = \sigma_{i \rightarrow j}
@@ -621,6 +1142,9 @@ class BeliefPropagation(Inference):
         Probabilistic Graphical Models: Principles and Techniques
         Daphne Koller and Nir Friedman.
         """
+        # The factors of the junction tree might have been modified.
+        self._reset_messages()
+
         # Initialize clique beliefs as well as sepset beliefs
         self.clique_beliefs = {
             clique: self.junction_tree.get_factors(clique)
@@ -713,12 +1237,135 @@ class BeliefPropagation(Inference):
         """
         self._calibrate_junction_tree(operation="maximize")
 
+    def _get_variable_clique(self, var):
+        """
+        Returns the smallest clique containing `var`. Evidence on `var` is entered
+        into this clique and its posterior is computed from this clique's belief.
+        """
+        if var not in self._variable_cliques:
+            cliques = [clique for clique in self.junction_tree.nodes() if var in clique]
+            if not cliques:
+                raise ValueError(f"Variable {var} not in the model")
+            self._variable_cliques[var] = min(
+                cliques, key=lambda clique: self._clique_potentials[clique].values.size
+            )
+        return self._variable_cliques[var]
+
+    def _absorb_evidence(self, evidence):
+        """
+        Enters `evidence` into the clique potentials. Only the messages going out
+        from the cliques whose evidence has changed (and so all the messages
+        downstream of them) are invalidated.
+
+        Parameters
+        ----------
+        evidence: dict
+            a dict key, value pair as {var: state_of_var_observed}
+            None if no evidence
+        """
+        evidence = evidence if evidence else {}
+        changed_vars = set(
+            var
+            for var in set(evidence).union(self._evidence)
+            if evidence.get(var, None) != self._evidence.get(var, None)
+            or (var in evidence) != (var in self._evidence)
+        )
+        if not changed_vars:
+            return
+
+        changed_cliques = set(self._get_variable_clique(var) for var in changed_vars)
+        self._evidence = dict(evidence)
+
+        for clique in changed_cliques:
+            # Multiply the potential with the indicator of each of the observed states.
+            potential = self._clique_potentials[clique]
+            indicators = []
+            for var, state in self._evidence.items():
+                if self._get_variable_clique(var) != clique:
+                    continue
+                values = np.zeros(potential.get_cardinality([var])[var])
+                values[potential.get_state_no(var, state)] = 1
+                indicator = DiscreteFactor(
+                    [var],
+                    [values.size],
+                    values,
+                    state_names={var: potential.state_names[var]},
+                )
+                indicators.append(
+                    indicator.to_log_factor() if self.log_space else indicator
+                )
+            self._evidence_potentials[clique] = (
+                factor_product(potential, *indicators) if indicators else potential
+            )
+
+            # Invalidate the messages directed away from `clique`. If a message isn't
+            # cached, none of the messages downstream of it are.
+            stack = [(clique, neighbor) for neighbor in self.junction_tree[clique]]
+            while stack:
+                sender, receiver = stack.pop()
+                removed = False
+                for operation in ("marginalize", "maximize"):
+                    removed |= (
+                        self._messages.pop((operation, sender, receiver), None)
+                        is not None
+                    )
+                if removed:
+                    stack.extend(
+                        (receiver, neighbor)
+                        for neighbor in self.junction_tree[receiver]
+                        if neighbor != sender
+                    )
+
+    def _compute_messages(self, messages, operation):
+        """
+        Computes the `messages`, a list of (sending clique, receiving clique), along
+        with the messages they depend on which aren't already cached. The messages
+        are computed from the leaves of the tree towards the receiving cliques.
+        """
+        stack = list(messages)
+        while stack:
+            sender, receiver = stack[-1]
+            if (operation, sender, receiver) in self._messages:
+                stack.pop()
+                continue
+
+            missing = [
+                (neighbor, sender)
+                for neighbor in self.junction_tree[sender]
+                if neighbor != receiver
+                and (operation, neighbor, sender) not in self._messages
+            ]
+            if missing:
+                stack.extend(missing)
+                continue
+
+            factors = [self._evidence_potentials[sender]] + [
+                self._messages[(operation, neighbor, sender)]
+                for neighbor in self.junction_tree[sender]
+                if neighbor != receiver
+            ]
+            sepset = [var for var in sender if var in receiver]
+            if operation == "marginalize":
+                message = factor_sum_product(output_vars=sepset, factors=factors)
+            else:
+                message = factor_product(*factors).maximize(
+                    [var for var in sender if var not in receiver], inplace=False
+                )
+            self._messages[(operation, sender, receiver)] = message
+            stack.pop()
+
     def _query(
         self, variables, operation, evidence=None, joint=True, show_progress=True
     ):
         """
         This is a generalized query method that can be used for both query and map query.
 
+        The evidence is entered into the clique potentials and propagated towards
+        the cliques containing `variables` (Shafer-Shenoy message passing). The
+        messages are cached, so after a change in evidence only the messages on the
+        paths from the cliques with changed evidence are recomputed. If all the
+        `variables` are in a single clique, the result is a marginal of its belief.
+
         Parameters
         ----------
         variables: list
@@ -747,87 +1394,77 @@ class BeliefPropagation(Inference):
         Algorithm 10.4 Out-of-clique inference in clique tree
         Probabilistic Graphical Models: Principles and Techniques Daphne Koller and Nir Friedman.
         """
-
-        is_calibrated = self._is_converged(operation=operation)
-        # Calibrate the junction tree if not calibrated
-        if not is_calibrated:
-            self.calibrate()
+        self._absorb_evidence(evidence)
 
         if not isinstance(variables, (list, tuple, set)):
             query_variables = [variables]
         else:
             query_variables = list(variables)
-        query_variables.extend(evidence.keys() if evidence else [])
 
         # Find a tree T' such that query_variables are a subset of scope(T')
-        nodes_with_query_variables = set()
-        for var in query_variables:
-            nodes_with_query_variables.update(
-                filter(lambda x: var in x, self.junction_tree.nodes())
-            )
-        subtree_nodes = nodes_with_query_variables
-
-        # Conversion of set to tuple just for indexing
-        nodes_with_query_variables = tuple(nodes_with_query_variables)
-        # As junction tree is a tree, that means that there would be only path between any two nodes in the tree
-        # thus we can just take the path between any two nodes; no matter there order is
-        for i in range(len(nodes_with_query_variables) - 1):
-            subtree_nodes.update(
-                nx.shortest_path(
-                    self.junction_tree,
-                    nodes_with_query_variables[i],
-                    nodes_with_query_variables[i + 1],
-                )
-            )
-        subtree_undirected_graph = self.junction_tree.subgraph(subtree_nodes)
-        # Converting subtree into a junction tree
-        if len(subtree_nodes) == 1:
-            subtree = JunctionTree()
-            subtree.add_node(subtree_nodes.pop())
-        else:
-            subtree = JunctionTree(subtree_undirected_graph.edges())
-
-        # Selecting a node is root node. Root node would be having only one neighbor
-        if len(subtree.nodes()) == 1:
-            root_node = list(subtree.nodes())[0]
+        cliques_with_all_variables = [
+            clique
+            for clique in self.junction_tree.nodes()
+            if set(query_variables).issubset(clique)
+        ]
+        if cliques_with_all_variables:
+            subtree_nodes = {min(cliques_with_all_variables, key=len)}
         else:
-            root_node = tuple(
-                filter(lambda x: len(list(subtree.neighbors(x))) == 1, subtree.nodes())
-            )[0]
-        clique_potential_list = [self.clique_beliefs[root_node]]
-
-        # For other nodes in the subtree compute the clique potentials as follows
-        # As all the nodes are nothing but tuples so simple set(root_node) won't work at it would update the set with'
-        # all the elements of the tuple; instead use set([root_node]) as it would include only the tuple not the
-        # internal elements within it.
-        parent_nodes = set([root_node])
-        nodes_traversed = set()
-        while parent_nodes:
-            parent_node = parent_nodes.pop()
-            for child_node in set(subtree.neighbors(parent_node)) - nodes_traversed:
-                clique_potential_list.append(
-                    self.clique_beliefs[child_node]
-                    / self.sepset_beliefs[frozenset([parent_node, child_node])]
+            nodes_with_query_variables = set()
+            for var in query_variables:
+                nodes_with_query_variables.update(
+                    filter(lambda x: var in x, self.junction_tree.nodes())
+                )
+            subtree_nodes = set(nodes_with_query_variables)
+
+            # As junction tree is a tree, that means that there would be only path
+            # between any two nodes in the tree thus we can just take the path between
+            # any two nodes; no matter there order is
+            nodes_with_query_variables = tuple(nodes_with_query_variables)
+            for i in range(len(nodes_with_query_variables) - 1):
+                subtree_nodes.update(
+                    nx.shortest_path(
+                        self.junction_tree,
+                        nodes_with_query_variables[i],
+                        nodes_with_query_variables[i + 1],
+                    )
                 )
-                parent_nodes.update([child_node])
-            nodes_traversed.update([parent_node])
 
-        # Add factors to the corresponding junction tree
-        subtree.add_factors(*clique_potential_list)
+        # The product of the potentials of the subtree and the messages coming into
+        # the subtree is the (unnormalized) joint distribution over its variables.
+        incoming_messages = [
+            (neighbor, clique)
+            for clique in subtree_nodes
+            for neighbor in self.junction_tree[clique]
+            if neighbor not in subtree_nodes
+        ]
+        self._compute_messages(incoming_messages, operation)
+        factors = [self._evidence_potentials[clique] for clique in subtree_nodes] + [
+            self._messages[(operation, sender, receiver)]
+            for sender, receiver in incoming_messages
+        ]
 
-        # Sum product variable elimination on the subtree
-        variable_elimination = VariableElimination(subtree)
         if operation == "marginalize":
-            return variable_elimination.query(
-                variables=variables,
-                evidence=evidence,
-                joint=joint,
-                show_progress=show_progress,
-            )
+            if joint:
+                return factor_sum_product(output_vars=query_variables, factors=factors)
+            else:
+                phi = factor_sum_product(output_vars=query_variables, factors=factors)
+                return {
+                    query_var: phi.marginalize(
+                        [var for var in query_variables if var != query_var],
+                        inplace=False,
+                    ).normalize(inplace=False)
+                    for query_var in query_variables
+                }
+
         elif operation == "maximize":
-            return variable_elimination.map_query(
-                variables=variables, evidence=evidence, show_progress=show_progress
+            phi = factor_product(*factors)
+            phi.maximize(
+                [var for var in phi.variables if var not in query_variables],
+                inplace=True,
             )
+            argmax = np.argmax(phi.values)
+            return dict(phi.assignment([argmax])[0])
 
     def query(self, variables, evidence=None, joint=True, show_progress=True):
         """
@@ -893,6 +1530,110 @@ class BeliefPropagation(Inference):
         else:
             return result
 
+    def query_marginals(self, variables=None, evidence=None, show_progress=True):
+        """
+        Computes the posterior marginal distributions of `variables` (all the
+        variables not in `evidence` by default) with a single two pass propagation
+        over the junction tree.
+
+        After the messages are passed towards a root clique and back, every
+        clique has all its incoming messages, and the marginal of each variable is
+        computed from the belief of the smallest clique containing it.
+
+        Parameters
+        ----------
+        variables: list (optional)
+            list of variables whose posterior marginals are to be computed. If None,
+            all the variables not in `evidence` are used.
+
+        evidence: dict
+            a dict key, value pair as {var: state_of_var_observed}
+            None if no evidence
+
+        show_progress: boolean
+            If True, shows a progress bar over the cliques.
+
+        Returns
+        -------
+        dict: A dict of the form {variable: posterior distribution of variable}.
+
+        Examples
+        --------
+        >>> from pgmpy.factors.discrete import TabularCPD
+        >>> from pgmpy.models import BayesianModel
+        >>> from pgmpy.inference import BeliefPropagation
+        >>> bayesian_model = BayesianModel([('A', 'J'), ('R', 'J'), ('J', 'Q'),
+        ...                                 ('J', 'L'), ('G', 'L')])
+        >>> cpd_a = TabularCPD('A', 2, [[0.2], [0.8]])
+        >>> cpd_r = TabularCPD('R', 2, [[0.4], [0.6]])
+        >>> cpd_j = TabularCPD('J', 2,
+        ...                    [[0.9, 0.6, 0.7, 0.1],
+        ...                     [0.1, 0.4, 0.3, 0.9]],
+        ...                    ['R', 'A'], [2, 2])
+        >>> cpd_q = TabularCPD('Q', 2,
+        ...                    [[0.9, 0.2],
+        ...                     [0.1, 0.8]],
+        ...                    ['J'], [2])
+        >>> cpd_l = TabularCPD('L', 2,
+        ...                    [[0.9, 0.45, 0.8, 0.1],
+        ...                     [0.1, 0.55, 0.2, 0.9]],
+        ...                    ['G', 'J'], [2, 2])
+        >>> cpd_g = TabularCPD('G', 2, [[0.6], [0.4]])
+        >>> bayesian_model.add_cpds(cpd_a, cpd_r, cpd_j, cpd_q, cpd_l, cpd_g)
+        >>> belief_propagation = BeliefPropagation(bayesian_model)
+        >>> marginals = belief_propagation.query_marginals(evidence={'A': 0, 'L': 1})
+        >>> sorted(marginals.keys())
+        ['G', 'J', 'Q', 'R']
+        """
+        evidence = evidence if evidence else {}
+        if variables is None:
+            variables = [var for var in self.variables if var not in evidence]
+        elif isinstance(variables, str):
+            raise TypeError("variables must be a list of strings")
+
+        common_vars = set(evidence).intersection(set(variables))
+        if common_vars:
+            raise ValueError(
+                f"Can't have the same variables in both `variables` and `evidence`. Found in both: {common_vars}"
+            )
+
+        self._absorb_evidence(evidence)
+
+        clique_variables = {}
+        for var in variables:
+            clique_variables.setdefault(self._get_variable_clique(var), []).append(var)
+
+        # Messages are computed lazily, so computing the incoming messages of all
+        # the cliques only passes each message once (two passes over the tree).
+        self._compute_messages(
+            [
+                (neighbor, clique)
+                for clique in clique_variables
+                for neighbor in self.junction_tree[clique]
+            ],
+            operation="marginalize",
+        )
+
+        if show_progress:
+            pbar = tqdm(clique_variables.items())
+        else:
+            pbar = clique_variables.items()
+
+        marginals = {}
+        for clique, clique_vars in pbar:
+            belief = factor_product(
+                self._evidence_potentials[clique],
+                *[
+                    self._messages[("marginalize", neighbor, clique)]
+                    for neighbor in self.junction_tree[clique]
+                ],
+            )
+            for var in clique_vars:
+                marginals[var] = belief.marginalize(
+                    [node for node in clique if node != var], inplace=False
+                ).normalize(inplace=False)
+        return marginals
+
     def map_query(self, variables=None, evidence=None, show_progress=True):
         """
         MAP Query method using belief propagation.
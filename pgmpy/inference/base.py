@@ -26,6 +26,11 @@ class Inference(object):
     model: pgmpy.models.BayesianModel or pgmpy.models.MarkovModel or pgmpy.models.NoisyOrModel
         model for which to initialize the inference object.
 
+    log_space: boolean (default: False)
+        If True, all the factors are converted to `LogDiscreteFactor` and the
+        inference is done in log space. The results are then also returned in log
+        space.
+
     Examples
     --------
     >>> from pgmpy.inference import Inference
@@ -54,8 +59,9 @@ class Inference(object):
     >>> model = Inference(student)
     """
 
-    def __init__(self, model):
+    def __init__(self, model, log_space=False):
         self.model = model
+        self.log_space = log_space
         model.check_model()
 
         if isinstance(model, JunctionTree):
@@ -95,3 +101,12 @@ class Inference(object):
             self.one_and_half_model.add_cpds(
                 *(model.get_cpds(time_slice=1) + cpd_inter)
             )
+
+        if log_space:
+            # The same factor is shared by all the variables in its scope.
+            log_factors = {}
+            for var, factors in self.factors.items():
+                for factor in factors:
+                    if id(factor) not in log_factors:
+                        log_factors[id(factor)] = factor.to_log_factor()
+                self.factors[var] = [log_factors[id(factor)] for factor in factors]
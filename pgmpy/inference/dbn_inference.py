@@ -1,13 +1,12 @@
 from collections import defaultdict
 from itertools import tee, chain, combinations
 
-from pgmpy.factors.discrete import DiscreteFactor
 from pgmpy.factors import factor_product
 from pgmpy.inference import Inference, BeliefPropagation
 
 
 class DBNInference(Inference):
-    def __init__(self, model):
+    def __init__(self, model, log_space=False):
         """
         Class for performing inference using Belief Propagation method
         for the input Dynamic Bayesian Network.
@@ -20,6 +19,11 @@ class DBNInference(Inference):
         model: Dynamic Bayesian Network
             Model for which inference is to performed
 
+        log_space: boolean (default: False)
+            If True, the messages between the time slices are propagated in log
+            space, so that long sequences of time slices don't underflow. The
+            resulting factors are `LogDiscreteFactor` instances.
+
         Examples
         --------
         >>> from pgmpy.factors.discrete import TabularCPD
@@ -57,7 +61,7 @@ class DBNInference(Inference):
             by Kevin Patrick Murphy
             http://www.cs.ubc.ca/~murphyk/Thesis/thesis.pdf
         """
-        super(DBNInference, self).__init__(model)
+        super(DBNInference, self).__init__(model, log_space=log_space)
         self.interface_nodes_0 = model.get_interface_nodes(time_slice=0)
         self.interface_nodes_1 = model.get_interface_nodes(time_slice=1)
 
@@ -216,7 +220,7 @@ class DBNInference(Inference):
            The new timeslice to which the factor should belong to.
         """
         new_scope = self._shift_nodes(factor.scope(), shift)
-        return DiscreteFactor(new_scope, factor.cardinality, factor.values)
+        return type(factor)(new_scope, factor.cardinality, factor.values)
 
     def forward_inference(self, variables, evidence=None, args=None):
         """
@@ -267,8 +271,10 @@ class DBNInference(Inference):
             evid_time_range = max([time_slice for var, time_slice in evidence.keys()])
             time_range = max(time_range, evid_time_range)
 
-        start_bp = BeliefPropagation(self.start_junction_tree)
-        mid_bp = BeliefPropagation(self.one_and_half_junction_tree)
+        start_bp = BeliefPropagation(self.start_junction_tree, log_space=self.log_space)
+        mid_bp = BeliefPropagation(
+            self.one_and_half_junction_tree, log_space=self.log_space
+        )
         evidence_0 = self._get_evidence(evidence, 0, 0)
         interface_nodes_dict = {}
         potential_dict = {}
@@ -304,7 +310,7 @@ class DBNInference(Inference):
                 changed_values = {}
                 for key in new_values.keys():
                     new_key = (key[0], time_slice)
-                    new_factor = DiscreteFactor(
+                    new_factor = type(new_values[key])(
                         [new_key], new_values[key].cardinality, new_values[key].values
                     )
                     changed_values[new_key] = new_factor
@@ -316,7 +322,9 @@ class DBNInference(Inference):
             )
             new_factor = self._shift_factor(out_clique_phi, 0)
             potential_dict[time_slice] = new_factor
-            mid_bp = BeliefPropagation(self.one_and_half_junction_tree)
+            mid_bp = BeliefPropagation(
+                self.one_and_half_junction_tree, log_space=self.log_space
+            )
             self._update_belief(mid_bp, self.in_clique, new_factor)
 
             if evidence_time:
@@ -380,7 +388,7 @@ class DBNInference(Inference):
         if evidence:
             evid_time_range = max([time_slice for var, time_slice in evidence.keys()])
             time_range = max(time_range, evid_time_range)
-        end_bp = BeliefPropagation(self.start_junction_tree)
+        end_bp = BeliefPropagation(self.start_junction_tree, log_space=self.log_space)
         potential_dict = self.forward_inference(variables, evidence, "potential")
         update_factor = self._shift_factor(potential_dict[time_range], 1)
         factor_values = {}
@@ -396,7 +404,9 @@ class DBNInference(Inference):
                 }
             if evidence_time:
                 evidence_time.update(interface_nodes_dict)
-            mid_bp = BeliefPropagation(self.one_and_half_junction_tree)
+            mid_bp = BeliefPropagation(
+                self.one_and_half_junction_tree, log_space=self.log_space
+            )
             self._update_belief(mid_bp, self.in_clique, potential_dict[time_slice - 1])
             forward_factor = self._shift_factor(potential_dict[time_slice], 1)
             self._update_belief(mid_bp, self.out_clique, forward_factor, update_factor)
@@ -409,7 +419,7 @@ class DBNInference(Inference):
                 changed_values = {}
                 for key in new_values.keys():
                     new_key = (key[0], time_slice)
-                    new_factor = DiscreteFactor(
+                    new_factor = type(new_values[key])(
                         [new_key], new_values[key].cardinality, new_values[key].values
                     )
                     changed_values[new_key] = new_factor
@@ -97,6 +97,8 @@ class BayesianModel(DAG):
             self.add_edges_from(ebunch)
         self.cpds = []
         self.cardinalities = defaultdict(int)
+        # The state counts of the CPDs for `partial_fit`, as {node: (cpd, counts)}.
+        self._sufficient_statistics = {}
 
     def add_edge(self, u, v, **kwargs):
         """
@@ -463,17 +465,26 @@ class BayesianModel(DAG):
         return mm.to_junction_tree()
 
     def fit(
-        self, data, estimator=None, state_names=[], complete_samples_only=True, **kwargs
+        self,
+        data,
+        estimator=None,
+        state_names=[],
+        complete_samples_only=True,
+        chunksize=None,
+        keep_state_counts=False,
+        **kwargs,
     ):
         """
         Estimates the CPD for each variable based on a given data set.
 
         Parameters
         ----------
-        data: pandas DataFrame object
+        data: pandas DataFrame object, iterable of DataFrames, or str
             DataFrame object with column names identical to the variable names of the network.
             (If some values in the data are missing the data cells should be set to `numpy.NaN`.
             Note that pandas converts each column containing `numpy.NaN`s to dtype `float`.)
+            Data which doesn't fit in memory can be given as an iterable of DataFrame chunks
+            or as the path of a CSV or Parquet file, see `ParameterEstimator`.
 
         estimator: Estimator class
             One of:
@@ -492,6 +503,14 @@ class BayesianModel(DAG):
             that contain `np.Nan` somewhere are ignored. If `False` then, for each variable,
             every row where neither the variable nor its parents are `np.NaN` is used.
 
+        chunksize: int (optional)
+            The number of rows of each chunk read from the file, if `data` is a path.
+
+        keep_state_counts: bool (default `False`)
+            If True, the state counts of each CPD are kept alongside it, for
+            `partial_fit` to update the CPDs with new data. The counts take about as
+            much memory as the CPDs.
+
         Examples
         --------
         >>> import pandas as pd
@@ -504,6 +523,7 @@ class BayesianModel(DAG):
         [<TabularCPD representing P(A:2) at 0x7fb98a7d50f0>,
         <TabularCPD representing P(B:2) at 0x7fb98a7d5588>,
         <TabularCPD representing P(C:2 | A:2, B:2) at 0x7fb98a7b1f98>]
+        >>> model.fit(pd.read_csv('data.csv', chunksize=100000))
         """
         from pgmpy.estimators import MaximumLikelihoodEstimator, BaseEstimator
 
@@ -518,9 +538,139 @@ class BayesianModel(DAG):
             data,
             state_names=state_names,
             complete_samples_only=complete_samples_only,
+            chunksize=chunksize,
         )
         cpds_list = _estimator.get_parameters(**kwargs)
         self.add_cpds(*cpds_list)
+        if keep_state_counts:
+            self._sufficient_statistics = {
+                cpd.variable: (
+                    cpd,
+                    _estimator.state_counts_array(
+                        cpd.variable, sorted(self.get_parents(cpd.variable))
+                    ),
+                )
+                for cpd in cpds_list
+            }
+        else:
+            self._sufficient_statistics = {}
+
+    def partial_fit(
+        self,
+        data,
+        decay=1.0,
+        estimator=None,
+        state_names={},
+        complete_samples_only=True,
+        **kwargs,
+    ):
+        """
+        Updates the CPDs of the model with a new batch of data, without going through
+        the data seen before. The state counts of each CPD (its sufficient statistics)
+        are kept alongside it by `partial_fit` and by `fit` with
+        `keep_state_counts=True`, and the counts of the batch are added to them, so an
+        update takes time in the size of the batch and of the CPDs only. A CPD without
+        kept state counts is estimated from the batch alone. The values of the
+        existing CPDs are updated in place.
+
+        Parameters
+        ----------
+        data: pandas DataFrame object
+            DataFrame object with column names identical to the variable names of the network.
+            (If some values in the data are missing the data cells should be set to `numpy.NaN`.
+            Note that pandas converts each column containing `numpy.NaN`s to dtype `float`.)
+
+        decay: float (default: 1.0)
+            The weight of the previous state counts, between 0 (excluded) and 1. The
+            counts are updated as `decay * counts + batch_counts`, i.e. the weight of a
+            sample decays exponentially with the number of batches after it, so that
+            the CPDs can follow data whose distribution changes over time. With the
+            default of 1 all the samples have the same weight, and only the CPDs with
+            samples in the batch are updated.
+
+        estimator: Estimator class
+            One of:
+            - MaximumLikelihoodEstimator (default)
+            - BayesianEstimator: In this case, pass 'prior_type' and either 'pseudo_counts'
+            or 'equivalent_sample_size' as additional keyword arguments.
+            See `BayesianEstimator.estimate_cpd()` for usage. The prior is added to
+            the (decayed) state counts, it isn't decayed itself.
+
+        state_names: dict (optional)
+            A dict indicating, for each variable, the discrete set of states that the
+            variable can take. The states of the variables in the CPDs of the model are
+            taken from the CPDs, the data must not contain any other states. For the
+            variables without a CPD, the observed values in the data are taken if
+            unspecified.
+
+        complete_samples_only: bool (default `True`)
+            Specifies how to deal with missing data, if present. If set to `True` all rows
+            that contain `np.Nan` somewhere are ignored. If `False` then, for each variable,
+            every row where neither the variable nor its parents are `np.NaN` is used.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> from pgmpy.models import BayesianModel
+        >>> data = pd.DataFrame(np.random.randint(low=0, high=2, size=(1000, 3)),
+        ...                     columns=['A', 'B', 'C'])
+        >>> model = BayesianModel([('A', 'C'), ('B', 'C')])
+        >>> model.fit(data[:800], keep_state_counts=True)
+        >>> model.partial_fit(data[800:], decay=0.9)
+        >>> model.get_cpds('C')
+        <TabularCPD representing P(C:2 | A:2, B:2) at 0x7f3b0a5c4e80>
+        """
+        from pgmpy.estimators import MaximumLikelihoodEstimator, BaseEstimator
+
+        if not 0 < decay <= 1:
+            raise ValueError(f"decay must be in (0, 1]. Got: {decay}")
+        if estimator is None:
+            estimator = MaximumLikelihoodEstimator
+        else:
+            if not issubclass(estimator, BaseEstimator):
+                raise TypeError("Estimator object should be a valid pgmpy estimator.")
+
+        cpds = {cpd.variable: cpd for cpd in self.cpds if isinstance(cpd, TabularCPD)}
+        state_names = dict(state_names)
+        for cpd in cpds.values():
+            state_names.update(cpd.state_names)
+
+        _estimator = estimator(
+            self,
+            data,
+            state_names=state_names,
+            complete_samples_only=complete_samples_only,
+        )
+        families = [(node, sorted(self.get_parents(node))) for node in self.nodes()]
+        batch_counts = _estimator.state_counts_arrays(families)
+        for (node, parents), counts in zip(families, batch_counts):
+            if decay == 1 and node in cpds and not counts.any():
+                continue
+
+            # The counts are only reused while the CPD is the one they were counted for.
+            cpd, old_counts = self._sufficient_statistics.get(node, (None, None))
+            if (
+                cpd is None
+                or cpd is not cpds.get(node)
+                or old_counts.shape != counts.shape
+            ):
+                old_counts = np.zeros(counts.shape)
+            new_counts = decay * old_counts + counts
+
+            new_cpd = _estimator.estimate_cpd(node, state_counts=new_counts, **kwargs)
+
+            cpd = cpds.get(node)
+            if (
+                cpd is not None
+                and cpd.variables == new_cpd.variables
+                and cpd.state_names == new_cpd.state_names
+            ):
+                cpd.values = new_cpd.values
+            else:
+                self.add_cpds(new_cpd)
+                cpd = new_cpd
+            self._sufficient_statistics[node] = (cpd, new_counts)
 
     def predict(self, data, n_jobs=-1):
         """
@@ -646,24 +796,18 @@ class BayesianModel(DAG):
             raise ValueError("Data has variables which are not in the model")
 
         missing_variables = set(self.nodes()) - set(data.columns)
-        pred_values = defaultdict(list)
+        pred_values = {}
 
         model_inference = VariableElimination(self)
-        for _, data_point in data.iterrows():
-            full_distribution = model_inference.query(
-                variables=missing_variables,
-                evidence=data_point.to_dict(),
-                show_progress=False,
-            )
-            states_dict = {}
-            for var in missing_variables:
-                states_dict[var] = full_distribution.marginalize(
-                    missing_variables - {var}, inplace=False
-                )
-            for k, v in states_dict.items():
-                for l in range(len(v.values)):
-                    state = self.get_cpds(k).state_names[k][l]
-                    pred_values[k + "_" + str(state)].append(v.values[l])
+        marginals = model_inference.batch_query(
+            variables=list(missing_variables),
+            evidence=data,
+            joint=False,
+            show_progress=False,
+        )
+        for var, values in marginals.items():
+            for index, state in enumerate(self.get_cpds(var).state_names[var]):
+                pred_values[var + "_" + str(state)] = values[:, index]
         return pd.DataFrame(pred_values, index=data.index)
 
     def get_factorized_product(self, latex=False):
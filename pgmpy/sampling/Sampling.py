@@ -5,10 +5,9 @@ import networkx as nx
 import numpy as np
 from tqdm import tqdm
 
-from pgmpy.factors import factor_product
 from pgmpy.inference import Inference
 from pgmpy.models import BayesianModel, MarkovChain, MarkovModel
-from pgmpy.utils.mathext import sample_discrete
+from pgmpy.utils.mathext import sample_discrete_maps
 from pgmpy.sampling import _return_samples
 
 
@@ -76,19 +75,31 @@ class BayesianModelSampling(Inference):
         pbar = tqdm(self.topological_order)
         for node in pbar:
             pbar.set_description(f"Generating for node: {node}")
-            cpd = self.model.get_cpds(node)
-            states = range(self.cardinality[node])
-            evidence = cpd.variables[:0:-1]
-            if evidence:
-                cached_values = self.pre_compute_reduce(variable=node)
-                evidence = np.vstack([sampled[i] for i in evidence])
-                weights = list(map(lambda t: cached_values[tuple(t)], evidence.T))
-            else:
-                weights = cpd.values
-            sampled[node] = sample_discrete(states, weights, size)
+            weights, indices = self._get_cpd_columns(node, sampled)
+            sampled[node] = sample_discrete_maps(
+                np.arange(self.cardinality[node]), weights, indices
+            )
 
         return _return_samples(return_type, sampled, self.state_names_map)
 
+    def _get_cpd_columns(self, variable, sampled):
+        """
+        Returns the CPD of `variable` as a 2-D array with a column for each state
+        combination of its parents, along with the column index for each of the
+        `sampled` rows, computed as a mixed radix number of the parents' states.
+        """
+        cpd = self.model.get_cpds(variable)
+        evidence = cpd.variables[1:]
+        weights = cpd.values.reshape(self.cardinality[variable], -1)
+        if evidence:
+            indices = np.ravel_multi_index(
+                [sampled[var] for var in evidence],
+                [self.cardinality[var] for var in evidence],
+            )
+        else:
+            indices = np.zeros(len(sampled), dtype=int)
+        return weights, indices
+
     def pre_compute_reduce(self, variable):
         variable_cpd = self.model.get_cpds(variable)
         variable_evid = variable_cpd.variables[:0:-1]
@@ -237,29 +248,14 @@ class BayesianModelSampling(Inference):
 
         # Do the sampling
         for node in self.topological_order:
-            cpd = self.model.get_cpds(node)
-            states = range(self.cardinality[node])
-            evidence = cpd.get_evidence()
-
-            if evidence:
-                evidence_values = np.vstack([sampled[i] for i in evidence])
-                cached_values = self.pre_compute_reduce(node)
-                weights = list(
-                    map(lambda t: cached_values[tuple(t)], evidence_values.T)
-                )
-                if node in evidence_dict:
-                    sampled[node] = evidence_dict[node]
-                    for i in range(size):
-                        sampled["_weight"][i] *= weights[i][evidence_dict[node]]
-                else:
-                    sampled[node] = sample_discrete(states, weights)
+            weights, indices = self._get_cpd_columns(node, sampled)
+            if node in evidence_dict:
+                sampled[node] = evidence_dict[node]
+                sampled["_weight"] *= weights[evidence_dict[node]][indices]
             else:
-                if node in evidence_dict:
-                    sampled[node] = evidence_dict[node]
-                    for i in range(size):
-                        sampled["_weight"][i] *= cpd.values[evidence_dict[node]]
-                else:
-                    sampled[node] = sample_discrete(states, cpd.values, size)
+                sampled[node] = sample_discrete_maps(
+                    np.arange(self.cardinality[node]), weights, indices
+                )
 
         # Postprocess the samples: Correct return type and change state numbers to names
         return _return_samples(return_type, sampled, self.state_names_map)
@@ -308,6 +304,11 @@ class GibbsSampling(MarkovChain):
         'Probabilistic Graphical Model Principles and Techniques', Koller and
         Friedman, Section 12.3.3 pp 512-513.
 
+        The full conditional of a variable only depends on the CPDs which have it
+        in their scope, i.e. on its Markov blanket. So instead of tabulating the
+        transition model over the states of all the other variables, these CPDs
+        are indexed once and the conditional is computed from them while sampling.
+
         Parameters
         ----------
         model: BayesianModel
@@ -317,19 +318,9 @@ class GibbsSampling(MarkovChain):
         self.cardinalities = {
             var: model.get_cpds(var).variable_card for var in self.variables
         }
-
-        for var in self.variables:
-            other_vars = [v for v in self.variables if var != v]
-            other_cards = [self.cardinalities[v] for v in other_vars]
-            cpds = [cpd for cpd in model.cpds if var in cpd.scope()]
-            prod_cpd = factor_product(*cpds)
-            kernel = {}
-            scope = set(prod_cpd.scope())
-            for tup in itertools.product(*[range(card) for card in other_cards]):
-                states = [State(v, s) for v, s in zip(other_vars, tup) if v in scope]
-                prod_cpd_reduced = prod_cpd.reduce(states, inplace=False)
-                kernel[tup] = prod_cpd_reduced.values / sum(prod_cpd_reduced.values)
-            self.transition_models[var] = kernel
+        self._set_markov_blanket_factors(
+            [(cpd.scope(), cpd.values) for cpd in model.cpds]
+        )
 
     def _get_kernel_from_markov_model(self, model):
         """
@@ -337,41 +328,73 @@ class GibbsSampling(MarkovChain):
         'Probabilistic Graphical Model Principles and Techniques', Koller and
         Friedman, Section 12.3.3 pp 512-513.
 
+        As for a Bayesian Network, only the factors in the Markov blanket of each
+        variable are indexed and the conditionals are computed while sampling.
+
         Parameters
         ----------
         model: MarkovModel
             The model from which probabilities will be computed.
         """
         self.variables = np.array(model.nodes())
-        factors_dict = {var: [] for var in self.variables}
-        for factor in model.get_factors():
-            for var in factor.scope():
-                factors_dict[var].append(factor)
-
-        # Take factor product
-        factors_dict = {
-            var: factor_product(*factors) if len(factors) > 1 else factors[0]
-            for var, factors in factors_dict.items()
-        }
-        self.cardinalities = {
-            var: factors_dict[var].get_cardinality([var])[var] for var in self.variables
-        }
+        factors = model.get_factors()
+        self.cardinalities = {}
+        for factor in factors:
+            self.cardinalities.update(factor.get_cardinality(factor.scope()))
+        self.cardinalities = {var: self.cardinalities[var] for var in self.variables}
+        self._set_markov_blanket_factors(
+            [(factor.scope(), factor.values) for factor in factors]
+        )
+
+    def _set_markov_blanket_factors(self, factors):
+        """
+        Indexes the factors in the Markov blanket of each variable.
 
-        for var in self.variables:
-            other_vars = [v for v in self.variables if var != v]
-            other_cards = [self.cardinalities[v] for v in other_vars]
-            kernel = {}
-            factor = factors_dict[var]
-            scope = set(factor.scope())
-            for tup in itertools.product(*[range(card) for card in other_cards]):
-                states = [
-                    State(first_var, s)
-                    for first_var, s in zip(other_vars, tup)
-                    if first_var in scope
-                ]
-                reduced_factor = factor.reduce(states, inplace=False)
-                kernel[tup] = reduced_factor.values / sum(reduced_factor.values)
-            self.transition_models[var] = kernel
+        For every variable, `self.markov_blanket_factors` holds a list of
+        `(table, other_indices, strides)` tuples, one for each factor which has the
+        variable in its scope. `table` is the factor with the axis of the variable
+        moved to the end and the other axes flattened into rows. The row to use for
+        a state array `state` of all the variables (ordered as `self.variables`) is
+        `np.dot(state[other_indices], strides)`.
+
+        Parameters
+        ----------
+        factors: list of (scope, values) tuples
+            The factors (or CPDs) of the model.
+        """
+        var_index = {var: index for index, var in enumerate(self.variables)}
+        self.markov_blanket_factors = {var: [] for var in self.variables}
+        for scope, values in factors:
+            cards = values.shape
+            for axis, var in enumerate(scope):
+                other_axes = [i for i in range(len(scope)) if i != axis]
+                strides = np.ones(len(other_axes), dtype=int)
+                for i in range(len(other_axes) - 2, -1, -1):
+                    strides[i] = strides[i + 1] * cards[other_axes[i + 1]]
+                table = np.moveaxis(values, axis, -1).reshape(-1, cards[axis])
+                other_indices = np.array(
+                    [var_index[scope[i]] for i in other_axes], dtype=int
+                )
+                self.markov_blanket_factors[var].append((table, other_indices, strides))
+
+    def _sample_sweep(self, state):
+        """
+        Resamples each variable, in order, from its full conditional given the
+        current states of the other variables. `state` is an integer array of the
+        states of `self.variables` and is updated in place.
+        """
+        thresholds = np.random.random_sample(len(state))
+        for index in range(len(state)):
+            var = self.variables[index]
+            prob = np.ones(self.cardinalities[var])
+            for table, other_indices, strides in self.markov_blanket_factors[var]:
+                prob = prob * table[np.dot(state[other_indices], strides)]
+            cum_prob = np.cumsum(prob)
+            state[index] = min(
+                np.searchsorted(cum_prob, thresholds[index] * cum_prob[-1], "right"),
+                len(prob) - 1,
+            )
+        return state
 
     def sample(self, start_state=None, size=1, return_type="dataframe"):
         """
@@ -414,18 +437,17 @@ class GibbsSampling(MarkovChain):
         elif start_state is not None:
             self.set_start_state(start_state)
 
+        state = np.array([st for var, st in self.state], dtype=int)
+        samples = np.empty((size, len(self.variables)), dtype=int)
+        samples[0] = state
+        for i in tqdm(range(size - 1)):
+            samples[i + 1] = self._sample_sweep(state)
+        self.state = [State(var, st) for var, st in zip(self.variables, state)]
+
         types = [(var_name, "int") for var_name in self.variables]
         sampled = np.zeros(size, dtype=types).view(np.recarray)
-        sampled[0] = tuple([st for var, st in self.state])
-        for i in tqdm(range(size - 1)):
-            for j, (var, st) in enumerate(self.state):
-                other_st = tuple(st for v, st in self.state if var != v)
-                next_st = sample_discrete(
-                    list(range(self.cardinalities[var])),
-                    self.transition_models[var][other_st],
-                )[0]
-                self.state[j] = State(var, next_st)
-            sampled[i + 1] = tuple([st for var, st in self.state])
+        for index, var in enumerate(self.variables):
+            sampled[var] = samples[:, index]
 
         return _return_samples(return_type, sampled)
 
@@ -458,12 +480,8 @@ class GibbsSampling(MarkovChain):
         elif start_state is not None:
             self.set_start_state(start_state)
 
+        state = np.array([st for var, st in self.state], dtype=int)
         for i in range(size):
-            for j, (var, st) in enumerate(self.state):
-                other_st = tuple(st for v, st in self.state if var != v)
-                next_st = sample_discrete(
-                    list(range(self.cardinalities[var])),
-                    self.transition_models[var][other_st],
-                )[0]
-                self.state[j] = State(var, next_st)
+            self._sample_sweep(state)
+            self.state = [State(var, st) for var, st in zip(self.variables, state)]
             yield self.state[:]
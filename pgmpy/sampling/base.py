@@ -445,7 +445,7 @@ def _return_samples(return_type, samples, state_names_map=None):
             if state_names_map is not None:
                 for var in df.columns:
                     if var != "_weight":
-                        df[var] = df[var].apply(lambda t: state_names_map[var][t])
+                        df[var] = df[var].map(state_names_map[var])
             return df
         else:
             warn("Pandas installation not found. Returning numpy.recarray object")
@@ -132,6 +132,23 @@ class TestDAGCreation(unittest.TestCase):
         self.assertRaises(ValueError, DAG, [("a", "b"), ("b", "a")])
         self.assertRaises(ValueError, DAG, [("a", "b"), ("b", "c"), ("c", "a")])
 
+    def test_to_pdag(self):
+        dag = DAG([("A", "B"), ("B", "C"), ("D", "C"), ("C", "E")])
+        dag.add_node("F")
+        pdag = dag.to_pdag()
+        self.assertEqual(pdag.directed_edges, {("B", "C"), ("D", "C"), ("C", "E")})
+        self.assertEqual(pdag.undirected_edges, {("A", "B")})
+        self.assertEqual(set(pdag.nodes()), {"A", "B", "C", "D", "E", "F"})
+
+        # E -> D is oriented by Meek's rule R3
+        dag = DAG(
+            [("A", "B"), ("C", "B"), ("A", "D"), ("C", "D")]
+            + [("E", "A"), ("E", "C"), ("E", "D")]
+        )
+        pdag = dag.to_pdag()
+        self.assertEqual(pdag.undirected_edges, {("E", "A"), ("E", "C")})
+        self.assertIn(("E", "D"), pdag.directed_edges)
+
     def tearDown(self):
         del self.graph
 
@@ -2,6 +2,7 @@ import unittest
 
 import pandas as pd
 import numpy as np
+from mock import patch
 
 from pgmpy.estimators import BaseEstimator
 
@@ -51,5 +52,81 @@ class TestBaseEstimator(unittest.TestCase):
             [[0, 0, 0, 0], [1, 0, 0, 0]],
         )
 
+    def test_state_counts_array(self):
+        e = BaseEstimator(self.d1)
+        np.testing.assert_array_equal(e.state_counts_array("A"), [[2], [1]])
+        np.testing.assert_array_equal(
+            e.state_counts_array("C", ["A", "B"]), [[0, 0, 1, 0], [1, 1, 0, 0]]
+        )
+        np.testing.assert_array_equal(
+            e.state_counts_array("D", ["C"]), [[0, 1], [0, 1], [1, 0]]
+        )
+        np.testing.assert_array_equal(
+            e.state_counts_array("C", ["A", "B"]),
+            e.state_counts("C", ["A", "B"]).values,
+        )
+        self.assertFalse(e.state_counts_array("A").flags.writeable)
+
+        e = BaseEstimator(
+            self.d2, state_names={"C": [0, 1]}, complete_samples_only=False
+        )
+        np.testing.assert_array_equal(e.state_counts_array("A"), [[1], [1]])
+        np.testing.assert_array_equal(
+            e.state_counts_array("C", ["A", "B"]), [[0, 0, 0, 0], [1, 0, 0, 0]]
+        )
+        np.testing.assert_array_equal(
+            e.state_counts_array("B", ["D"], complete_samples_only=True), [[0], [0]]
+        )
+
+    def test_state_counts_array_titanic(self):
+        e = BaseEstimator(self.titanic_data)
+        for variable, parents in [
+            ("Survived", ["Pclass"]),
+            ("Survived", ["Sex", "Pclass"]),
+            ("Embarked", ["Pclass", "Sex"]),
+        ]:
+            data = self.titanic_data.dropna()
+            expected = (
+                data.groupby([variable] + parents)
+                .size()
+                .reindex(
+                    pd.MultiIndex.from_product(
+                        [e.state_names[var] for var in [variable] + parents]
+                    ),
+                    fill_value=0,
+                )
+                .values.reshape(len(e.state_names[variable]), -1)
+            )
+            np.testing.assert_array_equal(
+                e.state_counts_array(variable, parents), expected
+            )
+
+    def test_state_counts_arrays(self):
+        families = [
+            ("Survived", []),
+            ("Survived", ["Pclass"]),
+            ("Survived", ["Sex", "Pclass"]),
+            ("Embarked", ["Pclass", "Sex"]),
+        ]
+        for complete_samples_only in [True, False]:
+            expected = [
+                BaseEstimator(
+                    self.titanic_data, complete_samples_only=complete_samples_only
+                ).state_counts_array(variable, parents)
+                for variable, parents in families
+            ]
+            # Counts the families in blocks of 100 rows.
+            with patch("pgmpy.estimators.base._COUNTS_BLOCK_SIZE", 100):
+                for n_jobs in [1, 2]:
+                    e = BaseEstimator(
+                        self.titanic_data, complete_samples_only=complete_samples_only
+                    )
+                    state_counts = e.state_counts_arrays(families, n_jobs=n_jobs)
+                    for counts, expected_counts in zip(state_counts, expected):
+                        np.testing.assert_array_equal(counts, expected_counts)
+                    self.assertIs(
+                        e.state_counts_array("Survived", ["Pclass"]), state_counts[1]
+                    )
+
     def tearDown(self):
         del self.d1
@@ -121,6 +121,7 @@ class TestBayesianEstimator(unittest.TestCase):
             ]
         )
         self.assertSetEqual(set(self.est3.get_parameters()), cpds)
+        self.assertSetEqual(set(self.est3.get_parameters(n_jobs=2)), cpds)
 
     def test_get_parameters2(self):
         pseudo_counts = {
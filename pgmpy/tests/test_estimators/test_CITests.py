@@ -1,11 +1,17 @@
 import unittest
-import math
 
 import numpy as np
 import pandas as pd
 from numpy import testing as np_test
 
-from pgmpy.estimators.CITests import pearsonr, chi_square
+from scipy import stats
+
+from pgmpy.estimators.CITests import (
+    pearsonr,
+    fisher_z,
+    chi_square,
+    g_sq,
+)
 
 np.random.seed(42)
 
@@ -77,6 +83,85 @@ class TestPearsonr(unittest.TestCase):
         )
 
 
+class TestFisherZ(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.df_ind = pd.DataFrame(rng.randn(10000, 3), columns=["X", "Y", "Z"])
+
+        Z = rng.randn(10000)
+        X = 3 * Z + rng.normal(loc=0, scale=0.1, size=10000)
+        Y = 2 * Z + rng.normal(loc=0, scale=0.1, size=10000)
+        self.df_cind = pd.DataFrame({"X": X, "Y": Y, "Z": Z})
+
+        Z1 = rng.randn(10000)
+        Z2 = rng.randn(10000)
+        X = 3 * Z1 + 2 * Z2 + rng.normal(loc=0, scale=0.1, size=10000)
+        Y = 2 * Z1 + 3 * Z2 + rng.normal(loc=0, scale=0.1, size=10000)
+        self.df_cind_mul = pd.DataFrame({"X": X, "Y": Y, "Z1": Z1, "Z2": Z2})
+
+        X = rng.rand(10000)
+        Y = rng.rand(10000)
+        Z = 2 * X + 2 * Y + rng.normal(loc=0, scale=0.1, size=10000)
+        self.df_vstruct = pd.DataFrame({"X": X, "Y": Y, "Z": Z})
+
+    def test_fisher_z(self):
+        # The partial correlation is the same as the one of pearsonr (which regresses
+        # without intercept, so only for zero mean data).
+        for data, Z in [
+            (self.df_ind, []),
+            (self.df_cind, ["Z"]),
+            (self.df_cind_mul, ["Z1", "Z2"]),
+        ]:
+            coef, p_value = fisher_z(X="X", Y="Y", Z=Z, data=data, boolean=False)
+            coef_ref, p_ref = pearsonr(X="X", Y="Y", Z=Z, data=data, boolean=False)
+            np_test.assert_almost_equal(coef, coef_ref)
+            np_test.assert_almost_equal(p_value, p_ref, decimal=3)
+
+        self.assertTrue(
+            fisher_z(X="X", Y="Y", Z=["Z"], data=self.df_cind, significance_level=0.05)
+        )
+        self.assertFalse(
+            fisher_z(
+                X="X", Y="Y", Z=["Z"], data=self.df_vstruct, significance_level=0.05
+            )
+        )
+
+    def test_fisher_z_covariance(self):
+        for data, Z in [(self.df_cind_mul, ["Z1", "Z2"]), (self.df_vstruct, ["Z"])]:
+            np_test.assert_almost_equal(
+                fisher_z(
+                    X="X",
+                    Y="Y",
+                    Z=Z,
+                    covariance=data.cov(),
+                    sample_size=len(data),
+                    boolean=False,
+                ),
+                fisher_z(X="X", Y="Y", Z=Z, data=data, boolean=False),
+            )
+        self.assertRaises(
+            ValueError, fisher_z, X="X", Y="Y", Z=[], covariance=self.df_ind.cov()
+        )
+
+        # the results cached for a covariance matrix depend on the sample size
+        cache = {}
+        covariance = self.df_vstruct.cov()
+        p_values = [
+            fisher_z(
+                X="X",
+                Y="Y",
+                Z=[],
+                covariance=covariance,
+                sample_size=sample_size,
+                boolean=False,
+                cache=cache,
+            )[1]
+            for sample_size in [10, len(self.df_vstruct)]
+        ]
+        self.assertGreater(p_values[0], p_values[1])
+        self.assertRaises(ValueError, fisher_z, X="X", Y="Y", Z=[], data=None)
+
+
 class TestChiSquare(unittest.TestCase):
     def setUp(self):
         self.df_adult = pd.read_csv("pgmpy/tests/test_estimators/testdata/adult.csv")
@@ -112,8 +197,7 @@ class TestChiSquare(unittest.TestCase):
             boolean=False,
         )
         np_test.assert_almost_equal(coef, 1460.11, decimal=1)
-        # Really small value; hence rounded in this case.
-        np_test.assert_almost_equal(math.ceil(np.log(p_value)), -335, decimal=1)
+        np_test.assert_almost_equal(np.log(p_value), -334.97, decimal=1)
         self.assertEqual(dof, 316)
 
         coef, dof, p_value = chi_square(
@@ -131,10 +215,7 @@ class TestChiSquare(unittest.TestCase):
             boolean=False,
         )
         np_test.assert_almost_equal(coef, 481.96, decimal=1)
-        # Same here; Really small hence rounded
-        np_test.assert_almost_equal(
-            math.floor(np.log(p_value)), math.floor(-155.17), decimal=1
-        )
+        np_test.assert_almost_equal(np.log(p_value), -155.17, decimal=1)
         self.assertEqual(dof, 58)
 
         # Tests for when boolean=True
@@ -187,3 +268,54 @@ class TestChiSquare(unittest.TestCase):
                 significance_level=0.05,
             )
         )
+
+    def test_stratified_statistics(self):
+        # The statistics summed over the strata of Z, as computed with scipy.
+        X, Y, Z = "Education", "MaritalStatus", ["Age", "Sex"]
+        for test, lambda_ in [(chi_square, "pearson"), (g_sq, "log-likelihood")]:
+            statistic, dof = 0, 0
+            for _, df in self.df_adult.groupby(Z):
+                table = pd.crosstab(df[X], df[Y]).values
+                s, _, d, _ = stats.chi2_contingency(table, lambda_=lambda_)
+                statistic += s
+                dof += d
+
+            coef, test_dof, p_value = test(
+                X=X, Y=Y, Z=Z, data=self.df_adult, boolean=False
+            )
+            np_test.assert_almost_equal(coef, statistic)
+            self.assertEqual(test_dof, dof)
+            np_test.assert_almost_equal(p_value, stats.chi2.sf(statistic, dof))
+
+        g, dof, p_value = g_sq(
+            X="Age", Y="Sex", Z=[], data=self.df_adult, boolean=False
+        )
+        g_ref, p_ref, dof_ref, _ = stats.chi2_contingency(
+            pd.crosstab(self.df_adult["Age"], self.df_adult["Sex"]).values,
+            lambda_="log-likelihood",
+        )
+        np_test.assert_almost_equal(g, g_ref)
+        np_test.assert_almost_equal(p_value, p_ref)
+        self.assertEqual(dof, dof_ref)
+
+    def test_cache(self):
+        results = {}
+        kwargs = dict(data=self.df_adult, boolean=False, cache=results)
+        chi_square(X="Age", Y="Sex", Z=["Race"], **kwargs)
+        self.assertIn(
+            ("pearson", frozenset(("Age", "Sex")), frozenset(["Race"])), results
+        )
+        # X and Y are interchangeable
+        self.assertEqual(
+            chi_square(X="Sex", Y="Age", Z=["Race"], **kwargs),
+            chi_square(X="Age", Y="Sex", Z=["Race"], **kwargs),
+        )
+        self.assertEqual(len(results), 2)  # the result and the encoded data
+
+        # without a cache, changes of the data are taken into account
+        data = self.df_adult[["Age", "Sex"]].copy()
+        statistic, _, _ = chi_square(X="Age", Y="Sex", Z=[], data=data, boolean=False)
+        data["Sex"] = data["Sex"].sample(frac=1, random_state=0).values
+        self.assertNotEqual(
+            chi_square(X="Age", Y="Sex", Z=[], data=data, boolean=False)[0], statistic
+        )
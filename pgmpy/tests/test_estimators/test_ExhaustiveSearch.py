@@ -1,7 +1,9 @@
+import sys
 import unittest
 
 import pandas as pd
 import numpy as np
+from mock import patch
 
 from pgmpy.estimators import ExhaustiveSearch, BDeuScore, BicScore
 
@@ -91,6 +93,34 @@ class TestBaseEstimator(unittest.TestCase):
             set([("Survived", "Pclass"), ("Sex", "Pclass"), ("Sex", "Survived")]),
         )
 
+    def test_estimate_optimal(self):
+        data = pd.DataFrame(
+            np.random.randint(0, 2, size=(1000, 3)), columns=list("ABD")
+        )
+        data["C"] = data["A"] ^ data["B"]
+        data["D"] = data["D"] | data["C"]
+        est = ExhaustiveSearch(data, scoring_method=BicScore(data))
+        best_score = max(score for score, _ in est.all_scores())
+
+        model = est.estimate()
+        self.assertAlmostEqual(est.scoring_method.score(model), best_score)
+
+        model_indegree = est.estimate(max_indegree=1)
+        self.assertTrue(all(d <= 1 for _, d in model_indegree.in_degree()))
+        self.assertLessEqual(est.scoring_method.score(model_indegree), best_score)
+
+        # the parent sets are scored in batches of a few sets
+        est_batches = ExhaustiveSearch(
+            data, scoring_method=BicScore(data), use_cache=False
+        )
+        module = sys.modules["pgmpy.estimators.ExhaustiveSearch"]
+        with patch.object(module, "_SCORE_BATCH_CELLS", 8):
+            model_batches = est_batches.estimate()
+        self.assertSetEqual(set(model_batches.edges()), set(model.edges()))
+
+    def test_estimate_max_memory(self):
+        self.assertRaises(ValueError, self.est_titanic.estimate, max_memory=10)
+
     def test_all_scores(self):
         scores = self.est_titanic.all_scores()
         scores_ref = [
@@ -150,6 +180,16 @@ class TestBaseEstimator(unittest.TestCase):
             [score for score, edges in scores_ref],
         )
 
+    def test_all_scores_parallel(self):
+        scores = [score for score, _ in self.est_titanic.all_scores()]
+        scores_parallel = [score for score, _ in self.est_titanic.all_scores(n_jobs=2)]
+        np.testing.assert_allclose(scores_parallel, scores)
+
+        self.assertSetEqual(
+            set(self.est_titanic.estimate(n_jobs=2).edges()),
+            set(self.est_titanic.estimate().edges()),
+        )
+
     def tearDown(self):
         del self.rand_data
         del self.est_rand
@@ -0,0 +1,103 @@
+import unittest
+import shutil
+import tempfile
+
+import pandas as pd
+import numpy as np
+
+from pgmpy.base import DAG, PDAG
+from pgmpy.estimators import GES, BDeuScore, BicScore
+
+
+class TestGESEstimator(unittest.TestCase):
+    def setUp(self):
+        self.rand_data = pd.DataFrame(
+            np.random.randint(0, 3, size=(5000, 3)), columns=list("ABC")
+        )
+        self.rand_data["D"] = self.rand_data["A"] + self.rand_data["B"]
+        self.est_rand = GES(self.rand_data, scoring_method=BicScore(self.rand_data))
+
+        # link to dataset: "https://www.kaggle.com/c/titanic/download/train.csv"
+        self.titanic_data = pd.read_csv(
+            "pgmpy/tests/test_estimators/testdata/titanic_train.csv"
+        )
+        self.titanic_data1 = self.titanic_data[
+            ["Survived", "Sex", "Pclass", "Age", "Embarked"]
+        ]
+        self.est_titanic = GES(
+            self.titanic_data1, scoring_method=BicScore(self.titanic_data1)
+        )
+
+    def test_insert_operators(self):
+        # A -> C <- B, inserting C -> A would create a cycle
+        adjacency = np.zeros((4, 4), dtype=bool)
+        adjacency[0, 2] = adjacency[1, 2] = True
+        operations = dict(self.est_rand._insert_operators(adjacency))
+        self.assertNotIn((2, 0, ()), operations)
+        self.assertIn((0, 1, ()), operations)
+        self.assertIn((0, 3, ()), operations)
+
+        # A - B - C - D, inserting A -> D needs C -> D, so that D - C - B - A isn't
+        # a semi-directed path from D to A
+        adjacency = np.zeros((4, 4), dtype=bool)
+        for X, Y in [(0, 1), (1, 2), (2, 3)]:
+            adjacency[X, Y] = adjacency[Y, X] = True
+        operations = dict(self.est_rand._insert_operators(adjacency))
+        self.assertIn((0, 3, (2,)), operations)
+        self.assertNotIn((0, 3, ()), operations)
+
+        # removing B - C changes the operators of B and C and of their neighbors
+        new_adjacency = adjacency.copy()
+        new_adjacency[1, 2] = new_adjacency[2, 1] = False
+        self.assertListEqual(
+            list(GES._changed_targets(adjacency, new_adjacency)), [0, 1, 2, 3]
+        )
+        # adding A -> D only changes the operators of A, D and the neighbor C of D
+        new_adjacency = np.zeros((4, 4), dtype=bool)
+        new_adjacency[2, 3] = new_adjacency[3, 2] = True
+        adjacency = new_adjacency.copy()
+        new_adjacency[0, 3] = True
+        self.assertListEqual(
+            list(GES._changed_targets(adjacency, new_adjacency)), [0, 2, 3]
+        )
+
+    def test_estimate_rand(self):
+        pdag = self.est_rand.estimate()
+        self.assertIsInstance(pdag, PDAG)
+        self.assertSetEqual(set(pdag.nodes()), set("ABCD"))
+        self.assertSetEqual(pdag.directed_edges, {("A", "D"), ("B", "D")})
+        self.assertSetEqual(pdag.undirected_edges, set())
+
+        dag = self.est_rand.estimate(return_type="dag")
+        self.assertIsInstance(dag, DAG)
+        self.assertSetEqual(set(dag.edges()), {("A", "D"), ("B", "D")})
+
+        self.assertRaises(ValueError, self.est_rand.estimate, return_type="skeleton")
+
+    def test_estimate_titanic(self):
+        pdag = self.est_titanic.estimate(max_indegree=2)
+        dag = pdag.to_dag()
+        self.assertTrue(all(d <= 2 for _, d in dag.in_degree()))
+        # the estimate is an equivalence class
+        self.assertSetEqual(set(dag.to_pdag().edges()), set(pdag.edges()))
+
+        # The default score is score equivalent, and can be stored on disk.
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        est = GES(self.titanic_data1, cache_dir=cache_dir)
+        self.assertIsInstance(est.scoring_method.base_scorer, BDeuScore)
+        pdag = est.estimate(max_indegree=2)
+        self.assertSetEqual(
+            set(
+                GES(self.titanic_data1, cache_dir=cache_dir)
+                .estimate(max_indegree=2)
+                .edges()
+            ),
+            set(pdag.edges()),
+        )
+
+    def tearDown(self):
+        del self.rand_data
+        del self.est_rand
+        del self.titanic_data
+        del self.est_titanic
@@ -110,7 +110,37 @@ class TestHillClimbEstimator(unittest.TestCase):
             (("flip", ("Pclass", "Embarked")), 3.3563814191281836),
             (("flip", ("Survived", "Sex")), 0.039737027979640516),
         ]
-        self.assertSetEqual(set(legal_ops_both), set(legal_ops_both_ref))
+        legal_ops_both = dict(legal_ops_both)
+        self.assertSetEqual(set(legal_ops_both), set(dict(legal_ops_both_ref)))
+        for operation, score_delta in legal_ops_both_ref:
+            self.assertAlmostEqual(legal_ops_both[operation], score_delta)
+
+    def test_legal_operations_acyclicity(self):
+        model = BayesianModel([("A", "B"), ("B", "C"), ("A", "C")])
+        legal_ops = dict(self.est_rand._legal_operations(model))
+        self.assertSetEqual(
+            set(legal_ops),
+            {
+                ("-", ("A", "B")),
+                ("-", ("B", "C")),
+                ("-", ("A", "C")),
+                ("flip", ("A", "B")),
+                ("flip", ("B", "C")),
+            },
+        )
+
+        adjacency = self.est_rand._adjacency_matrix(model)
+        reach = self.est_rand._reachability(adjacency)
+        np.testing.assert_array_equal(
+            reach, [[False, True, True], [False, False, True], [False, False, False]]
+        )
+
+    def test_estimate_score_deltas(self):
+        est = HillClimbSearch(self.titanic_data1, use_cache=False)
+        model = est.estimate(max_indegree=2)
+        # no single legal operation improves the score of the learned model
+        legal_ops = list(est._legal_operations(model, max_indegree=2))
+        self.assertTrue(all(score_delta < 1e-4 for _, score_delta in legal_ops))
 
     def test_estimate_rand(self):
         est1 = self.est_rand.estimate()
@@ -130,6 +160,13 @@ class TestHillClimbEstimator(unittest.TestCase):
             set([("Survived", "Pclass"), ("Sex", "Pclass"), ("Sex", "Survived")]),
         )
 
+    def test_estimate_parallel(self):
+        est = HillClimbSearch(self.titanic_data1)
+        self.assertSetEqual(
+            set(est.estimate(max_indegree=2, n_jobs=2).edges()),
+            set(est.estimate(max_indegree=2).edges()),
+        )
+
     def tearDown(self):
         del self.rand_data
         del self.est_rand
@@ -36,11 +36,51 @@ class TestMLE(unittest.TestCase):
     def test_get_parameters_incomplete_data(self):
         self.assertSetEqual(set(self.mle1.get_parameters()), set(self.cpds))
 
+    def test_get_parameters_n_jobs(self):
+        self.assertSetEqual(set(self.mle1.get_parameters(n_jobs=2)), set(self.cpds))
+
+    def test_get_parameters_chunks(self):
+        chunks = (self.d1[i : i + 1] for i in range(3))
+        mle = MaximumLikelihoodEstimator(self.m1, chunks)
+        self.assertIsNone(mle.data)
+        self.assertSetEqual(set(mle.get_parameters()), set(self.cpds))
+
+        # The second state of "A" and "C" only appear in the last chunk.
+        for complete_samples_only in [True, False]:
+            mle_data = MaximumLikelihoodEstimator(
+                self.m1, self.d2, complete_samples_only=complete_samples_only
+            )
+            mle_chunks = MaximumLikelihoodEstimator(
+                self.m1,
+                iter([self.d2[:2], self.d2[2:]]),
+                complete_samples_only=complete_samples_only,
+            )
+            self.assertEqual(mle_chunks.state_names["A"], [0, 1])
+            self.assertSetEqual(
+                set(mle_chunks.get_parameters()), set(mle_data.get_parameters())
+            )
+
+        self.assertRaises(ValueError, mle.state_counts_array, "A", ["B"])
+        self.assertRaises(
+            ValueError,
+            MaximumLikelihoodEstimator,
+            self.m1,
+            iter([self.d1]),
+            state_names={"A": [0]},
+        )
+
     def test_estimate_cpd(self):
         self.assertEqual(self.mle1.estimate_cpd("A"), self.cpds[0])
         self.assertEqual(self.mle1.estimate_cpd("B"), self.cpds[1])
         self.assertEqual(self.mle1.estimate_cpd("C"), self.cpds[2])
 
+        # The CPDs can also be estimated from given state counts.
+        state_counts = np.array([[4], [2]])
+        self.assertEqual(
+            self.mle1.estimate_cpd("A", state_counts=state_counts), self.cpds[0]
+        )
+        np.testing.assert_array_equal(state_counts, [[4], [2]])
+
     def test_state_names1(self):
         m = BayesianModel([("A", "B")])
         d = pd.DataFrame(data={"A": [2, 3, 8, 8, 8], "B": ["X", "O", "X", "O", "X"]})
@@ -47,6 +47,44 @@ class TestMmhcEstimator(unittest.TestCase):
             )
         )
 
+    def test_mmpc(self):
+        rng = np.random.RandomState(0)
+        data = pd.DataFrame(rng.randint(0, 2, size=(15000, 3)), columns=list("XYZ"))
+        data["sum"] = data.sum(axis=1)
+        est = MmhcEstimator(data)
+        skel = est.mmpc()
+        expected_edges = {
+            frozenset(("X", "sum")),
+            frozenset(("Y", "sum")),
+            frozenset(("Z", "sum")),
+        }
+        self.assertSetEqual(set(map(frozenset, skel.edges())), expected_edges)
+
+        # The p-values are memoized, with X and Y interchangeable.
+        p_values = dict(est._p_values)
+        self.assertIn((frozenset(("X", "sum")), frozenset()), p_values)
+
+        # Each search computes its p-values again, e.g. for other data.
+        est.mmpc()
+        self.assertEqual(est._p_values, p_values)
+        est.data = data.assign(sum=rng.permutation(data["sum"].values))
+        self.assertEqual(len(est.mmpc().edges()), 0)
+        self.assertNotEqual(est._p_values, p_values)
+
+        skel = MmhcEstimator(data).mmpc(n_jobs=2)
+        self.assertSetEqual(set(map(frozenset, skel.edges())), expected_edges)
+
+    def test_mmpc_chain(self):
+        rng = np.random.RandomState(1)
+        data = pd.DataFrame(rng.randint(0, 3, size=(5000, 6)), columns=list("ABCDEF"))
+        for parent, child in zip("ABCDE", "BCDEF"):
+            data[child] = np.where(rng.rand(5000) < 0.5, data[parent], data[child])
+        skel = MmhcEstimator(data).mmpc()
+        self.assertSetEqual(
+            set(map(frozenset, skel.edges())),
+            set(map(frozenset, zip("ABCDE", "BCDEF"))),
+        )
+
     def tearDown(self):
         del self.data1
         del self.est1
@@ -1,4 +1,6 @@
 import unittest
+import sys
+from itertools import combinations
 
 import pandas as pd
 import numpy as np
@@ -83,10 +85,85 @@ class TestPCFakeCITest(unittest.TestCase):
             self.assertTrue(((u, v) in expected_edges) or ((v, u) in expected_edges))
 
 
+class TestPCProcesses(unittest.TestCase):
+    def test_build_skeleton_fake_ci(self):
+        estimator = PC(pd.DataFrame(np.zeros((10, 4)), columns=["A", "B", "C", "D"]))
+        skel, sep_set = estimator.build_skeleton(
+            ci_test=TestPCFakeCITest.fake_ci_t, variant="processes", n_jobs=2
+        )
+        expected_edges = {("A", "D")}
+        for u, v in skel.edges():
+            self.assertTrue(((u, v) in expected_edges) or ((v, u) in expected_edges))
+
+        # The separating sets don't depend on the number of workers.
+        for n_jobs in [1, 3]:
+            self.assertEqual(
+                estimator.build_skeleton(
+                    ci_test=TestPCFakeCITest.fake_ci_t,
+                    variant="processes",
+                    n_jobs=n_jobs,
+                )[1],
+                sep_set,
+            )
+
+    def test_build_skeleton_discrete_data(self):
+        rng = np.random.RandomState(0)
+        data = pd.DataFrame(rng.randint(0, 2, size=(5000, 5)), columns=list("ABCDE"))
+        data["F"] = data["A"] + data["B"] + data["C"]
+        # Non-numeric and missing values are shared as integer codes.
+        data["G"] = data["D"].map({0: "x", 1: "y"})
+        data.loc[:10, "E"] = np.nan
+        skel, sep_sets = PC(data=data).estimate(
+            variant="stable", ci_test="chi_square", return_type="skeleton"
+        )
+        for n_jobs in [1, 2]:
+            skel_processes, sep_sets_processes = PC(data=data).estimate(
+                variant="processes",
+                ci_test="chi_square",
+                return_type="skeleton",
+                n_jobs=n_jobs,
+            )
+            self.assertSetEqual(
+                set(map(frozenset, skel_processes.edges())),
+                set(map(frozenset, skel.edges())),
+            )
+            self.assertEqual(sep_sets_processes.keys(), sep_sets.keys())
+
+
+class TestPCParallel(unittest.TestCase):
+    def test_build_skeleton_discrete_data(self):
+        rng = np.random.RandomState(0)
+        data = pd.DataFrame(rng.randint(0, 2, size=(5000, 7)), columns=list("ABCDEFG"))
+        data["H"] = data["A"] + data["B"] + data["C"]
+        data.loc[:10, "E"] = np.nan
+        skel, sep_sets = PC(data=data).estimate(
+            variant="stable", ci_test="chi_square", return_type="skeleton"
+        )
+        # The threads share the cache of the CI tests, switching between them often
+        # makes them race for it.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(20):
+                skel_parallel, sep_sets_parallel = PC(data=data).estimate(
+                    variant="parallel",
+                    ci_test="chi_square",
+                    return_type="skeleton",
+                    n_jobs=4,
+                )
+                self.assertSetEqual(
+                    set(map(frozenset, skel_parallel.edges())),
+                    set(map(frozenset, skel.edges())),
+                )
+                self.assertEqual(sep_sets_parallel, sep_sets)
+        finally:
+            sys.setswitchinterval(switch_interval)
+
+
 class TestPCEstimatorFromIndependencies(unittest.TestCase):
     def test_build_skeleton_from_ind(self):
         # Specify a set of independencies
-        for variant in ["orig", "stable", "parallel"]:
+        for variant in ["orig", "stable", "parallel", "processes"]:
             ind = Independencies(["B", "C"], ["A", ["B", "C"], "D"])
             ind = ind.closure()
             estimator = PC(independencies=ind)
@@ -165,6 +242,34 @@ class TestPCEstimatorFromIndependencies(unittest.TestCase):
             set([("A", "B"), ("B", "A"), ("A", "C"), ("C", "A")]),
         )
 
+    def test_skeleton_to_pdag_meek_rules(self):
+        # R1: A -> C <- B and C - D is oriented to C -> D.
+        skel = nx.Graph([("A", "C"), ("B", "C"), ("C", "D")])
+        sep_sets = {
+            frozenset({"A", "B"}): (),
+            frozenset({"A", "D"}): ("C",),
+            frozenset({"B", "D"}): ("C",),
+        }
+        pdag = PC.skeleton_to_pdag(skel, sep_sets)
+        self.assertSetEqual(pdag.directed_edges, {("A", "C"), ("B", "C"), ("C", "D")})
+        self.assertSetEqual(pdag.undirected_edges, set())
+
+        # The PDAG of the skeleton and the separating sets of a DAG is its CPDAG.
+        for edges in [
+            [("A", "B"), ("C", "B"), ("B", "D"), ("A", "D"), ("D", "E")],
+            [("A", "C"), ("B", "C"), ("A", "D"), ("B", "D"), ("C", "E"), ("D", "E")],
+            [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("D", "E"), ("B", "E")],
+        ]:
+            model = BayesianModel(edges)
+            sep_sets = {}
+            for u, v in combinations(model.nodes(), 2):
+                if not model.has_edge(u, v) and not model.has_edge(v, u):
+                    if v in nx.descendants(model, u):
+                        u, v = v, u
+                    sep_sets[frozenset((u, v))] = tuple(model.predecessors(u))
+            pdag = PC.skeleton_to_pdag(model.to_undirected(), sep_sets)
+            self.assertSetEqual(set(pdag.edges()), set(model.to_pdag().edges()))
+
     def test_estimate_dag(self):
         for variant in ["orig", "stable", "parallel"]:
             ind = Independencies(["B", "C"], ["A", ["B", "C"], "D"])
@@ -190,6 +295,19 @@ class TestPCEstimatorFromIndependencies(unittest.TestCase):
 
 
 class TestPCEstimatorFromDiscreteData(unittest.TestCase):
+    def test_build_skeleton_g_sq(self):
+        data = pd.DataFrame(
+            np.random.randint(0, 2, size=(10000, 5)), columns=list("ABCDE")
+        )
+        data["F"] = data["A"] + data["B"] + data["C"]
+        skel, sep_sets = PC(data=data).estimate(
+            variant="stable", ci_test="g_sq", return_type="skeleton"
+        )
+        self.assertSetEqual(
+            set(map(frozenset, skel.edges())),
+            {frozenset(("A", "F")), frozenset(("B", "F")), frozenset(("C", "F"))},
+        )
+
     def test_build_skeleton(self):
         for variant in ["orig", "stable", "parallel"]:
             # Fake dataset no: 1
@@ -336,3 +454,17 @@ class TestPCEstimatorFromContinuousData(unittest.TestCase):
 
             expected_edges = {("Z", "sum"), ("X", "sum"), ("Y", "sum")}
             self.assertEqual(set(dag.edges()), expected_edges)
+
+    def test_build_dag_from_covariance(self):
+        rng = np.random.RandomState(0)
+        data = pd.DataFrame(rng.randn(10000, 3), columns=list("XYZ"))
+        data["sum"] = data.sum(axis=1)
+        est = PC(covariance=data.cov(), sample_size=len(data))
+        dag = est.estimate(ci_test="fisher_z", return_type="dag")
+
+        expected_edges = {("Z", "sum"), ("X", "sum"), ("Y", "sum")}
+        self.assertEqual(set(dag.edges()), expected_edges)
+        self.assertEqual(
+            set(PC(data=data).estimate(ci_test="fisher_z").edges()), expected_edges
+        )
+        self.assertRaises(ValueError, PC().estimate, ci_test="fisher_z")
@@ -1,7 +1,14 @@
 import unittest
-from mock import Mock, MagicMock, call
-from pgmpy.estimators.ScoreCache import LRUCache, ScoreCache
-from pgmpy.estimators import BicScore
+import itertools
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from mock import Mock, MagicMock, call, patch
+from pgmpy.estimators.ScoreCache import LRUCache, ScoreCache, SQLiteCache
+from pgmpy.estimators import BicScore, BDeuScore
+import numpy as np
 import pandas as pd
 
 
@@ -82,3 +89,112 @@ class TestScoreCache(unittest.TestCase):
         base_scorer.local_score.assert_has_calls(
             expected_function_calls, any_order=False
         )
+
+    def test_score_cache_local_scores(self):
+        data = pd.DataFrame({"A": [0, 1, 1, 0], "B": [0, 1, 0, 1], "C": [1, 1, 0, 0]})
+        base_scorer = BicScore(data)
+        expected = base_scorer.local_scores("A", [["B"], [], ["B", "C"]])
+        base_scorer.local_scores = Mock(wraps=base_scorer.local_scores)
+        cache = ScoreCache(base_scorer, data)
+
+        cache.local_score("A", ["B"])
+        # the cached scores are reused, the others are computed at once
+        np.testing.assert_allclose(
+            cache.local_scores("A", [["B"], [], ["B", "C"], []]),
+            np.append(expected, expected[1]),
+        )
+        base_scorer.local_scores.assert_called_with("A", [[], ["B", "C"]])
+        calls = base_scorer.local_scores.call_count
+        np.testing.assert_allclose(
+            cache.local_scores("A", [["B", "C"], ["B"], []]), expected[[2, 0, 1]]
+        )
+        self.assertEqual(base_scorer.local_scores.call_count, calls)
+
+    def test_score_cache_pickle(self):
+        data = pd.DataFrame({"A": [0, 1, 1, 0], "B": [0, 1, 0, 1]})
+        cache = ScoreCache(BicScore(data), data, max_size=5)
+        score = cache.local_score("A", ["B"])
+
+        unpickled = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(len(unpickled.cache.mapping), 0)
+        self.assertEqual(unpickled.cache.max_size, 5)
+        self.assertEqual(unpickled.local_score("A", ["B"]), score)
+
+    def test_disk_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = pd.DataFrame({"A": [0, 1, 1, 0], "B": [0, 1, 0, 1]})
+
+        cache = ScoreCache(BicScore(data), data, cache_dir=cache_dir)
+        score = cache.local_score("A", ["B"])
+
+        # a new instance reads the score from disk instead of computing it
+        base_scorer = BicScore(data)
+        base_scorer.local_score = Mock(side_effect=AssertionError)
+        cache = ScoreCache(base_scorer, data, cache_dir=cache_dir)
+        self.assertEqual(cache.local_score("A", ["B"]), score)
+        base_scorer.local_score.assert_not_called()
+
+        # only the scores which aren't on disk are computed
+        base_scorer = BicScore(data)
+        base_scorer.local_scores = Mock(wraps=base_scorer.local_scores)
+        cache = ScoreCache(base_scorer, data, cache_dir=cache_dir)
+        scores = cache.local_scores("A", [["B"], []])
+        self.assertEqual(scores[0], score)
+        base_scorer.local_scores.assert_called_once_with("A", [[]])
+        cache = ScoreCache(BicScore(data), data, cache_dir=cache_dir)
+        np.testing.assert_allclose(cache.local_scores("A", [[], ["B"]]), scores[::-1])
+
+        # other data or scorers don't share the scores
+        other_data = pd.DataFrame({"A": [0, 1, 1, 1], "B": [0, 1, 0, 1]})
+        fingerprints = {
+            cache.disk_cache.namespace,
+            ScoreCache(
+                BicScore(other_data), other_data, cache_dir=cache_dir
+            ).disk_cache.namespace,
+            ScoreCache(BDeuScore(data), data, cache_dir=cache_dir).disk_cache.namespace,
+            ScoreCache(
+                BDeuScore(data, equivalent_sample_size=5), data, cache_dir=cache_dir
+            ).disk_cache.namespace,
+        }
+        self.assertEqual(len(fingerprints), 4)
+
+    def test_disk_cache_used_scorer(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        data = pd.DataFrame({"A": [0, 1, 1, 0], "B": [0, 1, 0, 1]})
+
+        # a scorer which has already computed scores shares them with a new one
+        used_scorer = BicScore(data)
+        used_scorer.local_score("A", ["B"])
+        self.assertEqual(
+            ScoreCache(used_scorer, data, cache_dir=cache_dir).disk_cache.namespace,
+            ScoreCache(BicScore(data), data, cache_dir=cache_dir).disk_cache.namespace,
+        )
+
+    def test_disk_cache_last_used(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        # a clock which ticks at every call
+        clock = Mock(time=Mock(side_effect=itertools.count()))
+        module = sys.modules["pgmpy.estimators.ScoreCache"]
+        with patch.object(module, "time", clock):
+            cache = SQLiteCache(os.path.join(cache_dir, "scores.sqlite"), "namespace")
+            self.assertEqual(cache(Mock(return_value=-1.0), "A", ("B",)), -1.0)
+
+            def last_used():
+                query = "SELECT last_used FROM scores"
+                return cache.connection.execute(query).fetchone()[0]
+
+            # the times of the reads are written in batches
+            function = Mock(side_effect=AssertionError)
+            for _ in range(999):
+                self.assertEqual(cache(function, "A", ("B",)), -1.0)
+            self.assertEqual(last_used(), 0)
+            cache(function, "A", ("B",))
+            self.assertEqual(last_used(), 1000)
+
+            cache.get_many("A", [("B",)])
+            self.assertEqual(last_used(), 1000)
+            cache._evict()
+            self.assertEqual(last_used(), 1001)
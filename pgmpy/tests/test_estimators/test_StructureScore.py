@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pgmpy.estimators import K2Score, BDeuScore, BicScore
+
+
+class TestLocalScores(unittest.TestCase):
+    def setUp(self):
+        self.d1 = pd.DataFrame(
+            data={"A": [0, 0, 1], "B": [0, 1, 0], "C": [1, 1, 0], "D": ["X", "Y", "Z"]}
+        )
+        # (A=1, B=1) and most of the states of (D, A) aren't observed.
+        self.parent_sets = [[], ["A"], ["A", "B"], ["B", "A"], ["D", "A"]]
+        self.expected_scores = {
+            K2Score: [
+                -2.4849066497880004,
+                -1.791759469228055,
+                -2.0794415416798357,
+                -2.0794415416798357,
+                -2.0794415416798357,
+            ],
+            BDeuScore: [
+                -2.17475172148416,
+                -1.9252908618525773,
+                -2.079441541679836,
+                -2.079441541679836,
+                -2.0794415416798353,
+            ],
+            BicScore: [
+                -2.4588486492184938,
+                -1.0986122886681098,
+                -2.1972245773362196,
+                -2.1972245773362196,
+                -3.295836866004329,
+            ],
+        }
+
+    def test_local_scores(self):
+        for score, expected in self.expected_scores.items():
+            with self.subTest(score=score.__name__):
+                scorer = score(self.d1)
+                np.testing.assert_allclose(
+                    scorer.local_scores("C", self.parent_sets), expected
+                )
+                for parents, expected_score in zip(self.parent_sets, expected):
+                    self.assertAlmostEqual(
+                        scorer.local_score("C", parents), expected_score
+                    )
+                self.assertEqual(len(scorer.local_scores("C", [])), 0)
+
+    def tearDown(self):
+        del self.d1
+        del self.parent_sets
+        del self.expected_scores
@@ -5,10 +5,10 @@ from collections import OrderedDict
 import numpy as np
 import numpy.testing as np_test
 
-from pgmpy.factors.discrete import DiscreteFactor
+from pgmpy.factors.discrete import DiscreteFactor, LogDiscreteFactor
 from pgmpy.factors.discrete import JointProbabilityDistribution as JPD
 from pgmpy.factors import factor_divide
-from pgmpy.factors import factor_product
+from pgmpy.factors import factor_product, factor_sum_product
 from pgmpy.factors.discrete.CPD import TabularCPD
 from pgmpy.independencies import Independencies
 from pgmpy.models import BayesianModel
@@ -533,6 +533,39 @@ class TestFactorMethods(unittest.TestCase):
     def test_factor_product_non_factor_arg(self):
         self.assertRaises(TypeError, factor_product, 1, 2)
 
+    def test_factor_sum_product(self):
+        phi = DiscreteFactor(["x1", "x2", "x3"], [2, 3, 2], range(12))
+        phi1 = DiscreteFactor(["x3", "x4", "x1"], [2, 2, 2], range(8))
+        phi2 = DiscreteFactor(["x4", "x5"], [2, 3], range(6))
+
+        result = factor_sum_product(output_vars=["x2", "x5"], factors=[phi, phi1, phi2])
+        expected = factor_product(phi, phi1, phi2).marginalize(
+            ["x1", "x3", "x4"], inplace=False
+        )
+        self.assertEqual(result.variables, ["x2", "x5"])
+        self.assertEqual(result, expected)
+
+        result = factor_sum_product(output_vars=[], factors=[phi, phi1])
+        np_test.assert_almost_equal(result.values, (phi * phi1).values.sum())
+
+    def test_factor_sum_product_state_names(self):
+        phi = DiscreteFactor(
+            ["x1", "x2"], [2, 2], range(4), state_names={"x1": ["a", "b"], "x2": [0, 1]}
+        )
+        phi1 = DiscreteFactor(
+            ["x2", "x3"], [2, 2], range(4), state_names={"x2": [0, 1], "x3": ["c", "d"]}
+        )
+        result = factor_sum_product(output_vars=["x3", "x1"], factors=[phi, phi1])
+        self.assertEqual(result.state_names, {"x1": ["a", "b"], "x3": ["c", "d"]})
+        self.assertEqual(result, (phi * phi1).marginalize(["x2"], inplace=False))
+
+    def test_factor_sum_product_errors(self):
+        phi = DiscreteFactor(["x1", "x2"], [2, 2], range(4))
+        self.assertRaises(TypeError, factor_sum_product, "x1", [phi])
+        self.assertRaises(ValueError, factor_sum_product, ["x1"], [])
+        self.assertRaises(ValueError, factor_sum_product, ["x3"], [phi])
+        self.assertRaises(TypeError, factor_sum_product, ["x1"], [1, 2])
+
     def test_factor_mul(self):
         phi = DiscreteFactor(["x1", "x2"], [2, 2], range(4))
         phi1 = DiscreteFactor(["x3", "x4"], [2, 2], range(4))
@@ -808,6 +841,74 @@ class TestFactorMethods(unittest.TestCase):
         del self.phi10
 
 
+class TestLogDiscreteFactor(unittest.TestCase):
+    def setUp(self):
+        self.phi1 = DiscreteFactor(["x1", "x2", "x3"], [2, 3, 2], np.arange(1, 13))
+        self.phi2 = DiscreteFactor(["x3", "x4", "x1"], [2, 2, 2], np.arange(0, 8))
+        self.log_phi1 = self.phi1.to_log_factor()
+        self.log_phi2 = self.phi2.to_log_factor()
+
+    def test_conversion(self):
+        self.assertIsInstance(self.log_phi1, LogDiscreteFactor)
+        np_test.assert_almost_equal(self.log_phi1.values, np.log(self.phi1.values))
+        self.assertEqual(self.log_phi2.values[0, 0, 0], -np.inf)
+        self.assertEqual(self.log_phi2.to_factor(), self.phi2)
+        self.assertNotEqual(self.log_phi1, self.phi1)
+
+    def test_operations(self):
+        self.assertEqual(
+            (self.log_phi1 * self.log_phi2).to_factor(), self.phi1 * self.phi2
+        )
+        self.assertEqual(
+            factor_product(self.log_phi1, self.log_phi2).to_factor(),
+            factor_product(self.phi1, self.phi2),
+        )
+        self.assertEqual(
+            factor_sum_product(["x2"], [self.log_phi1, self.log_phi2]).to_factor(),
+            factor_sum_product(["x2"], [self.phi1, self.phi2]),
+        )
+        self.assertEqual(
+            self.log_phi1.marginalize(["x1", "x3"], inplace=False).to_factor(),
+            self.phi1.marginalize(["x1", "x3"], inplace=False),
+        )
+        self.assertEqual(
+            self.log_phi1.maximize(["x2"], inplace=False).to_factor(),
+            self.phi1.maximize(["x2"], inplace=False),
+        )
+        self.assertEqual(
+            self.log_phi1.normalize(inplace=False).to_factor(),
+            self.phi1.normalize(inplace=False),
+        )
+        self.assertEqual(
+            self.log_phi1.reduce([("x2", 1)], inplace=False).to_factor(),
+            self.phi1.reduce([("x2", 1)], inplace=False),
+        )
+        divisor = self.phi2.marginalize(["x4"], inplace=False)
+        self.assertEqual(
+            (self.log_phi1 / divisor.to_log_factor()).to_factor(),
+            self.phi1 / divisor,
+        )
+        np_test.assert_almost_equal(
+            (self.log_phi1 + self.log_phi1).to_factor().values, 2 * self.phi1.values
+        )
+        self.assertRaises(
+            ValueError, self.log_phi1.divide, self.log_phi2, inplace=False
+        )
+        self.assertRaises(
+            NotImplementedError, factor_sum_product, ["x1"], [self.log_phi1, self.phi2]
+        )
+
+    def test_no_underflow(self):
+        phi = LogDiscreteFactor(["x1"], [2], [0, 0])
+        for _ in range(2000):
+            phi = phi * LogDiscreteFactor(["x1"], [2], np.log([1e-3, 2e-3]))
+        np_test.assert_almost_equal(
+            phi.normalize(inplace=False).to_factor().values,
+            [1 / (1 + 2**2000), 1 - 1 / (1 + 2**2000)],
+        )
+        self.assertTrue(np.all(np.isfinite(phi.values)))
+
+
 class TestHash:
     # Used to check the hash function of DiscreteFactor class.
 
@@ -2,13 +2,16 @@ import unittest
 import numpy as np
 import itertools
 import numpy.testing as np_test
+import networkx as nx
+import pandas as pd
 
 from pgmpy.inference import VariableElimination
 from pgmpy.inference import BeliefPropagation
 from pgmpy.models import BayesianModel, MarkovModel
 from pgmpy.models import JunctionTree
 from pgmpy.factors.discrete import TabularCPD
-from pgmpy.factors.discrete import DiscreteFactor
+from pgmpy.factors.discrete import DiscreteFactor, LogDiscreteFactor
+from pgmpy.factors import factor_product
 
 
 class TestVariableElimination(unittest.TestCase):
@@ -209,6 +212,155 @@ class TestVariableElimination(unittest.TestCase):
         )
         self.assertEqual(2, result_width)
 
+    def test_query_plan_cache(self):
+        inference = VariableElimination(self.bayesian_model, max_cached_plans=2)
+        for evidence in [{"A": 0, "R": 1}, {"A": 1, "R": 0}, {"R": 0, "A": 1}]:
+            query_result = inference.query(
+                ["J"], evidence=evidence, show_progress=False
+            )
+            self.assertEqual(
+                query_result,
+                self.bayesian_inference.query(
+                    ["J"],
+                    evidence=evidence,
+                    elimination_order=None,
+                    show_progress=False,
+                ),
+            )
+        info = inference.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 1, 1))
+
+        inference.query(["Q"], evidence={"A": 0}, show_progress=False)
+        inference.query(["L"], show_progress=False)
+        inference.query(["J"], evidence={"A": 1, "R": 1}, show_progress=False)
+        info = inference.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 4, 2))
+
+        inference.clear_plan_cache()
+        self.assertEqual(inference.plan_cache_info().currsize, 0)
+
+        no_cache_inference = VariableElimination(
+            self.bayesian_model, max_cached_plans=0
+        )
+        no_cache_inference.query(["J"], show_progress=False)
+        no_cache_inference.query(["J"], show_progress=False)
+        info = no_cache_inference.plan_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 2, 0))
+
+    def test_query_pruning(self):
+        inference = VariableElimination(self.bayesian_model)
+
+        # L, Q and G are barren nodes.
+        query_result = inference.query(["J"], show_progress=False)
+        plan = next(reversed(inference._query_plans.values()))
+        self.assertEqual(set(plan.elimination_order), {"A", "R"})
+        self.assertEqual(
+            query_result,
+            DiscreteFactor(variables=["J"], cardinality=[2], values=[0.416, 0.584]),
+        )
+
+        # R is d-separated from A without evidence on J.
+        query_result = inference.query(["A"], evidence={"R": 0}, show_progress=False)
+        plan = next(reversed(inference._query_plans.values()))
+        self.assertEqual(plan.steps, [])
+        self.assertEqual(plan.reductions, [])
+        self.assertEqual(
+            query_result,
+            DiscreteFactor(variables=["A"], cardinality=[2], values=[0.2, 0.8]),
+        )
+
+        # Q is d-separated from L given J.
+        query_result = inference.query(
+            ["Q"], evidence={"J": 0, "L": 1}, show_progress=False
+        )
+        plan = next(reversed(inference._query_plans.values()))
+        self.assertEqual(plan.elimination_order, [])
+        self.assertEqual(
+            query_result,
+            DiscreteFactor(variables=["Q"], cardinality=[2], values=[0.9, 0.1]),
+        )
+
+        query_result = inference.query(
+            ["A"], evidence={"L": 1, "R": 0}, show_progress=False
+        )
+        joint = factor_product(
+            *[cpd.to_factor() for cpd in self.bayesian_model.get_cpds()]
+        )
+        joint.reduce([("L", 1), ("R", 0)])
+        joint.marginalize(["J", "Q", "G"])
+        joint.normalize()
+        self.assertEqual(query_result, joint)
+
+    def test_batch_query(self):
+        evidence = pd.DataFrame(
+            {"A": [0, 1, 0, 1, 0], "R": [1, 0, 1, 1, 0], "L": [1, 1, 1, 0, 0]}
+        )
+        joint = self.bayesian_inference.batch_query(
+            ["J", "Q"], evidence, show_progress=False
+        )
+        marginals = self.bayesian_inference.batch_query(
+            ["J", "Q"], evidence, joint=False, show_progress=False
+        )
+        log_joint = VariableElimination(
+            self.bayesian_model, log_space=True
+        ).batch_query(["J", "Q"], evidence, show_progress=False)
+        self.assertEqual(joint.shape, (5, 2, 2))
+        for index, row in evidence.iterrows():
+            query_result = self.bayesian_inference.query(
+                ["J", "Q"], evidence=row.to_dict(), show_progress=False
+            )
+            query_result = query_result.values.transpose(
+                [query_result.variables.index(var) for var in ["J", "Q"]]
+            )
+            np_test.assert_array_almost_equal(joint[index], query_result)
+            np_test.assert_array_almost_equal(np.exp(log_joint[index]), query_result)
+            np_test.assert_array_almost_equal(
+                marginals["J"][index], query_result.sum(axis=1)
+            )
+            np_test.assert_array_almost_equal(
+                marginals["Q"][index], query_result.sum(axis=0)
+            )
+
+        self.assertRaises(
+            ValueError,
+            self.bayesian_inference.batch_query,
+            ["J"],
+            {"J": [0]},
+            show_progress=False,
+        )
+        self.assertRaises(
+            ValueError,
+            self.bayesian_inference.batch_query,
+            ["J"],
+            {"A": [2]},
+            show_progress=False,
+        )
+
+    def test_log_space(self):
+        log_inference = VariableElimination(self.bayesian_model, log_space=True)
+        query_result = log_inference.query(
+            variables=["J", "Q"],
+            evidence={"A": 0, "R": 0, "G": 0, "L": 1},
+            show_progress=False,
+        )
+        self.assertIsInstance(query_result, LogDiscreteFactor)
+        self.assertEqual(
+            query_result.to_factor(),
+            DiscreteFactor(
+                variables=["J", "Q"],
+                cardinality=[2, 2],
+                values=np.array([[0.73636364, 0.08181818], [0.03636364, 0.14545455]]),
+            ),
+        )
+        self.assertEqual(
+            log_inference.map_query(["A", "R", "L"], {"J": 0, "Q": 1, "G": 0}),
+            {"A": 1, "R": 0, "L": 0},
+        )
+        np_test.assert_almost_equal(
+            np.exp(log_inference.max_marginal(["J"], show_progress=False)),
+            self.bayesian_inference.max_marginal(["J"], show_progress=False),
+        )
+
     def tearDown(self):
         del self.bayesian_inference
         del self.bayesian_model
@@ -662,6 +814,101 @@ class TestBeliefPropagation(unittest.TestCase):
             ValueError, belief_propagation.map_query, variables=["J"], evidence=["J"]
         )
 
+    def test_log_space(self):
+        belief_propagation = BeliefPropagation(self.bayesian_model, log_space=True)
+        query_result = belief_propagation.query(
+            variables=["J", "Q"], evidence={"A": 0, "R": 0, "G": 0, "L": 1}
+        )
+        self.assertIsInstance(query_result, LogDiscreteFactor)
+        self.assertEqual(
+            query_result.to_factor(),
+            DiscreteFactor(
+                variables=["J", "Q"],
+                cardinality=[2, 2],
+                values=np.array([[0.73636364, 0.08181818], [0.03636364, 0.14545455]]),
+            ),
+        )
+        self.assertDictEqual(
+            belief_propagation.map_query(["A", "R", "L"], {"J": 0, "Q": 1, "G": 0}),
+            {"A": 1, "R": 0, "L": 0},
+        )
+
+    def test_query_evidence_absorption(self):
+        belief_propagation = BeliefPropagation(self.bayesian_model)
+        variable_elimination = VariableElimination(self.bayesian_model)
+        evidences = [
+            {"A": 0, "L": 1},
+            {"A": 1, "L": 1},
+            {"A": 1, "L": 1, "G": 0},
+            {"L": 0},
+            {},
+        ]
+        for evidence in evidences:
+            for variables in [["J"], ["Q"], ["Q", "R"], ["G", "Q"]]:
+                variables = [var for var in variables if var not in evidence]
+                self.assertEqual(
+                    belief_propagation.query(
+                        variables, evidence=evidence, show_progress=False
+                    ),
+                    variable_elimination.query(
+                        variables, evidence=evidence, show_progress=False
+                    ),
+                )
+
+        # Only the messages downstream of the clique with the changed evidence are
+        # invalidated.
+        belief_propagation.query(["Q"], evidence={"A": 0, "G": 0})
+        messages = dict(belief_propagation._messages)
+        belief_propagation.query(["Q"], evidence={"A": 0, "G": 1})
+        g_clique = belief_propagation._get_variable_clique("G")
+        for key, message in messages.items():
+            _, sender, receiver = key
+            tree = nx.Graph(belief_propagation.junction_tree.edges())
+            tree.remove_edge(sender, receiver)
+            if g_clique in nx.node_connected_component(tree, sender):
+                self.assertIsNot(belief_propagation._messages.get(key), message)
+            else:
+                self.assertIs(belief_propagation._messages[key], message)
+
+    def test_query_marginals(self):
+        belief_propagation = BeliefPropagation(self.bayesian_model)
+        variable_elimination = VariableElimination(self.bayesian_model)
+        for evidence in [None, {"A": 0, "L": 1}, {"J": 1, "G": 0}]:
+            marginals = belief_propagation.query_marginals(
+                evidence=evidence, show_progress=False
+            )
+            self.assertEqual(
+                set(marginals),
+                set(self.bayesian_model.nodes()) - set(evidence if evidence else []),
+            )
+            for var, marginal in marginals.items():
+                self.assertEqual(
+                    marginal,
+                    variable_elimination.query(
+                        [var], evidence=evidence, show_progress=False
+                    ),
+                )
+
+        marginals = belief_propagation.query_marginals(
+            ["Q", "R"], evidence={"A": 0}, show_progress=False
+        )
+        self.assertEqual(set(marginals), {"Q", "R"})
+        self.assertRaises(
+            ValueError,
+            belief_propagation.query_marginals,
+            ["A"],
+            evidence={"A": 0},
+        )
+
+        single_clique = JunctionTree()
+        single_clique.add_node(("A", "B"))
+        single_clique.add_factors(DiscreteFactor(["A", "B"], [2, 2], [1, 2, 3, 4]))
+        marginals = BeliefPropagation(single_clique).query_marginals(
+            show_progress=False
+        )
+        np_test.assert_array_almost_equal(marginals["A"].values, [0.3, 0.7])
+        np_test.assert_array_almost_equal(marginals["B"].values, [0.4, 0.6])
+
     def test_issue_1048(self):
         model = BayesianModel()
 
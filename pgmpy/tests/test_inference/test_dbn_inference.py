@@ -37,6 +37,7 @@ class TestDBNInference(unittest.TestCase):
         dbn_2.add_cpds(cpd_x_2, cpd_y_2, cpd_z_2, cpd_start_z_2)
         dbn_2.initialize_initial_state()
         self.dbn_inference_2 = DBNInference(dbn_2)
+        self.dbn_inference_2_log = DBNInference(dbn_2, log_space=True)
 
     def test_forward_inf_single_variable(self):
         query_result = self.dbn_inference_1.forward_inference([("X", 0)])
@@ -119,3 +120,20 @@ class TestDBNInference(unittest.TestCase):
         np_test.assert_array_almost_equal(
             query_result[("X", 1)].values, np.array([0.7621772, 0.2378228])
         )
+
+    def test_log_space_inference(self):
+        evidence = {("Y", 0): 0, ("Y", 1): 1, ("Y", 2): 1}
+        query_result = self.dbn_inference_2_log.forward_inference([("X", 2)], evidence)
+        np_test.assert_array_almost_equal(
+            np.exp(query_result[("X", 2)].values), np.array([0.76273838, 0.23726162])
+        )
+
+        query_result = self.dbn_inference_2_log.backward_inference(
+            [("X", 0), ("X", 1)], evidence
+        )
+        np_test.assert_array_almost_equal(
+            np.exp(query_result[("X", 0)].values), np.array([0.66594382, 0.33405618])
+        )
+        np_test.assert_array_almost_equal(
+            np.exp(query_result[("X", 1)].values), np.array([0.7621772, 0.2378228])
+        )
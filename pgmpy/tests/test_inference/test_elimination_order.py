@@ -1,9 +1,11 @@
+import itertools
 from unittest import TestCase
 
 import numpy as np
 import pandas as pd
 
-from pgmpy.models import BayesianModel
+from pgmpy.models import BayesianModel, MarkovModel, FactorGraph
+from pgmpy.factors.discrete import DiscreteFactor
 from pgmpy.inference.EliminationOrder import (
     BaseEliminationOrder,
     WeightedMinFill,
@@ -115,9 +117,15 @@ class TestMinFill(BaseEliminationTest):
 
     def test_cost(self):
         self.assertEqual(self.elimination_order.cost("diff"), 0)
-        self.assertEqual(self.elimination_order.cost("intel"), 1)
+        self.assertEqual(self.elimination_order.cost("intel"), 2)
         self.assertEqual(self.elimination_order.cost("sat"), 0)
 
+    def test_fill_in_edges(self):
+        self.assertEqual(
+            set(map(frozenset, self.elimination_order.fill_in_edges("intel"))),
+            {frozenset(("diff", "sat")), frozenset(("grade", "sat"))},
+        )
+
     def test_elimination_order(self):
         elimination_order = self.elimination_order.get_elimination_order()
         self.assertEqual(
@@ -129,3 +137,85 @@ class TestMinFill(BaseEliminationTest):
             nodes=["diff", "grade", "intel"]
         )
         self.assertEqual(set(elimination_order), {"diff", "grade", "intel"})
+
+
+class TestEliminationOrderUndirected(TestCase):
+    def setUp(self):
+        cardinality = {"A": 2, "B": 3, "C": 2, "D": 3, "E": 2, "F": 3}
+        scopes = [
+            ("A", "B"),
+            ("B", "C"),
+            ("C", "D"),
+            ("D", "A"),
+            ("A", "E"),
+            ("B", "D", "F"),
+        ]
+        self.markov_model = MarkovModel(
+            [edge for scope in scopes for edge in itertools.combinations(scope, 2)]
+        )
+        self.factor_graph = FactorGraph()
+        self.factor_graph.add_nodes_from(cardinality.keys())
+        for scope in scopes:
+            card = [cardinality[var] for var in scope]
+            factor = DiscreteFactor(scope, card, np.ones(np.prod(card)))
+            self.markov_model.add_factors(factor)
+            self.factor_graph.add_factors(factor)
+            self.factor_graph.add_edges_from([(var, factor) for var in scope])
+
+    def test_cost(self):
+        for model in [self.markov_model, self.factor_graph]:
+            self.assertEqual(MinFill(model).cost("A"), 2)
+            self.assertEqual(MinFill(model).cost("E"), 0)
+            self.assertEqual(MinNeighbors(model).cost("B"), 4)
+            self.assertEqual(MinWeight(model).cost("A"), 18)
+            self.assertEqual(WeightedMinFill(model).cost("A"), 21)
+
+    def test_elimination_order(self):
+        for model in [self.markov_model, self.factor_graph]:
+            self.assertEqual(
+                MinFill(model).get_elimination_order(
+                    ["A", "B", "E"], show_progress=False
+                ),
+                ["E", "A", "B"],
+            )
+            self.assertEqual(
+                set(MinNeighbors(model).get_elimination_order(show_progress=False)),
+                {"A", "B", "C", "D", "E", "F"},
+            )
+
+    def test_incremental_costs(self):
+        # The incrementally updated costs must give the same order as recomputing
+        # all the costs after every elimination.
+        rng = np.random.RandomState(42)
+        nodes = [f"X{i}" for i in range(30)]
+        edges = [
+            (u, v) for u, v in itertools.combinations(nodes, 2) if rng.rand() < 0.15
+        ]
+        model = MarkovModel(edges)
+        model.add_nodes_from(nodes)
+        model.add_factors(
+            *[DiscreteFactor([u, v], [2, 2], np.ones(4)) for u, v in edges]
+        )
+        for heuristic in [MinFill, MinNeighbors, MinWeight, WeightedMinFill]:
+            elimination_order = heuristic(model)
+            expected_order = []
+            neighbors = [set(adjacent) for adjacent in elimination_order.neighbors]
+            to_eliminate = set(range(len(neighbors)))
+            while to_eliminate:
+                index = min(
+                    to_eliminate,
+                    key=lambda node: (elimination_order._cost(node, neighbors), node),
+                )
+                for u, v in itertools.combinations(neighbors[index], 2):
+                    neighbors[u].add(v)
+                    neighbors[v].add(u)
+                for u in neighbors[index]:
+                    neighbors[u].discard(index)
+                neighbors[index] = set()
+                to_eliminate.remove(index)
+                expected_order.append(elimination_order.nodes[index])
+
+            self.assertEqual(
+                elimination_order.get_elimination_order(show_progress=False),
+                expected_order,
+            )
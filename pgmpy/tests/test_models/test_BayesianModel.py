@@ -644,6 +644,69 @@ class TestBayesianModelFitPredict(unittest.TestCase):
         )
         self.assertSetEqual(cpds, set(self.model2.get_cpds()))
 
+    def test_fit_chunks(self):
+        path = "pgmpy/tests/test_estimators/testdata/titanic_train.csv"
+        titanic_chunks = BayesianModel([("Sex", "Survived"), ("Pclass", "Survived")])
+        titanic = titanic_chunks.copy()
+        titanic_chunks.fit(path, chunksize=100)
+        titanic.fit(pd.read_csv(path))
+        self.assertSetEqual(set(titanic_chunks.get_cpds()), set(titanic.get_cpds()))
+
+        model2 = self.model2.copy()
+        self.model2.fit(
+            iter([self.data2[:1], self.data2[1:]]),
+            estimator=BayesianEstimator,
+            prior_type="K2",
+            complete_samples_only=False,
+        )
+        model2.fit(
+            self.data2,
+            estimator=BayesianEstimator,
+            prior_type="K2",
+            complete_samples_only=False,
+        )
+        self.assertSetEqual(set(self.model2.get_cpds()), set(model2.get_cpds()))
+
+    def test_partial_fit(self):
+        model2 = self.model2.copy()
+        model2.fit(self.data1, keep_state_counts=True)
+        self.model2.fit(self.data1[1:], keep_state_counts=True)
+        cpd_c = self.model2.get_cpds("C")
+        self.model2.partial_fit(self.data1[:1])
+        self.assertIs(self.model2.get_cpds("C"), cpd_c)
+        self.assertSetEqual(set(self.model2.get_cpds()), set(model2.get_cpds()))
+
+        # The state counts of "A" are [2, 1] + 0.5 * [2, 1] and then
+        # [2, 0] + 0.5 * [3, 1.5].
+        model2.partial_fit(self.data1, decay=0.5)
+        cpd_a = TabularCPD("A", 2, [[2.0 / 3], [1.0 / 3]])
+        self.assertEqual(model2.get_cpds("A"), cpd_a)
+        model2.partial_fit(self.data1[:2], decay=0.5)
+        cpd_a = TabularCPD("A", 2, [[14.0 / 17], [3.0 / 17]])
+        self.assertEqual(model2.get_cpds("A"), cpd_a)
+
+        self.assertRaises(ValueError, model2.partial_fit, self.data1, decay=0)
+        self.assertRaises(
+            ValueError, model2.partial_fit, pd.DataFrame({"A": [2], "B": [0], "C": [0]})
+        )
+
+        # Without kept state counts the CPDs are estimated from the batch alone.
+        model2.fit(self.data1)
+        self.assertEqual(model2._sufficient_statistics, {})
+        model2.partial_fit(self.data1[:2])
+        self.assertEqual(model2.get_cpds("A"), TabularCPD("A", 2, [[1.0], [0.0]]))
+
+    def test_partial_fit_without_fit(self):
+        model2 = self.model2.copy()
+        model2.fit(self.data1, estimator=BayesianEstimator, prior_type="K2")
+        self.model2.partial_fit(
+            self.data1[1:], estimator=BayesianEstimator, prior_type="K2"
+        )
+        self.model2.partial_fit(
+            self.data1[:1], estimator=BayesianEstimator, prior_type="K2"
+        )
+        self.assertSetEqual(set(self.model2.get_cpds()), set(model2.get_cpds()))
+
     def test_disconnected_fit(self):
         values = pd.DataFrame(
             np.random.randint(low=0, high=2, size=(1000, 5)),
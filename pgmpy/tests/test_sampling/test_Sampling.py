@@ -1,5 +1,9 @@
+import itertools
 import unittest
 
+import numpy as np
+import numpy.testing as np_test
+
 from mock import MagicMock, patch
 
 from pgmpy.factors.discrete import DiscreteFactor, TabularCPD, State
@@ -157,6 +161,32 @@ class TestBayesianModelSampling(unittest.TestCase):
         forward_sample.assert_called_once_with(self.sampling_inference, 5)
         self.assertEqual(sample, forward_sample.return_value)
 
+    def test_forward_sample_distribution(self):
+        np.random.seed(42)
+        sample = self.sampling_inference.forward_sample(100000)
+        cpd_j = self.bayesian_model.get_cpds("J")
+        for r, a in itertools.product(range(2), range(2)):
+            j_sample = sample.J[(sample.R == r) & (sample.A == a)]
+            np_test.assert_allclose(
+                j_sample.value_counts(normalize=True).sort_index().values,
+                cpd_j.values[:, r, a],
+                atol=0.02,
+            )
+
+        sample = self.sampling_inference_names.likelihood_weighted_sample(
+            [State("J", "j1"), State("G", "g0")], 100
+        )
+        for _, row in sample.iterrows():
+            cpd_j = self.bayesian_model_names.get_cpds("J")
+            cpd_g = self.bayesian_model_names.get_cpds("G")
+            self.assertAlmostEqual(
+                row._weight,
+                cpd_j.values[
+                    1, cpd_j.get_state_no("R", row.R), cpd_j.get_state_no("A", row.A)
+                ]
+                * cpd_g.values[0],
+            )
+
     def test_likelihood_weighted_sample(self):
         # Test without state names
         sample = self.sampling_inference.likelihood_weighted_sample()
@@ -311,3 +341,39 @@ class TestGibbsSampling(unittest.TestCase):
         samples = [sample for sample in gen]
         random_state.assert_called_once_with(self.gibbs)
         self.assertEqual(len(samples), 2)
+
+    def test_sample_distribution(self):
+        np.random.seed(42)
+        start_state = [State("diff", 0), State("intel", 0), State("grade", 0)]
+        sample = self.gibbs.sample(start_state, 20000)
+        np_test.assert_allclose(
+            sample["grade"].value_counts(normalize=True).sort_index().values,
+            [0.447, 0.2714, 0.2816],
+            atol=0.02,
+        )
+        np_test.assert_allclose(sample["diff"].mean(), 0.4, atol=0.02)
+
+        gibbs = GibbsSampling(self.markov_model)
+        sample = gibbs.sample(size=20000)
+        joint = self.markov_model.get_factors()[0].copy()
+        for factor in self.markov_model.get_factors()[1:]:
+            joint.product(factor)
+        joint.normalize()
+        for var in ["A", "B", "C", "D"]:
+            expected = joint.marginalize(
+                [v for v in joint.variables if v != var], inplace=False
+            ).values
+            np_test.assert_allclose(
+                sample[var].value_counts(normalize=True).sort_index().values,
+                expected,
+                atol=0.02,
+            )
+
+    def test_markov_blanket_factors(self):
+        gibbs = GibbsSampling(self.markov_model)
+        self.assertEqual(len(gibbs.markov_blanket_factors["A"]), 1)
+        self.assertEqual(len(gibbs.markov_blanket_factors["B"]), 3)
+        table, other_indices, strides = gibbs.markov_blanket_factors["C"][0]
+        np_test.assert_array_equal(table, [[3, 5, 1, 4], [1, 7, 3, 5], [4, 8, 10, 6]])
+        np_test.assert_array_equal(other_indices, [1])
+        np_test.assert_array_equal(strides, [1])
@@ -1,4 +1,4 @@
-from .mathext import cartesian, sample_discrete
+from .mathext import cartesian, sample_discrete, sample_discrete_maps
 from .state_name import StateNameMixin
 from .check_functions import _check_1d_array_object, _check_length_equal
 from .optimizer import optimize, pinverse
@@ -7,6 +7,7 @@ from .optimizer import optimize, pinverse
 __all__ = [
     "cartesian",
     "sample_discrete",
+    "sample_discrete_maps",
     "StateNameMixin",
     "_check_1d_array_object",
     "_check_length_equal",
@@ -88,7 +88,51 @@ def sample_discrete(values, weights, size=1, rng=None):
     if weights.ndim == 1:
         return rng.choice(values, size=size, p=weights)
     else:
-        return np.fromiter(map(lambda t: rng.choice(values, p=t), weights), dtype="int")
+        return sample_discrete_maps(
+            values, weights.T, np.arange(weights.shape[0]), rng=rng
+        )
+
+
+def sample_discrete_maps(values, weights, indices, rng=None):
+    """
+    Generates one sample for each element of `indices`, where the PMF of a sample is
+    the column `weights[:, index]`. All the samples are drawn at once by inverting
+    the cumulative distribution against a single vector of uniform numbers.
+
+    Parameters
+    ----------
+    values: numpy.array: Array of all possible values that the random variable
+            can take.
+    weights: numpy.array: 2-D array of shape (len(values), n_columns) with a PMF in
+            each column.
+    indices: numpy.array: 1-D array of integers, the column of `weights` to use for
+            each sample.
+    rng : numpy.random.RandomState | None : random number generator
+
+    Returns
+    -------
+    numpy.array: of values of the random variable sampled from the given PMFs.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from pgmpy.utils.mathext import sample_discrete_maps
+    >>> weights = np.array([[1.0, 0.0], [0.0, 1.0]])
+    >>> sample_discrete_maps(np.array(['v_0', 'v_1']), weights, np.array([0, 1, 1, 0]))
+    array(['v_0', 'v_1', 'v_1', 'v_0'], dtype='<U3')
+    """
+    if rng is None:
+        rng = np.random
+    cumulative = np.cumsum(weights, axis=0)
+    uniform = rng.random_sample(len(indices))
+
+    # The sampled state is the number of cumulative probabilities <= the uniform
+    # number. Gathering a single row of `cumulative` at a time keeps the memory linear
+    # in the number of samples.
+    sampled = np.zeros(len(indices), dtype=int)
+    for state in range(len(values) - 1):
+        sampled += uniform >= cumulative[state][indices]
+    return np.asarray(values)[sampled]
 
 
 def powerset(l):